@@ -19,58 +19,235 @@
 
 """This package contains round behaviours of LearningAbciApp."""
 
+import json
 from abc import ABC
-from typing import Generator, Set, Type, cast, Optional, Dict, Any, List
+from functools import partial
+from time import perf_counter, time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    cast,
+)
 
-from packages.valory.skills.abstract_round_abci.base import AbstractRound
+from aea.protocols.base import Message
+from aea.protocols.dialogue.base import Dialogue
+
+from packages.valory.protocols.contract_api import ContractApiMessage
+from packages.valory.protocols.http import HttpMessage
+from packages.valory.protocols.ipfs import IpfsMessage
+from packages.valory.protocols.ledger_api import LedgerApiMessage
+from packages.valory.skills.abstract_round_abci.base import (
+    AbstractRound,
+    LEDGER_API_ADDRESS,
+)
+from packages.valory.skills.abstract_round_abci.behaviour_utils import TimeoutException
 from packages.valory.skills.abstract_round_abci.behaviours import (
     AbstractRoundBehaviour,
     BaseBehaviour,
 )
+from packages.valory.skills.abstract_round_abci.dialogues import (
+    ContractApiDialogue,
+    ContractApiDialogues,
+    IpfsDialogue,
+    LedgerApiDialogue,
+    LedgerApiDialogues,
+)
+from packages.valory.skills.abstract_round_abci.io_.store import SupportedFiletype
+from packages.valory.skills.abstract_round_abci.models import Requests
+from packages.valory.skills.learning_abci.budget import (
+    Balance,
+    BalanceCache,
+    Budget,
+    TokenKey,
+)
+from packages.valory.skills.learning_abci.candidates import (
+    CandidateQueue,
+    Shard,
+    key_of,
+)
+from packages.valory.skills.learning_abci.fees import FeeHistory
+from packages.valory.skills.learning_abci.keeper import (
+    keeper_of,
+    should_audit,
+    within_band,
+)
+from packages.valory.skills.learning_abci.latency import LatencyTracker
+from packages.valory.skills.learning_abci.listing_sources import (
+    ListingSource,
+    gather,
+    merge_listings,
+)
+from packages.valory.skills.learning_abci.listings import (
+    LISTINGS_FILENAME,
+    LISTINGS_KEY,
+    iter_listings,
+)
+from packages.valory.skills.learning_abci.logs import SkillLog
 from packages.valory.skills.learning_abci.models import Params, SharedState
 from packages.valory.skills.learning_abci.payloads import (
     APICheckPayload,
     DecisionMakingPayload,
+    SettlementFailurePayload,
     TxPreparationPayload,
 )
+from packages.valory.skills.learning_abci.preflight import (
+    encode_simulation,
+    simulation_succeeded,
+)
+from packages.valory.skills.learning_abci.price_feed import PriceFeed, parse_pair
+from packages.valory.skills.learning_abci.price_sources import PriceSources, hedged
+from packages.valory.skills.learning_abci.properties import Property, iter_properties
+from packages.valory.skills.learning_abci.rate_limit import (
+    HTTP_TOO_MANY_REQUESTS,
+    InFlight,
+    RateLimiter,
+    host_of,
+    retry_after,
+)
 from packages.valory.skills.learning_abci.rounds import (
     APICheckRound,
     DecisionMakingRound,
     Event,
     LearningAbciApp,
+    SettlementFailureRound,
     SynchronizedData,
     TxPreparationRound,
 )
-import json
-from packages.valory.contracts.real_estate_solution.contract import (
-    RealEstateSolutionContract,
-)
-from packages.valory.skills.abstract_round_abci.io_.store import SupportedFiletype
-from packages.valory.protocols.contract_api import ContractApiMessage
-from packages.valory.skills.transaction_settlement_abci.payload_tools import (
-    hash_payload_to_hex,
-)
-from packages.valory.contracts.gnosis_safe.contract import (
-    GnosisSafeContract,
-    SafeOperation,
-)
-from packages.valory.contracts.erc20.contract import ERC20
-from packages.valory.contracts.multisend.contract import (
-    MultiSendContract,
-    MultiSendOperation,
-)
-from hexbytes import HexBytes
+from packages.valory.skills.learning_abci.settlement import SettlementBackoff
+from packages.valory.skills.learning_abci.sharding import shard_index
+from packages.valory.skills.learning_abci.store import PropertyStore, listing_digest
+from packages.valory.skills.learning_abci.trace import ResponseTrace
+
 
 HTTP_OK = 200
-GNOSIS_CHAIN_ID = "gnosis"
 TX_DATA = b"0x"
 SAFE_GAS = 0
 VALUE_KEY = "value"
 TO_ADDRESS_KEY = "to_address"
+# the attempts of a request which keeps being rate limited
+MAX_THROTTLED_ATTEMPTS = 3
 MULTISEND_ADDRESS = "0xA238CBeb142c10Ef7Ad8442C6D1f9E89e07e7761"
+# the contract packages, and the encoding modules they pull in, are only
+# imported by the transaction preparation, on first use
+REAL_ESTATE_CONTRACT_ID = "valory/real_estate_solution:0.1.0"
+GNOSIS_SAFE_CONTRACT_ID = "valory/gnosis_safe:0.1.0"
+ERC20_CONTRACT_ID = "valory/erc20:0.1.0"
+MULTISEND_CONTRACT_ID = "valory/multisend:0.1.0"
+# the percentile of the priority fees paid in a block which is sampled
+FEE_REWARD_PERCENTILE = 50
+
+
+def _files_size(files: Dict[str, str]) -> int:
+    """Get the total size of the files of an IPFS message."""
+    return sum(len(content) for content in files.values())
+
+
+class PollingBehaviour(BaseBehaviour, ABC):  # pylint: disable=too-many-ancestors
+    """
+    Poll for the responses of the requests, instead of waiting for them as messages.
+
+    A behaviour waiting for a message can only have one request in flight, the
+    one its generator is sent the message of. Polling lets `hedged` and
+    `gather` interleave several requests.
+
+    A request which times out, or which is closed because the behaviour stops or
+    `hedged` and `gather` give up on it, keeps its callback registered: the
+    handler pops it with the late response, which is then dropped, instead of
+    failing on a nonce it has no callback for.
+    """
+
+    def _do_request(
+        self,
+        request_message: Message,
+        http_dialogue: Dialogue,
+        timeout: Optional[float] = None,
+    ) -> Generator[None, None, Message]:
+        """Do a request and poll for its response, so that several requests can be in flight at once."""
+        responses: List[Message] = []
+        abandoned = False
+
+        def callback(message: Message, _current_behaviour: BaseBehaviour) -> None:
+            """Keep the response, unless the request has been abandoned."""
+            if abandoned:
+                self.context.logger.debug(
+                    f"Dropping the response of an abandoned request: {message}"
+                )
+                return
+            responses.append(message)
+
+        self.context.outbox.put_message(message=request_message)
+        request_nonce = self._get_request_nonce_from_dialogue(http_dialogue)
+        cast(Requests, self.context.requests).request_id_to_callback[
+            request_nonce
+        ] = callback
+        try:
+            yield from self.wait_for_condition(lambda: bool(responses), timeout=timeout)
+        finally:
+            abandoned = not responses
+        return responses[0]
+
+    def get_contract_api_response(
+        self,
+        performative: ContractApiMessage.Performative,
+        contract_address: Optional[str],
+        contract_id: str,
+        contract_callable: str,
+        ledger_id: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Generator[None, None, ContractApiMessage]:
+        """Send a contract api request and poll for its response."""
+        contract_api_dialogues = cast(
+            ContractApiDialogues, self.context.contract_api_dialogues
+        )
+        message_kwargs = {
+            "performative": performative,
+            "counterparty": LEDGER_API_ADDRESS,
+            "ledger_id": ledger_id or self.context.default_ledger_id,
+            "contract_id": contract_id,
+            "callable": contract_callable,
+            "kwargs": ContractApiMessage.Kwargs(kwargs),
+        }
+        if contract_address is not None:
+            message_kwargs["contract_address"] = contract_address
+        message, dialogue = contract_api_dialogues.create(**message_kwargs)
+        cast(ContractApiDialogue, dialogue).terms = self._get_default_terms()
+        response = yield from self._do_request(message, dialogue)
+        return cast(ContractApiMessage, response)
+
+    def get_ledger_api_response(
+        self,
+        performative: LedgerApiMessage.Performative,
+        ledger_callable: str,
+        **kwargs: Any,
+    ) -> Generator[None, None, LedgerApiMessage]:
+        """Send a ledger api request and poll for its response."""
+        ledger_api_dialogues = cast(
+            LedgerApiDialogues, self.context.ledger_api_dialogues
+        )
+        message, dialogue = ledger_api_dialogues.create(
+            performative=performative,
+            counterparty=LEDGER_API_ADDRESS,
+            ledger_id=self.context.default_ledger_id,
+            callable=ledger_callable,
+            kwargs=LedgerApiMessage.Kwargs(kwargs),
+            args=tuple(),
+        )
+        cast(LedgerApiDialogue, dialogue).terms = self._get_default_terms()
+        response = yield from self._do_request(message, dialogue)
+        return cast(LedgerApiMessage, response)
 
 
-class LearningBaseBehaviour(BaseBehaviour, ABC):  # pylint: disable=too-many-ancestors
+class LearningBaseBehaviour(
+    PollingBehaviour, ABC
+):  # pylint: disable=too-many-ancestors
     """Base behaviour for the learning_abci skill."""
 
     @property
@@ -88,6 +265,265 @@ class LearningBaseBehaviour(BaseBehaviour, ABC):  # pylint: disable=too-many-anc
         """Return the state."""
         return cast(SharedState, self.context.state)
 
+    def async_act_wrapper(self) -> Generator:
+        """Do the act, accounting for retried rounds, and watch and profile its steps."""
+        if not self._is_started:
+            round_id = self.matching_round.auto_round_id()
+            if self.round_sequence.last_round_id == round_id:
+                self.local_state.metrics.record_round_retry(round_id)
+        steps = super().async_act_wrapper()
+        watchdog = self.local_state.watchdog
+        if watchdog is not None:
+            filename = type(self).async_act.__code__.co_filename
+            steps = watchdog.watch(self.behaviour_id, steps, filename)
+        profiler = self.local_state.profiler
+        if profiler is not None and self.behaviour_id in profiler.behaviours:
+            steps = profiler.profile(self.behaviour_id, steps)
+        yield from steps
+
+    @property
+    def store(self) -> PropertyStore:
+        """Return the local store of the listings, the prices and the decisions."""
+        return cast(PropertyStore, self.local_state.store)
+
+    @property
+    def price_feed(self) -> PriceFeed:
+        """Return the price feed of the token and currency pairs."""
+        return self.local_state.price_feed
+
+    @property
+    def price_sources(self) -> PriceSources:
+        """Return the price sources."""
+        return cast(PriceSources, self.local_state.price_sources)
+
+    @property
+    def listing_sources(self) -> List[ListingSource]:
+        """Return the sources of the listings."""
+        return self.local_state.listing_sources
+
+    @property
+    def candidates(self) -> CandidateQueue:
+        """Return the ranked candidates to buy."""
+        return cast(CandidateQueue, self.local_state.candidates)
+
+    @property
+    def balances(self) -> BalanceCache:
+        """Return the token balances of the Safe."""
+        return cast(BalanceCache, self.local_state.balances)
+
+    @property
+    def budget(self) -> Budget:
+        """Return the budget of the purchases."""
+        return cast(Budget, self.local_state.budget)
+
+    @property
+    def fee_history(self) -> FeeHistory:
+        """Return the fee history of the chains."""
+        return cast(FeeHistory, self.local_state.fee_history)
+
+    @property
+    def log(self) -> SkillLog:
+        """Return the sampled and rate limited logs of the skill."""
+        return cast(SkillLog, self.local_state.log)
+
+    @property
+    def latency(self) -> LatencyTracker:
+        """Return the tracker of the latency of the purchases."""
+        return cast(LatencyTracker, self.local_state.latency)
+
+    def source_of(self, tag: Optional[str]) -> ListingSource:
+        """Return the source of a tag, the first one if the tag is missing or unknown."""
+        for source in self.listing_sources:
+            if source.tag == tag:
+                return source
+        return self.listing_sources[0]
+
+    def token_of(self, source: ListingSource) -> TokenKey:
+        """Return the chain and the address of the token the properties of a source are paid in."""
+        return source.chain_id, source.token or self.params.real_estate_token
+
+    @property
+    def trace(self) -> Optional[ResponseTrace]:
+        """Return the trace of the external responses, if recording or replaying."""
+        return self.local_state.trace
+
+    def _replay(self, kind: str, key: str) -> Generator[None, None, Optional[Message]]:
+        """Get the next response to a request from the replayed trace, with its latency."""
+        trace = self.trace
+        if trace is None or not trace.replaying:
+            return None
+        recorded = trace.next_response(kind, key)
+        if recorded is None:
+            self.context.logger.warning(
+                f"No {kind} response to {key!r} left in the trace, "
+                "sending the request."
+            )
+            return None
+        response, seconds = recorded
+        if seconds > 0:
+            yield from self.sleep(seconds)
+        return response
+
+    def _record(self, kind: str, key: str, response: Message, seconds: float) -> None:
+        """Record a response in the trace, if recording."""
+        trace = self.trace
+        if trace is not None and trace.recording:
+            trace.record(kind, key, response, seconds)
+
+    def get_block_number(self, chain_id: str) -> Generator[None, None, Optional[int]]:
+        """Get the number of the latest block of a chain."""
+        response = yield from self.get_ledger_api_response(
+            performative=LedgerApiMessage.Performative.GET_STATE,  # type: ignore
+            ledger_callable="get_block",
+            block_identifier="latest",
+            chain_id=chain_id,
+        )
+        if response.performative != LedgerApiMessage.Performative.STATE:
+            self.context.logger.warning(
+                f"Could not get the latest block of {chain_id}, reading unpinned: {response}"
+            )
+            return None
+        number = response.state.body.get("number", None)
+        if number is not None:
+            self.latency.observe_block(chain_id, number)
+        return number
+
+    def get_http_response(
+        self,
+        method: str,
+        url: str,
+        content: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        parameters: Optional[Dict[str, str]] = None,
+    ) -> Generator[None, None, HttpMessage]:
+        """Send an http request and record its latency."""
+        start = perf_counter()
+        key = f"{method} {url} {json.dumps(parameters, sort_keys=True)}"
+        response = yield from self._replay("http", key)
+        if response is None:
+            response = yield from self._limited_http_response(
+                key, method, url, content, headers, parameters
+            )
+            self._record("http", key, response, perf_counter() - start)
+        self.local_state.metrics.observe_call("http", perf_counter() - start)
+        return cast(HttpMessage, response)
+
+    def _limited_http_response(  # pylint: disable=too-many-arguments
+        self,
+        key: str,
+        method: str,
+        url: str,
+        content: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        parameters: Optional[Dict[str, str]] = None,
+    ) -> Generator[None, None, HttpMessage]:
+        """Send an http request within the rate limit of its host, or share the response of the identical one in flight."""
+        limiter = cast(RateLimiter, self.local_state.rate_limiter)
+        coalesced = method == "GET" and not content
+        in_flight = limiter.in_flight.get(key, None) if coalesced else None
+        if in_flight is not None:
+            pending = in_flight
+            yield from self.wait_for_condition(lambda: pending.done)
+            if pending.response is not None:
+                return cast(HttpMessage, pending.response)
+
+        in_flight = InFlight()
+        if coalesced:
+            limiter.in_flight[key] = in_flight
+        try:
+            for _ in range(MAX_THROTTLED_ATTEMPTS):
+                yield from self.wait_for_condition(
+                    lambda: limiter.acquire(url, perf_counter())
+                )
+                response = yield from super().get_http_response(
+                    method, url, content, headers, parameters
+                )
+                if response.status_code != HTTP_TOO_MANY_REQUESTS:
+                    limiter.succeeded(url)
+                    break
+                delay = limiter.throttled(
+                    url, perf_counter(), retry_after(response.headers)
+                )
+                self.context.logger.warning(
+                    f"{host_of(url)} is rate limiting the requests, backing off for {delay:.1f}s"
+                )
+            in_flight.response = response
+            return response
+        finally:
+            in_flight.done = True
+            if limiter.in_flight.get(key, None) is in_flight:
+                del limiter.in_flight[key]
+
+    def get_contract_api_response(
+        self,
+        performative: ContractApiMessage.Performative,
+        contract_address: Optional[str],
+        contract_id: str,
+        contract_callable: str,
+        ledger_id: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Generator[None, None, ContractApiMessage]:
+        """Send a contract api request and record its latency."""
+        start = perf_counter()
+        arguments = json.dumps(kwargs, sort_keys=True, default=str)
+        key = f"{contract_id} {contract_callable} {contract_address} {arguments}"
+        response = yield from self._replay("contract_api", key)
+        if response is None:
+            response = yield from super().get_contract_api_response(
+                performative,
+                contract_address,
+                contract_id,
+                contract_callable,
+                ledger_id,
+                **kwargs,
+            )
+            self._record("contract_api", key, response, perf_counter() - start)
+        self.local_state.metrics.observe_call("contract_api", perf_counter() - start)
+        return cast(ContractApiMessage, response)
+
+    def get_ledger_api_response(
+        self,
+        performative: LedgerApiMessage.Performative,
+        ledger_callable: str,
+        **kwargs: Any,
+    ) -> Generator[None, None, LedgerApiMessage]:
+        """Send a ledger api request and record its latency."""
+        start = perf_counter()
+        arguments = json.dumps(kwargs, sort_keys=True, default=str)
+        key = f"{ledger_callable} {arguments}"
+        response = yield from self._replay("ledger_api", key)
+        if response is None:
+            response = yield from super().get_ledger_api_response(
+                performative, ledger_callable, **kwargs
+            )
+            self._record("ledger_api", key, response, perf_counter() - start)
+        self.local_state.metrics.observe_call("ledger_api", perf_counter() - start)
+        return cast(LedgerApiMessage, response)
+
+    def _do_ipfs_request(
+        self,
+        dialogue: IpfsDialogue,
+        message: IpfsMessage,
+        timeout: Optional[float] = None,
+    ) -> Generator[None, None, IpfsMessage]:
+        """Perform an IPFS request and record its latency and the bytes exchanged."""
+        metrics = self.local_state.metrics
+        if message.performative == IpfsMessage.Performative.STORE_FILES:
+            metrics.add_ipfs_bytes("out", _files_size(message.files))
+            key = message.performative.value
+        else:
+            key = f"{message.performative.value} {message.ipfs_hash}"
+        start = perf_counter()
+        response = yield from self._replay("ipfs", key)
+        if response is None:
+            response = yield from super()._do_ipfs_request(dialogue, message, timeout)
+            self._record("ipfs", key, response, perf_counter() - start)
+        response = cast(IpfsMessage, response)
+        metrics.observe_call("ipfs", perf_counter() - start)
+        if response.performative == IpfsMessage.Performative.FILES:
+            metrics.add_ipfs_bytes("in", _files_size(response.files))
+        return response
+
 
 class APICheckBehaviour(LearningBaseBehaviour):  # pylint: disable=too-many-ancestors
     """APICheckBehaviour"""
@@ -98,61 +534,271 @@ class APICheckBehaviour(LearningBaseBehaviour):  # pylint: disable=too-many-ance
         """Do the act, supporting asynchronous execution."""
 
         with self.context.benchmark_tool.measure(self.behaviour_id).local():
-            sender = self.context.agent_address
-            price = yield from self.get_price()
+            if not self.params.keeper_fetch:
+                payload = yield from self.fetch()
+            elif self.context.agent_address == self.keeper:
+                payload = yield from self.fetch(pinned=True)
+            else:
+                payload = yield from self.verify_keeper()
+
+        with self.context.benchmark_tool.measure(self.behaviour_id).consensus():
+            yield from self.send_a2a_transaction(payload)
+            yield from self.wait_until_round_end()
 
-            contract_response = yield from self.get_contract_api_response(
-                performative=ContractApiMessage.Performative.GET_STATE,  # type: ignore
-                contract_id=str(RealEstateSolutionContract.contract_id),
-                contract_callable="get_properties_for_sale",
-                contract_address=self.params.real_estate_contract_address,
-                chain_id=GNOSIS_CHAIN_ID,
+        self.set_done()
+
+    @property
+    def keeper(self) -> str:
+        """Return the keeper of the period, which fetches for the others in the keeper fetch mode."""
+        return keeper_of(
+            self.synchronized_data.sorted_participants,
+            self.synchronized_data.period_count,
+        )
+
+    def fetch(self, pinned: bool = False) -> Generator[None, None, APICheckPayload]:
+        """Fetch the price and the listings, optionally pinned to the latest blocks, and upload the listings."""
+        price = yield from self.get_price()
+        while price is None:
+            yield from self.sleep(self.params.sleep_time)
+            price = yield from self.get_price()
+        blocks = None
+        if pinned:
+            blocks = yield from self.get_block_numbers()
+            properties_for_sale = yield from self.get_listings(blocks)
+        else:
+            # the latest blocks are read along, to date the first sightings
+            _, properties_for_sale = yield from gather(
+                [self.get_block_numbers, self.get_listings]
             )
-            self.context.logger.info(
-                f"These are the properties for sale: {contract_response}"
+        ipfs_hash = yield from self.upload_listings(properties_for_sale)
+
+        self.log.info("ipfs_hash", "The IPFS hash is {ipfs_hash}", ipfs_hash=ipfs_hash)
+        if not pinned:
+            return APICheckPayload(
+                sender=self.context.agent_address, price=price, ipfs_hash=ipfs_hash
             )
+        return APICheckPayload(
+            sender=self.context.agent_address,
+            price=price,
+            ipfs_hash=ipfs_hash,
+            digest=listing_digest(properties_for_sale),
+            blocks=json.dumps(blocks, sort_keys=True),
+        )
 
-            properties_for_sale = contract_response.state.body["data"]
-            ipfs_hash = yield from self.send_to_ipfs(
-                "ListedProperties.json",
-                {"Properties for sale: ": properties_for_sale},
-                filetype=SupportedFiletype.JSON,
+    def get_block_numbers(self) -> Generator[None, None, Dict[str, int]]:
+        """Get the numbers of the latest blocks of the chains of the sources, to pin the reads of the keeper to."""
+        chain_ids = sorted({source.chain_id for source in self.listing_sources})
+        numbers = yield from gather(
+            [partial(self.get_block_number, chain_id) for chain_id in chain_ids]
+        )
+        return {
+            chain_id: number
+            for chain_id, number in zip(chain_ids, numbers)
+            if number is not None
+        }
+
+    def get_listings(
+        self, blocks: Optional[Dict[str, int]] = None
+    ) -> Generator[None, None, List[Any]]:
+        """Read the properties for sale from all the sources at once, at the given blocks or the latest ones, and merge them."""
+        blocks = blocks or {}
+        sources = self.listing_sources
+        results = yield from gather(
+            [
+                partial(
+                    self.get_source_listings, source, blocks.get(source.chain_id, None)
+                )
+                for source in sources
+            ]
+        )
+        return merge_listings(zip(sources, results))
+
+    def get_source_listings(
+        self, source: ListingSource, block: Optional[int] = None
+    ) -> Generator[None, None, List[Any]]:
+        """Read the properties for sale from the contract of a source, at the given block or the latest one."""
+        kwargs = {} if block is None else {"block_identifier": block}
+        contract_response = yield from self.get_contract_api_response(
+            performative=ContractApiMessage.Performative.GET_STATE,  # type: ignore
+            contract_id=REAL_ESTATE_CONTRACT_ID,
+            contract_callable="get_properties_for_sale",
+            contract_address=source.address,
+            chain_id=source.chain_id,
+            **kwargs,
+        )
+        if contract_response.performative != ContractApiMessage.Performative.STATE:
+            self.context.logger.error(
+                f"Could not read the properties for sale of {source.tag}: {contract_response}"
+            )
+            return []
+        properties_for_sale = contract_response.state.body["data"]
+        self.log.info(
+            "listings",
+            "Read {count} properties for sale from {source}",
+            count=len(properties_for_sale),
+            source=source.tag,
+        )
+        self.log.debug(
+            "listings_dump",
+            "The properties for sale of {source}: {response}",
+            source=source.tag,
+            response=contract_response,
+        )
+        return properties_for_sale
+
+    def verify_keeper(self) -> Generator[None, None, APICheckPayload]:
+        """Vote for the publication of the keeper if it passes the checks, or fetch instead."""
+        keeper = self.keeper
+        published = yield from self.wait_for_keeper(keeper)
+        if published is None:
+            self.context.logger.warning(
+                f"The keeper {keeper} did not publish in time, fetching instead."
             )
+        else:
+            verified = yield from self.verify(published)
+            if verified:
+                for chain_id, number in json.loads(published.blocks or "{}").items():
+                    self.latency.observe_block(chain_id, number)
+                return APICheckPayload(
+                    sender=self.context.agent_address, **published.data
+                )
+            self.context.logger.warning(
+                f"The publication of the keeper {keeper} failed the checks, fetching instead."
+            )
+        payload = yield from self.fetch(pinned=True)
+        return payload
 
-            self.context.logger.info(f"The IPFS hash is : {ipfs_hash}")
-            payload = APICheckPayload(sender=sender, price=price, ipfs_hash=ipfs_hash)
+    def wait_for_keeper(
+        self, keeper: str
+    ) -> Generator[None, None, Optional[APICheckPayload]]:
+        """Wait for the payload of the keeper to be delivered in the round."""
 
-        with self.context.benchmark_tool.measure(self.behaviour_id).consensus():
-            yield from self.send_a2a_transaction(payload)
-            yield from self.wait_until_round_end()
+        def published() -> bool:
+            collection = getattr(self.round_sequence.current_round, "collection", {})
+            return keeper in collection
 
-        self.set_done()
+        try:
+            yield from self.wait_for_condition(
+                published, timeout=self.params.keeper_wait_timeout
+            )
+        except TimeoutException:
+            return None
+        round_ = cast(APICheckRound, self.round_sequence.current_round)
+        return cast(APICheckPayload, round_.collection[keeper])
+
+    def verify(self, published: APICheckPayload) -> Generator[None, None, bool]:
+        """Check the price of the keeper against the last one fetched by the agent, and the listings digest if drawn to."""
+        audit = should_audit(self.params.keeper_audit_probability)
+        if audit or not self.store.prices:
+            # a price fetched independently, which also anchors the next checks
+            reference = yield from self.get_price()
+        else:
+            # the prices of the keeper are never stored, so they cannot move the band
+            reference = self.store.prices[-1].price
+        price = published.price
+        if (
+            price is None
+            or reference is None
+            or not within_band(price, reference, self.params.price_tolerance)
+        ):
+            self.context.logger.warning(
+                f"The price of the keeper {price} is not within "
+                f"{self.params.price_tolerance:.0%} of {reference}."
+            )
+            return False
+
+        if audit:
+            blocks = json.loads(published.blocks) if published.blocks else None
+            properties_for_sale = yield from self.get_listings(blocks)
+            digest = listing_digest(properties_for_sale)
+            if digest != published.digest:
+                self.context.logger.warning(
+                    f"The listings at blocks {blocks} do not match the digest of the keeper."
+                )
+                return False
+            ipfs_hash = yield from self.upload_listings(properties_for_sale)
+            if ipfs_hash != published.ipfs_hash:
+                self.context.logger.warning(
+                    f"The listings were uploaded under {ipfs_hash}, not {published.ipfs_hash}."
+                )
+                return False
+        elif published.digest is not None:
+            # the last snapshot is a free check of the hash, if the listings did not change
+            ipfs_hash = self.store.ipfs_hash_of(published.digest)
+            if ipfs_hash is not None and ipfs_hash != published.ipfs_hash:
+                self.context.logger.warning(
+                    f"The listings were uploaded under {ipfs_hash}, not {published.ipfs_hash}."
+                )
+                return False
+
+        return True
 
-    def get_price(self):
-        """Get token price from Coingecko"""
+    def upload_listings(
+        self, properties_for_sale: List[Any]
+    ) -> Generator[None, None, Optional[str]]:
+        """Upload the listings to IPFS, unless the store already holds them."""
+        period = self.synchronized_data.period_count
+        digest = listing_digest(properties_for_sale)
+        ipfs_hash = self.store.ipfs_hash_of(digest)
+        self.local_state.metrics.record_cache("listings_upload", ipfs_hash is not None)
+        if ipfs_hash is None:
+            ipfs_hash = yield from self.send_to_ipfs(
+                LISTINGS_FILENAME,
+                {LISTINGS_KEY: properties_for_sale},
+                filetype=SupportedFiletype.JSON,
+            )
+        if ipfs_hash is not None:
+            self.store.save_snapshot(period, properties_for_sale, ipfs_hash, digest)
+        return ipfs_hash
+
+    def get_price(self) -> Generator[None, None, Optional[float]]:
+        """Get token price from the first price source to answer, refreshing all the pairs of the price feed"""
+        sources = self.price_sources
+        response_data = yield from hedged(
+            [partial(self.request_prices, url) for url in sources.urls],
+            sources.hedge_delay(),
+        )
+        if response_data is None:
+            self.context.logger.error("None of the price sources answered with a price")
+            return None
+        self.price_feed.update(response_data)
+        token, currency = parse_pair(self.params.price_pairs[0])
+        price = response_data[token][currency]
+        self.log.info("price", "The price is {price}", price=price)
+        self.store.add_price(self.synchronized_data.period_count, price)
+        return price
+
+    def request_prices(
+        self, template: str
+    ) -> Generator[None, None, Optional[Dict[str, Any]]]:
+        """Request the prices from a source, and get the response body if it holds the price of the first pair"""
+        start = perf_counter()
+        url = self.price_feed.url(template)
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        if host_of(url) == host_of(self.params.coingecko_price_template):
+            # the api key is only sent to Coingecko, not to the alternate sources
+            headers["x-cg-demo-api-key"] = self.params.coingecko_api_key
         response = yield from self.get_http_response(
-            method="GET",
-            url=self.params.coingecko_price_template,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "x-cg-demo-api-key": self.params.coingecko_api_key,
-            },
+            method="GET", url=url, headers=headers
         )
-        if response.status_code != 200:
+        if response.status_code != HTTP_OK:
             self.context.logger.error(
-                f"Error in fetch the price,Status_code{response.status_code}"
+                f"Error in fetch the price from {url}, status code {response.status_code}"
             )
+            return None
 
+        token, currency = parse_pair(self.params.price_pairs[0])
         try:
-            response_body = response.body
-            response_data = json.loads(response_body)
-            price = response_data["autonolas"]["usd"]
-            self.context.logger.info(f"The price is {price}")
-            return price
-        except json.JSONDecodeError:
-            self.context.logger.error("Could not parse the response body")
+            response_data = json.loads(response.body)
+            price = response_data[token][currency]
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            self.context.logger.error(f"Could not parse the price from {url}: {e!r}")
             return None
+        if isinstance(price, bool) or not isinstance(price, (int, float)):
+            self.context.logger.error(f"Invalid price {price!r} from {url}")
+            return None
+        self.price_sources.observe(perf_counter() - start)
+        return response_data
 
 
 class DecisionMakingBehaviour(
@@ -168,8 +814,15 @@ class DecisionMakingBehaviour(
         with self.context.benchmark_tool.measure(self.behaviour_id).local():
             sender = self.context.agent_address
             event, property_data = yield from self.make_transaction_decision()
-            self.context.logger.info(f"The decision is : {event}")
-            self.context.logger.info(f"Chooses bought property is : {property_data}")
+            self.store.save_decision(
+                self.synchronized_data.period_count, event, property_data
+            )
+            self.log.info(
+                "decision",
+                "The decision is {event}: {property_data}",
+                event=event,
+                property_data=property_data,
+            )
             payload = DecisionMakingPayload(
                 sender=sender,
                 content=json.dumps(
@@ -187,36 +840,248 @@ class DecisionMakingBehaviour(
         """
         Decide whether to buy the property if the price range is in buying zone
         """
-        property_response_from_ipfs = yield from self.get_from_ipfs(
-            self.synchronized_data.ipfs_hash, filetype=SupportedFiletype.JSON
-        )
-        self.context.logger.info(
-            f"DATA RETRIEVED FROM IPFS {property_response_from_ipfs}"
-        )
-
-        properties_for_sale = property_response_from_ipfs["Properties for sale: "]
-        # Log the buying range
-        self.context.logger.info(f"Buying range: {self.params.buy_price_range}")
-        for property in properties_for_sale:
-            property_value = int(property[3])
-            self.context.logger.info(f"Property value: {property_value}")
-            if (
-                self.params.buy_price_range[0]
-                < property_value
-                < self.params.buy_price_range[1]
-            ):
-                self.context.logger.info(
-                    f"Deciding to BUY property with value: {property}"
-                )
-                return Event.TRANSACT.value, {
-                    "property_id": property[0],
-                    "property_value": property[3],
-                }
+        self.log.debug(
+            "buying_range", "Buying range: {range}", range=self.params.buy_price_range
+        )
+        yield from self.rank_candidates()
+        balances: Dict[TokenKey, int] = {}
+        if self.candidates.candidates:
+            # the fees are sampled while the balances are read
+            balances, _ = yield from gather([self.get_balances, self.sample_fees])
+        else:
+            yield from self.sample_fees()
+        accept = self.affordable(balances)
+        period = self.synchronized_data.period_count
+        if self.candidates.truncated and self.candidates.best(period, accept) is None:
+            # the candidates kept are all banned or unaffordable, while the
+            # listings hold more: these are ranked instead
+            yield from self.rank_candidates(accept)
+        shard = self.shard
+        if shard is not None:
+            return self.make_shard_decision(*shard, accept)
+        best = self.candidates.best(period, accept)
+        if best is None:
+            self.log.info(
+                "candidate",
+                "No affordable properties within the buying range; deciding to HOLD",
+            )
+            return Event.DONE.value, {}
+        self.log.info("candidate", "Deciding to BUY {property}", property=best)
+        return Event.TRANSACT.value, self.property_data(best)
+
+    @property
+    def shard(self) -> Optional[Shard]:
+        """Return the shard of the agent and the number of shards, in the sharded decision mode."""
+        if not self.params.shard_decisions:
+            return None
+        participants = self.synchronized_data.sorted_participants
+        shard = shard_index(participants, self.context.agent_address)
+        return None if shard is None else (shard, len(participants))
+
+    def rank_candidates(
+        self, accept: Optional[Callable[[Property], bool]] = None
+    ) -> Generator:
+        """Rank the candidates of the listings of the period, unless they are the ones already ranked, or only the accepted ones."""
+        queue = self.candidates
+        period = self.synchronized_data.period_count
+        ipfs_hash = self.synchronized_data.ipfs_hash
+        shard = self.shard
+        if accept is None and queue.is_current(ipfs_hash, shard):
+            # the listings did not change, so neither did the ranking
+            self.budget.settle(queue.settle(period))
+            return
+        properties_for_sale = yield from self.download_listings()
+        if properties_for_sale is None:
+            return
+        low, high = self.params.buy_price_range
+        try:
+            bought = queue.rebuild(
+                ipfs_hash,
+                properties_for_sale,
+                low,
+                high,
+                period,
+                # the sharded decisions are reduced to the cheapest candidate
+                self.params.rank_cheapest_first or shard is not None,
+                shard,
+                accept,
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            self.context.logger.error(f"Invalid listings file: {e!r}")
+            return
+        self.budget.settle(bought)
+        self.see_candidates()
+        self.log.info(
+            "candidates",
+            "Ranked {count} candidates within the buying range.",
+            count=len(queue.candidates),
+        )
+
+    def see_candidates(self) -> None:
+        """Record when and at which block of their chain the candidates were first seen."""
+        chain_ids = {source.tag: source.chain_id for source in self.listing_sources}
+        default = self.listing_sources[0].chain_id
+        self.latency.see(
+            {
+                key_of(property_): chain_ids.get(property_.source, default)
+                for property_ in self.candidates.candidates
+            },
+            time(),
+        )
+
+    def get_balances(self) -> Generator[None, None, Dict[TokenKey, int]]:
+        """Get the balances of the Safe in the tokens of the sources, read once per period."""
+        period = self.synchronized_data.period_count
+        keys = sorted({self.token_of(source) for source in self.listing_sources})
+        balances = {key: self.balances.get(key, period) for key in keys}
+        missing = [key for key, balance in balances.items() if balance is None]
+        self.local_state.metrics.record_cache("safe_balance", not missing)
+        read = yield from gather([partial(self.get_balance, *key) for key in missing])
+        for key, balance in zip(missing, read):
+            if balance is not None:
+                self.balances.put(key, balance)
+                balances[key] = balance
+        self.log.info("balances", "Balances of the Safe: {balances}", balances=balances)
+        return {
+            key: balance.amount
+            for key, balance in balances.items()
+            if balance is not None
+        }
+
+    def get_balance(
+        self, chain_id: str, token: str
+    ) -> Generator[None, None, Optional[Balance]]:
+        """Read the balance of the Safe in a token, along with the latest block of its chain."""
+        block_number = yield from self.get_block_number(chain_id)
+        response = yield from self.get_contract_api_response(
+            performative=ContractApiMessage.Performative.GET_STATE,  # type: ignore
+            contract_id=ERC20_CONTRACT_ID,
+            contract_callable="check_balance",
+            contract_address=token,
+            account=self.synchronized_data.safe_contract_address,
+            chain_id=chain_id,
+        )
+        if response.performative != ContractApiMessage.Performative.STATE:
+            self.context.logger.warning(
+                f"Could not read the balance of the Safe in {token} on {chain_id}: {response}"
+            )
+            return None
+        return Balance(
+            self.synchronized_data.period_count,
+            block_number,
+            int(response.state.body["token"]),
+        )
+
+    def sample_fees(self) -> Generator:
+        """Sample the fees of the chains of the sources, once per period."""
+        if not self.params.fee_history_size:
+            return
+        period = self.synchronized_data.period_count
+        chain_ids = sorted(
+            {
+                source.chain_id
+                for source in self.listing_sources
+                if not self.fee_history.is_sampled(source.chain_id, period)
+            }
+        )
+        yield from gather(
+            [partial(self.sample_fee, chain_id) for chain_id in chain_ids]
+        )
+
+    def sample_fee(self, chain_id: str) -> Generator:
+        """Sample the base fee of the next block of a chain, and the priority fee paid in its latest block."""
+        response = yield from self.get_ledger_api_response(
+            performative=LedgerApiMessage.Performative.GET_STATE,  # type: ignore
+            ledger_callable="fee_history",
+            block_count=1,
+            newest_block="latest",
+            reward_percentiles=[FEE_REWARD_PERCENTILE],
+            chain_id=chain_id,
+        )
+        if response.performative != LedgerApiMessage.Performative.STATE:
+            self.context.logger.warning(
+                f"Could not get the fee history of {chain_id}: {response}"
+            )
+            return
+        try:
+            body = response.state.body
+            base_fee = int(body["baseFeePerGas"][-1])
+            priority_fee = int(body["reward"][-1][0])
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            self.context.logger.warning(f"Invalid fee history of {chain_id}: {e!r}")
+            return
+        self.fee_history.add(
+            chain_id, self.synchronized_data.period_count, base_fee, priority_fee
+        )
+
+    def affordable(self, balances: Dict[TokenKey, int]) -> Callable[[Property], bool]:
+        """Get the check of whether a candidate can be paid for, with the balance of the Safe and within the budget."""
+
+        def accept(property_: Property) -> bool:
+            # without the balance, only the budget is checked
+            balance = balances.get(
+                self.token_of(self.source_of(property_.source)), property_.value
+            )
+            return self.budget.affordable(property_.value, balance)
+
+        return accept
+
+    def make_shard_decision(
+        self, shard: int, shards: int, accept: Callable[[Property], bool]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Get the candidate of the shard of the agent, i.e., its cheapest affordable property within the buying range."""
+        # only the properties of the shard were ranked
+        best = self.candidates.best(self.synchronized_data.period_count, accept)
+        if best is None:
+            self.log.info(
+                "shard",
+                "No candidate in shard {shard} of {shards}.",
+                shard=shard,
+                shards=shards,
+            )
+            return Event.DONE.value, {}
+        self.log.info(
+            "shard",
+            "Candidate of shard {shard} of {shards}: {property}",
+            shard=shard,
+            shards=shards,
+            property=best,
+        )
+        return Event.TRANSACT.value, self.property_data(best)
+
+    @staticmethod
+    def property_data(property_: Property) -> Dict[str, Any]:
+        """Get the data of the property to buy, with the source listing it if tagged."""
+        property_data: Dict[str, Any] = {
+            "property_id": property_.id,
+            "property_value": property_.value,
+        }
+        if property_.source is not None:
+            property_data["property_source"] = property_.source
+        return property_data
 
-        self.context.logger.info(
-            "No properties within the buying range; deciding to HOLD"
+    def download_listings(
+        self,
+    ) -> Generator[None, None, Optional[Iterator[Property]]]:
+        """Iterate over the listings, from the store or streamed from IPFS, if they can be got."""
+        ipfs_hash = self.synchronized_data.ipfs_hash
+        properties_for_sale = self.store.listings(ipfs_hash)
+        self.local_state.metrics.record_cache(
+            "listings_download", properties_for_sale is not None
         )
-        return Event.DONE.value, {}
+        if properties_for_sale is not None:
+            return iter(properties_for_sale)
+
+        listings = yield from self.get_from_ipfs(
+            ipfs_hash, custom_loader=iter_listings  # type: ignore
+        )
+        if listings is None:
+            self.context.logger.error(f"Could not get the listings {ipfs_hash}.")
+            return None
+        self.log.info(
+            "ipfs", "Retrieved the listings {ipfs_hash} from IPFS.", ipfs_hash=ipfs_hash
+        )
+        return iter_properties(cast(Iterator[List[Any]], listings))
 
 
 class TxPreparationBehaviour(
@@ -228,11 +1093,35 @@ class TxPreparationBehaviour(
 
     matching_round: Type[AbstractRound] = TxPreparationRound
 
+    @property
+    def listing_source(self) -> ListingSource:
+        """Return the source listing the property to buy, the first one if it is not tagged."""
+        return self.source_of(self.synchronized_data.property_source)
+
+    @property
+    def payment_token(self) -> str:
+        """Return the token the property to buy is paid in."""
+        return self.token_of(self.listing_source)[1]
+
     def async_act(self) -> Generator:
         """Do the act, supporting asynchronous execution."""
 
         with self.context.benchmark_tool.measure(self.behaviour_id).local():
+            key = (
+                self.synchronized_data.property_source or "",
+                cast(int, self.synchronized_data.property_id),
+            )
+            # the decision on the purchase was reached with the end of its round
+            self.latency.decide(key, time())
+            # the purchase is pending until the next listings tell whether it went through
+            self.candidates.reserve(key)
+            self.budget.reserve(cast(int, self.synchronized_data.property_value))
+            self.suggest_fees()
             update_real_estate_payload = yield from self.get_real_estate_update()
+            if update_real_estate_payload == "{}":
+                self.latency.drop()
+            else:
+                self.latency.prepare(time())
 
         with self.context.benchmark_tool.measure(self.behaviour_id).consensus():
             payload = TxPreparationPayload(
@@ -243,24 +1132,36 @@ class TxPreparationBehaviour(
 
         self.set_done()
 
+    def suggest_fees(self) -> None:
+        """Set the fees of the settlement of the purchase to the ones suggested by the fee history of its chain."""
+        # only the settlement skill has gas params
+        gas_params = getattr(self.params, "gas_params", None)
+        suggestion = self.fee_history.suggest(self.listing_source.chain_id)
+        if gas_params is None or suggestion is None:
+            return
+        gas_params.max_fee_per_gas = suggestion.max_fee_per_gas
+        gas_params.max_priority_fee_per_gas = suggestion.max_priority_fee_per_gas
+        self.log.info("fees", "Suggested fees of the purchase: {fees}", fees=suggestion)
+
     def get_real_estate_update(self) -> Generator[None, None, str]:
         """
         Check whether buy property txn needs to be made
 
         """
-        self.context.logger.info(
-            f"in Transction id: {self.synchronized_data.property_id}"
-        )
-        self.context.logger.info(
-            f"in Transction value: {self.synchronized_data.property_value}"
+        self.log.info(
+            "purchase",
+            "Preparing the purchase of property {id} for {value}",
+            id=self.synchronized_data.property_id,
+            value=self.synchronized_data.property_value,
         )
-        self.context.logger.info("Transaction decision is Buy")
         batch_transaction = yield from self._build_approve_and_buy_txns()
         if batch_transaction is None:
             return "{}"
-        
+
         multi_send_tx_data = yield from self._get_multisend_tx(batch_transaction)
-        self.context.logger.info(f"MULTISEND TRANSACTIONS: {multi_send_tx_data}")
+        self.log.debug(
+            "multisend_dump", "MULTISEND TRANSACTIONS: {data}", data=multi_send_tx_data
+        )
         if multi_send_tx_data is None:
             return "{}"
         return multi_send_tx_data
@@ -269,14 +1170,14 @@ class TxPreparationBehaviour(
 
         response = yield from self.get_contract_api_response(
             performative=ContractApiMessage.Performative.GET_STATE,  # type: ignore
-            contract_id=str(RealEstateSolutionContract.contract_id),
+            contract_id=REAL_ESTATE_CONTRACT_ID,
             contract_callable="get_buy_property_tx",
-            contract_address=self.params.real_estate_contract_address,
-            chain_id=GNOSIS_CHAIN_ID,
+            contract_address=self.listing_source.address,
+            chain_id=self.listing_source.chain_id,
             id=self.synchronized_data.property_id,
         )
 
-        self.context.logger.info(f"BUY TXN: {response}")
+        self.log.debug("contract_dump", "BUY TXN: {response}", response=response)
 
         if response.performative != ContractApiMessage.Performative.STATE:
             self.context.logger.error(
@@ -293,14 +1194,15 @@ class TxPreparationBehaviour(
     def _build_approve_txn(self) -> Generator[None, None, Optional[bytes]]:
         response = yield from self.get_contract_api_response(
             performative=ContractApiMessage.Performative.GET_STATE,  # type: ignore
-            contract_id=str(ERC20.contract_id),
+            contract_id=ERC20_CONTRACT_ID,
             contract_callable="build_approval_tx",
-            contract_address=self.params.real_estate_token,
-            spender=self.params.real_estate_contract_address,
+            contract_address=self.payment_token,
+            spender=self.listing_source.address,
             amount=self.synchronized_data.property_value,
+            chain_id=self.listing_source.chain_id,
         )
 
-        self.context.logger.info(f"APPROVE TXN: {response}")
+        self.log.debug("contract_dump", "APPROVE TXN: {response}", response=response)
 
         if response.performative != ContractApiMessage.Performative.STATE:
             self.context.logger.error(
@@ -343,22 +1245,33 @@ class TxPreparationBehaviour(
         :param data: the safe tx data. This is the data of the function being called, in this case `updateWeightGradually`.
         :return: the tx hash
         """
+        # pylint: disable-next=import-outside-toplevel
+        from packages.valory.contracts.gnosis_safe.contract import SafeOperation
+
         contract_api_kwargs = {
             "performative": ContractApiMessage.Performative.GET_STATE,  # type: ignore
             "contract_address": self.synchronized_data.safe_contract_address,  # the safe contract address
-            "contract_id": str(GnosisSafeContract.contract_id),
+            "contract_id": GNOSIS_SAFE_CONTRACT_ID,
             "contract_callable": "get_raw_safe_transaction_hash",
             "to_address": to_address,
             "value": self.ETHER_VALUE,
             "data": data,
             "safe_tx_gas": SAFE_GAS,
-            "chain_id": GNOSIS_CHAIN_ID,
-            "operation": SafeOperation.DELEGATE_CALL.value
+            "chain_id": self.listing_source.chain_id,
+            "operation": SafeOperation.DELEGATE_CALL.value,
         }
 
-        self.context.logger.info(f"contract_api_kwargs is: {contract_api_kwargs}")
+        self.log.debug(
+            "contract_dump",
+            "contract_api_kwargs is: {kwargs}",
+            kwargs=contract_api_kwargs,
+        )
         response = yield from self.get_contract_api_response(**contract_api_kwargs)
-        self.context.logger.info(f"contract api response for safe_tx: {response}")
+        self.log.debug(
+            "contract_dump",
+            "contract api response for safe_tx: {response}",
+            response=response,
+        )
 
         if response.performative != ContractApiMessage.Performative.STATE:
             self.context.logger.error(
@@ -378,27 +1291,32 @@ class TxPreparationBehaviour(
         """Given a list of transactions, bundle them together in a single multisend tx."""
         multi_send_txs = []
 
-        multi_send_approve_tx = self._to_multisend_format(
-            txs[0], self.params.real_estate_token
+        multi_send_approve_tx = self._to_multisend_format(txs[0], self.payment_token)
+        self.log.debug(
+            "multisend_dump", "multi_send_approve_tx is: {tx}", tx=multi_send_approve_tx
         )
-        self.context.logger.info(f"multi_send_approve_tx is: {multi_send_approve_tx}")
         multi_send_txs.append(multi_send_approve_tx)
 
         multi_send_buy_tx = self._to_multisend_format(
-            txs[1], self.params.real_estate_contract_address
+            txs[1], self.listing_source.address
+        )
+        self.log.debug(
+            "multisend_dump", "multi_send_buy_tx is: {tx}", tx=multi_send_buy_tx
         )
-        self.context.logger.info(f"multi_send_buy_tx is: {multi_send_buy_tx}")
         multi_send_txs.append(multi_send_buy_tx)
 
         response = yield from self.get_contract_api_response(
             performative=ContractApiMessage.Performative.GET_RAW_TRANSACTION,  # type: ignore
             contract_address=MULTISEND_ADDRESS,
-            contract_id=str(MultiSendContract.contract_id),
+            contract_id=MULTISEND_CONTRACT_ID,
             contract_callable="get_tx_data",
             multi_send_txs=multi_send_txs,
+            chain_id=self.listing_source.chain_id,
         )
 
-        self.context.logger.info(f"PREPARED MULTISEND TXN:{response}")
+        self.log.debug(
+            "multisend_dump", "PREPARED MULTISEND TXN: {response}", response=response
+        )
 
         if response.performative != ContractApiMessage.Performative.RAW_TRANSACTION:
             self.context.logger.error(
@@ -414,6 +1332,10 @@ class TxPreparationBehaviour(
 
         tx_data = bytes.fromhex(multisend_data_str)
         # self.context.logger.info(f"tx_data is: {tx_data}")
+        if self.params.preflight_simulation:
+            succeeded = yield from self.simulate_safe_tx(MULTISEND_ADDRESS, tx_data)
+            if not succeeded:
+                return None
         tx_hash = yield from self._get_safe_tx_hash(
             tx_data, MULTISEND_ADDRESS, is_multisend=True
         )
@@ -422,6 +1344,12 @@ class TxPreparationBehaviour(
         if tx_hash is None:
             return None
 
+        # pylint: disable=import-outside-toplevel
+        from packages.valory.contracts.gnosis_safe.contract import SafeOperation
+        from packages.valory.skills.transaction_settlement_abci.payload_tools import (
+            hash_payload_to_hex,
+        )
+
         payload_data = hash_payload_to_hex(
             safe_tx_hash=tx_hash,
             ether_value=self.ETHER_VALUE,
@@ -432,8 +1360,48 @@ class TxPreparationBehaviour(
         )
         return payload_data
 
+    def simulate_safe_tx(
+        self, to_address: str, data: bytes
+    ) -> Generator[None, None, bool]:
+        """Simulate the delegate call of the Safe to `to_address` at the latest block, and check that it would not revert."""
+        chain_id = self.listing_source.chain_id
+        block_number = yield from self.get_block_number(chain_id)
+        response = yield from self.get_ledger_api_response(
+            performative=LedgerApiMessage.Performative.GET_STATE,  # type: ignore
+            ledger_callable="call",
+            transaction={
+                "to": self.synchronized_data.safe_contract_address,
+                "data": encode_simulation(to_address, data),
+            },
+            block_identifier="latest" if block_number is None else block_number,
+            chain_id=chain_id,
+        )
+        # `simulateAndRevert` always reverts, with the outcome of the call
+        revert = (
+            response.message
+            if response.performative == LedgerApiMessage.Performative.ERROR
+            else ""
+        )
+        succeeded = simulation_succeeded(revert)
+        if succeeded is None:
+            self.context.logger.warning(
+                f"Could not simulate the Safe transaction, sending it anyway: {response}"
+            )
+            return True
+        if not succeeded:
+            self.context.logger.error(
+                f"The Safe transaction reverts at block {block_number}, dropping "
+                f"the purchase of property {self.synchronized_data.property_id}."
+            )
+        return succeeded
+
     def _to_multisend_format(self, single_tx: bytes, to_address) -> Dict[str, Any]:
         """This method puts tx data from a single tx into the multisend format."""
+        # pylint: disable=import-outside-toplevel
+        from hexbytes import HexBytes
+
+        from packages.valory.contracts.multisend.contract import MultiSendOperation
+
         multisend_format = {
             "operation": MultiSendOperation.CALL,
             "to": to_address,
@@ -443,6 +1411,59 @@ class TxPreparationBehaviour(
         return multisend_format
 
 
+class SettlementFailureBehaviour(
+    LearningBaseBehaviour
+):  # pylint: disable=too-many-ancestors
+    """SettlementFailureBehaviour"""
+
+    matching_round: Type[AbstractRound] = SettlementFailureRound
+
+    @property
+    def settlement_backoff(self) -> SettlementBackoff:
+        """Return the backoff policy of the failed settlements."""
+        return cast(SettlementBackoff, self.local_state.settlement_backoff)
+
+    def async_act(self) -> Generator:
+        """Do the act, supporting asynchronous execution."""
+
+        with self.context.benchmark_tool.measure(self.behaviour_id).local():
+            event = yield from self.handle_failure()
+            payload = SettlementFailurePayload(self.context.agent_address, event)
+
+        with self.context.benchmark_tool.measure(self.behaviour_id).consensus():
+            yield from self.send_a2a_transaction(payload)
+            yield from self.wait_until_round_end()
+
+        self.set_done()
+
+    def handle_failure(self) -> Generator[None, None, str]:
+        """Back off before the transaction is settled again, or give the purchase up once the circuit opens."""
+        backoff = self.settlement_backoff
+        tx_hash = self.synchronized_data.most_voted_tx_hash
+        # the failures are counted by the round, so all the agents agree on them,
+        # and a retry of this round does not count the same failure twice
+        count = self.synchronized_data.settlement_failures + 1
+        if backoff.is_open(count):
+            key = (
+                self.synchronized_data.property_source or "",
+                cast(int, self.synchronized_data.property_id),
+            )
+            # the property is skipped until its ban is over
+            self.candidates.ban(key, self.synchronized_data.period_count)
+            self.latency.drop()
+            self.context.logger.warning(
+                f"The settlement of {tx_hash} failed {count} times; giving up the "
+                f"purchase of property {key} for {self.candidates.retry_periods} periods."
+            )
+            return Event.ERROR.value
+        delay = backoff.delay(count)
+        self.context.logger.warning(
+            f"The settlement of {tx_hash} failed {count} times; retrying in {delay}s."
+        )
+        yield from self.sleep(delay)
+        return Event.TRANSACT.value
+
+
 class LearningRoundBehaviour(AbstractRoundBehaviour):
     """LearningRoundBehaviour"""
 
@@ -452,4 +1473,5 @@ class LearningRoundBehaviour(AbstractRoundBehaviour):
         APICheckBehaviour,
         DecisionMakingBehaviour,
         TxPreparationBehaviour,
+        SettlementFailureBehaviour,
     ]
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+This module contains the balances of the Safe and the budget of the purchases.
+
+The token balances of the Safe are read once per period, at a known block, and
+cached until the next period. The budget caps the value bought across the
+periods: the value of a purchase is reserved when it is prepared, and spent
+once the listings tell that it went through, or released if it did not.
+
+Example:
+
+    >>> budget = Budget(limit=300)
+    >>> budget.reserve(200)
+    >>> budget.available(balance=1000)
+    100
+    >>> budget.settle(bought=True)
+    >>> budget.spent, budget.affordable(150, balance=1000)
+    (200, False)
+"""
+
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+# the chain and the address of a token
+TokenKey = Tuple[str, str]
+
+
+class Balance(NamedTuple):
+    """The token balance of the Safe, as read in a period at a block."""
+
+    period: int
+    block: Optional[int]
+    amount: int
+
+
+class BalanceCache:
+    """The token balances of the Safe, read once per period."""
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self.balances: Dict[TokenKey, Balance] = {}
+
+    def get(self, key: TokenKey, period: int) -> Optional[Balance]:
+        """Get the balance of a token, if it was read in the period."""
+        balance = self.balances.get(key, None)
+        if balance is None or balance.period != period:
+            return None
+        return balance
+
+    def put(self, key: TokenKey, balance: Balance) -> None:
+        """Cache the balance of a token, until the next period."""
+        self.balances[key] = balance
+
+
+class Budget:
+    """The value which can still be bought, across the periods, with no cap if the limit is 0."""
+
+    def __init__(self, limit: int) -> None:
+        """Initialize the budget."""
+        self.limit = limit
+        self.spent = 0
+        # the value of the purchase which is pending
+        self.pending = 0
+
+    def available(self, balance: int) -> int:
+        """Get the value which can be bought, given the balance of the Safe."""
+        if not self.limit:
+            return balance
+        return min(balance, self.limit - self.spent - self.pending)
+
+    def affordable(self, value: int, balance: int) -> bool:
+        """Check whether a property of the given value can be bought."""
+        return value <= self.available(balance)
+
+    def reserve(self, value: int) -> None:
+        """Reserve the value of a purchase which is prepared."""
+        self.pending = value
+
+    def settle(self, bought: Optional[bool]) -> None:
+        """Spend the value of the pending purchase if it went through, or release it otherwise."""
+        if bought:
+            self.spent += self.pending
+        if bought is not None:
+            self.pending = 0
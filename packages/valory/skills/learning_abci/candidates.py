@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+This module contains the ranked queue of the candidates to buy.
+
+The properties for sale within the buying range are ranked once per listings,
+in their listing order, or the cheapest first, then by id and source, if
+`cheapest` is set, as in the sharded mode. In that mode, a `(shard, shards)`
+is given, and only the properties of the shard of the agent are ranked, see
+`sharding`. Only the first `size` candidates are kept: in the listing order, the listings are only read up to them, while
+the cheapest ones are picked from the whole listings with a bounded heap. If
+the candidates kept all turn out to be banned or unaffordable while the
+listings held more, the listings are ranked again with an `accept` filter,
+which skips the rejected properties before they take up the queue.
+
+The purchase of a candidate is pending until the next listings: if its
+property is still for sale then, the purchase did not go through, and the
+candidate is banned for `retry_periods` periods, after which it is retried.
+The properties which are sold drop out of the queue with the listings which no
+longer offer them. As long as the listings do not change, the next decision is
+taken from the queue, without downloading or scanning the listings again.
+
+Example:
+
+    >>> queue = CandidateQueue(retry_periods=2)
+    >>> properties = [Property(1, "a", "0x1", 150, True), Property(2, "b", "0x2", 120, True)]
+    >>> queue.rebuild("Qm1", properties, low=100, high=200, period=0)
+    >>> queue.best(period=0).id
+    1
+    >>> queue.reserve(key_of(queue.best(period=0)))
+    >>> queue.settle(period=1)
+    False
+    >>> queue.best(period=1).id
+    2
+    >>> queue.best(period=3).id
+    1
+"""
+
+import heapq
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from packages.valory.skills.learning_abci.properties import Property
+from packages.valory.skills.learning_abci.sharding import shard_of
+
+
+# the candidates kept from each listings, at most
+DEFAULT_SIZE = 64
+
+# the source tag and the id of a property
+Key = Tuple[str, int]
+# the shard of the agent, and the number of shards
+Shard = Tuple[int, int]
+
+
+def key_of(property_: Property) -> Key:
+    """Get the key of a property, unique across the sources."""
+    return property_.source or "", property_.id
+
+
+def rank_of(property_: Property) -> Tuple[int, int, str]:
+    """Get the rank of a property, the cheapest first, then the lowest id and source."""
+    return property_.value, property_.id, property_.source or ""
+
+
+class CandidateQueue:
+    """The ranked candidates of the last listings, and the bans of the failed ones."""
+
+    def __init__(self, retry_periods: int, size: int = DEFAULT_SIZE) -> None:
+        """Initialize the queue."""
+        self.retry_periods = retry_periods
+        self.size = size
+        # the IPFS hash of the listings the candidates were ranked from
+        self.ipfs_hash: Optional[str] = None
+        self.shard: Optional[Shard] = None
+        self.candidates: List[Property] = []
+        # whether the listings held more candidates than the queue kept
+        self.truncated = False
+        # the period until which each failed candidate is banned, exclusive
+        self.banned: Dict[Key, int] = {}
+        self.pending: Optional[Key] = None
+
+    def is_current(
+        self, ipfs_hash: Optional[str], shard: Optional[Shard] = None
+    ) -> bool:
+        """Check whether the candidates were ranked from the given listings, for the given shard."""
+        return (
+            ipfs_hash is not None
+            and self.ipfs_hash == ipfs_hash
+            and self.shard == shard
+        )
+
+    def rebuild(  # pylint: disable=too-many-arguments
+        self,
+        ipfs_hash: Optional[str],
+        properties: Iterable[Property],
+        low: int,
+        high: int,
+        period: int,
+        cheapest: bool = False,
+        shard: Optional[Shard] = None,
+        accept: Optional[Callable[[Property], bool]] = None,
+    ) -> Optional[bool]:
+        """Rank the candidates of new listings, banning the pending one if it is still for sale, and tell whether its purchase went through."""
+        pending, self.pending = self.pending, None
+        listed = False
+        found = 0
+
+        def in_range() -> Iterator[Property]:
+            nonlocal listed, found
+            for property_ in properties:
+                if not property_.for_sale:
+                    continue
+                if pending is not None and key_of(property_) == pending:
+                    listed = True
+                if not low < property_.value < high:
+                    continue
+                if shard is not None and shard_of(property_.id, shard[1]) != shard[0]:
+                    continue
+                if accept is None or self.is_usable(property_, period, accept):
+                    found += 1
+                    yield property_
+
+        candidates = in_range()
+        if cheapest:
+            self.candidates = heapq.nsmallest(self.size, candidates, key=rank_of)
+        else:
+            # one more candidate is read, to tell whether the listings hold more
+            self.candidates = list(islice(candidates, self.size + 1))
+            del self.candidates[self.size :]
+            if pending is not None and not listed:
+                # the rest of the listings is only read to find the pending candidate
+                for _ in candidates:
+                    if listed:
+                        break
+
+        self.truncated = found > self.size
+        bought = None
+        if pending is not None:
+            bought = not listed
+            if listed:
+                self.ban(pending, period)
+        # the bans which expired are of no use anymore
+        self.banned = {
+            key: until for key, until in self.banned.items() if until > period
+        }
+        self.ipfs_hash = ipfs_hash
+        self.shard = shard
+        return bought
+
+    def settle(self, period: int) -> Optional[bool]:
+        """Ban the pending candidate, as the listings did not change since its purchase, which did not go through."""
+        if self.pending is None:
+            return None
+        self.ban(self.pending, period)
+        self.pending = None
+        return False
+
+    def ban(self, key: Key, period: int) -> None:
+        """Ban a candidate for `retry_periods` periods."""
+        self.banned[key] = period + self.retry_periods
+
+    def reserve(self, key: Key) -> None:
+        """Mark the purchase of a candidate as pending."""
+        self.pending = key
+
+    def is_usable(
+        self, property_: Property, period: int, accept: Callable[[Property], bool]
+    ) -> bool:
+        """Check whether a candidate is not banned in the period, and accepted."""
+        return self.banned.get(key_of(property_), period) <= period and accept(
+            property_
+        )
+
+    def best(
+        self, period: int, accept: Callable[[Property], bool] = lambda _: True
+    ) -> Optional[Property]:
+        """Get the best candidate which is not banned in the period, among the accepted ones."""
+        for property_ in self.candidates:
+            if self.is_usable(property_, period, accept):
+                return property_
+        return None
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+This module contains the fee history of the chains the purchases are settled on.
+
+The base fee and the priority fee of the latest block are sampled once per
+period into a rolling window per chain. The suggested priority fee is their
+percentile over the window, and the suggested max fee doubles the higher of
+the latest base fee and its percentile, which keeps the transaction includable
+through five full blocks, each raising the base fee by 12.5% (1.125^5 < 2).
+
+Example:
+
+    >>> history = FeeHistory(size=4, percentile=75.0)
+    >>> for period, (base_fee, priority_fee) in enumerate([(10, 1), (12, 2), (11, 3), (9, 2)]):
+    ...     history.add("ethereum", period, base_fee, priority_fee)
+    >>> history.suggest("ethereum")
+    FeeSuggestion(max_fee_per_gas=27, max_priority_fee_per_gas=3)
+"""
+
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from packages.valory.skills.learning_abci.metrics import Summary
+
+
+# the factor of the base fee which covers its rise over five full blocks
+BASE_FEE_MULTIPLIER = 2
+
+
+class FeeSuggestion(NamedTuple):
+    """The EIP-1559 fees suggested for a transaction, in wei."""
+
+    max_fee_per_gas: int
+    max_priority_fee_per_gas: int
+
+
+class FeeHistory:
+    """The base fees and priority fees sampled on each chain, over the last `size` periods."""
+
+    def __init__(self, size: int, percentile: float) -> None:
+        """Initialize the history."""
+        self.size = size
+        self.percentile = percentile
+        self.base_fees: Dict[str, Summary] = {}
+        self.priority_fees: Dict[str, Summary] = {}
+        # the period and the base fee of the last sample of each chain
+        self.last: Dict[str, Tuple[int, int]] = {}
+
+    def is_sampled(self, chain_id: str, period: int) -> bool:
+        """Check whether the fees of a chain were sampled in the period."""
+        last = self.last.get(chain_id, None)
+        return last is not None and last[0] == period
+
+    def add(self, chain_id: str, period: int, base_fee: int, priority_fee: int) -> None:
+        """Add the fees of the latest block of a chain, sampled in the period."""
+        if chain_id not in self.last:
+            self.base_fees[chain_id] = Summary(self.size)
+            self.priority_fees[chain_id] = Summary(self.size)
+        self.base_fees[chain_id].observe(base_fee)
+        self.priority_fees[chain_id].observe(priority_fee)
+        self.last[chain_id] = (period, base_fee)
+
+    def suggest(self, chain_id: str) -> Optional[FeeSuggestion]:
+        """Get the fees suggested for a transaction on a chain, if its fees were sampled."""
+        last = self.last.get(chain_id, None)
+        if last is None:
+            return None
+        q = self.percentile / 100
+        base_fee = max(last[1], int(self.base_fees[chain_id].quantile(q) or 0))
+        priority_fee = int(self.priority_fees[chain_id].quantile(q) or 0)
+        return FeeSuggestion(
+            BASE_FEE_MULTIPLIER * base_fee + priority_fee, priority_fee
+        )
@@ -19,6 +19,13 @@
 
 """This module contains the handlers for the skill of LearningAbciApp."""
 
+from enum import Enum
+from typing import Callable, Optional, cast
+from urllib.parse import urlparse
+
+from aea.protocols.base import Message
+
+from packages.valory.protocols.http.message import HttpMessage
 from packages.valory.skills.abstract_round_abci.handlers import (
     ABCIRoundHandler as BaseABCIRoundHandler,
 )
@@ -40,10 +47,95 @@ from packages.valory.skills.abstract_round_abci.handlers import (
 from packages.valory.skills.abstract_round_abci.handlers import (
     TendermintHandler as BaseTendermintHandler,
 )
+from packages.valory.skills.learning_abci.dialogues import HttpDialogue, HttpDialogues
+from packages.valory.skills.learning_abci.metrics import CONTENT_TYPE
+
+
+class HttpCode(Enum):
+    """Http codes"""
+
+    OK_CODE = 200
+    NOT_FOUND_CODE = 404
+
+
+class HttpMethod(Enum):
+    """Http methods"""
+
+    GET = "get"
+    HEAD = "head"
+
+
+class HttpHandler(BaseHttpHandler):
+    """Handle the responses to the skill's requests and serve the skill's routes."""
+
+    def setup(self) -> None:
+        """Set up the handler."""
+        self.routes = {
+            "/metrics": self._handle_get_metrics,
+        }
+
+    def handle(self, message: Message) -> None:
+        """Handle an incoming http message."""
+        http_msg = cast(HttpMessage, message)
+        if http_msg.performative != HttpMessage.Performative.REQUEST:
+            super().handle(message)
+            return
+
+        http_dialogues = cast(HttpDialogues, self.context.http_dialogues)
+        http_dialogue = cast(Optional[HttpDialogue], http_dialogues.update(http_msg))
+        if http_dialogue is None:
+            self.context.logger.info(
+                f"Received invalid http message={http_msg}, unidentified dialogue."
+            )
+            return
+
+        handler = self._get_handler(http_msg.url, http_msg.method)
+        if handler is None:
+            self._send_response(http_msg, http_dialogue, HttpCode.NOT_FOUND_CODE, b"")
+            return
+        handler(http_msg, http_dialogue)
+
+    def _get_handler(self, url: str, method: str) -> Optional[Callable]:
+        """Get the handler of a route."""
+        if method.lower() not in (HttpMethod.GET.value, HttpMethod.HEAD.value):
+            return None
+        return self.routes.get(urlparse(url).path.rstrip("/"), None)
+
+    def _handle_get_metrics(
+        self, http_msg: HttpMessage, http_dialogue: HttpDialogue
+    ) -> None:
+        """Serve the pre-aggregated metrics of the skill."""
+        body = self.context.state.metrics.render().encode("utf-8")
+        self._send_response(
+            http_msg,
+            http_dialogue,
+            HttpCode.OK_CODE,
+            body,
+            f"Content-Type: {CONTENT_TYPE}\n",
+        )
+
+    def _send_response(  # pylint: disable=too-many-arguments
+        self,
+        http_msg: HttpMessage,
+        http_dialogue: HttpDialogue,
+        code: HttpCode,
+        body: bytes,
+        headers: str = "",
+    ) -> None:
+        """Reply to an http request."""
+        http_response = http_dialogue.reply(
+            performative=HttpMessage.Performative.RESPONSE,
+            target_message=http_msg,
+            version=http_msg.version,
+            status_code=code.value,
+            status_text="Success" if code == HttpCode.OK_CODE else "Not found",
+            headers=f"{headers}{http_msg.headers}",
+            body=body,
+        )
+        self.context.outbox.put_message(message=http_response)
 
 
 ABCIHandler = BaseABCIRoundHandler
-HttpHandler = BaseHttpHandler
 SigningHandler = BaseSigningHandler
 LedgerApiHandler = BaseLedgerApiHandler
 ContractApiHandler = BaseContractApiHandler
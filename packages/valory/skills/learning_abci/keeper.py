@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+This module contains the rotation and the checks of the keeper fetch mode.
+
+In the keeper fetch mode, only the keeper of the period fetches the price and
+the listings, pinned to a block, and publishes them with the digest of the
+listings. The other agents check the price against a tolerance band around
+the last price they fetched themselves, and only some of them, at random,
+fetch the price and read the listings again at the same block to check the
+digest. The prices of the keeper are never stored, so a keeper cannot move
+the band by publishing prices at its edge period after period.
+
+Example:
+
+    >>> keeper_of(["0xa", "0xb", "0xc"], period=4)
+    '0xb'
+    >>> within_band(1.04, reference=1.0, tolerance=0.05)
+    True
+"""
+
+import random
+from typing import Sequence
+
+
+def keeper_of(participants: Sequence[str], period: int) -> str:
+    """Get the keeper of a period, rotating over the sorted participants."""
+    return participants[period % len(participants)]
+
+
+def within_band(price: float, reference: float, tolerance: float) -> bool:
+    """Check that a price is within a relative tolerance of a reference price."""
+    return abs(price - reference) <= tolerance * abs(reference)
+
+
+def should_audit(probability: float) -> bool:
+    """Draw whether to check the published listings, so that the keeper cannot predict who does."""
+    return random.random() < probability  # nosec
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+This module contains the tracker of the latency from the listing of a property to its purchase.
+
+A property is sighted when it first shows up among the candidates, at the
+latest block known of its chain. Its purchase is then timed at each stage:
+the decision to buy it, the preparation of its transaction, the settlement,
+i.e., the end of the finalization of the transaction, and its inclusion,
+i.e., the end of its validation. All the timestamps are wall clock times.
+
+Example:
+
+    >>> tracker = LatencyTracker(history=10)
+    >>> tracker.observe_block("ethereum", 100)
+    >>> tracker.see({("ethereum:0xa", 1): "ethereum"}, timestamp=0.0)
+    >>> tracker.decide(("ethereum:0xa", 1), timestamp=2.0)
+    >>> tracker.prepare(timestamp=3.5)
+    >>> purchase = tracker.complete(settled_at=5.0, included_at=9.0)
+    >>> purchase.listed_block, purchase.stages()
+    (100, {'decision': 2.0, 'preparation': 1.5, 'settlement': 1.5, 'inclusion': 4.0, 'total': 9.0})
+"""
+
+from collections import deque
+from typing import Deque, Dict, NamedTuple, Optional
+
+from packages.valory.skills.learning_abci.candidates import Key
+
+
+STAGES = ("decision", "preparation", "settlement", "inclusion")
+TOTAL = "total"
+
+
+class Sighting(NamedTuple):
+    """The block and the time at which a property was first seen."""
+
+    block: Optional[int]
+    timestamp: float
+
+
+class PurchaseLatency(NamedTuple):
+    """The timestamps of the stages of a purchase, from the listing of its property."""
+
+    key: Key
+    listed_block: Optional[int]
+    listed_at: float
+    decided_at: float
+    prepared_at: Optional[float] = None
+    settled_at: Optional[float] = None
+    included_at: Optional[float] = None
+
+    def stages(self) -> Dict[str, float]:
+        """Get the duration of each stage reached, in seconds, and the total once included."""
+        timestamps = (
+            self.listed_at,
+            self.decided_at,
+            self.prepared_at,
+            self.settled_at,
+            self.included_at,
+        )
+        durations = {}
+        for stage, start, end in zip(STAGES, timestamps, timestamps[1:]):
+            if start is None or end is None:
+                break
+            durations[stage] = end - start
+        if self.included_at is not None:
+            durations[TOTAL] = self.included_at - self.listed_at
+        return durations
+
+
+class LatencyTracker:
+    """The sightings of the candidates, the purchase in progress and the last `history` completed ones."""
+
+    def __init__(self, history: int) -> None:
+        """Initialize the tracker."""
+        # the latest block known of each chain
+        self.blocks: Dict[str, int] = {}
+        self.sightings: Dict[Key, Sighting] = {}
+        self.pending: Optional[PurchaseLatency] = None
+        self.purchases: Deque[PurchaseLatency] = deque(maxlen=history)
+
+    def observe_block(self, chain_id: str, number: int) -> None:
+        """Observe the number of a block of a chain."""
+        self.blocks[chain_id] = max(number, self.blocks.get(chain_id, number))
+
+    def see(self, chain_ids: Dict[Key, str], timestamp: float) -> None:
+        """See the candidates, mapped to the chain listing them, forgetting the ones which are no longer listed."""
+        self.sightings = {
+            key: self.sightings.get(key, None)
+            or Sighting(self.blocks.get(chain_id, None), timestamp)
+            for key, chain_id in chain_ids.items()
+        }
+
+    def decide(self, key: Key, timestamp: float) -> None:
+        """Start timing the purchase of a candidate, decided on at `timestamp`."""
+        sighting = self.sightings.get(key, None) or Sighting(None, timestamp)
+        self.pending = PurchaseLatency(
+            key, sighting.block, sighting.timestamp, timestamp
+        )
+
+    def prepare(self, timestamp: float) -> None:
+        """Time the preparation of the transaction of the pending purchase."""
+        if self.pending is not None:
+            self.pending = self.pending._replace(prepared_at=timestamp)
+
+    def drop(self) -> None:
+        """Stop timing the pending purchase, which was given up."""
+        self.pending = None
+
+    def complete(
+        self, settled_at: Optional[float], included_at: float
+    ) -> Optional[PurchaseLatency]:
+        """Complete the pending purchase with its settlement and inclusion, if they came after its preparation."""
+        pending = self.pending
+        if (
+            pending is None
+            or pending.prepared_at is None
+            or included_at < pending.prepared_at
+        ):
+            return None
+        purchase = pending._replace(settled_at=settled_at, included_at=included_at)
+        self.pending = None
+        self.purchases.append(purchase)
+        return purchase
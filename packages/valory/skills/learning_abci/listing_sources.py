@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+This module contains the sources of the listings.
+
+A source is a real estate contract on a chain, configured as `chain:address`,
+optionally followed by `:token`, the token its properties are paid in. The
+properties of all the sources are merged into one index, in which each row is
+tagged with the `chain:address` of its source, so that a property is bought
+from its own contract, on its own chain.
+
+Example:
+
+    >>> source = ListingSource.parse("gnosis:0xbB98")
+    >>> source.chain_id, source.address, source.tag
+    ('gnosis', '0xbB98', 'gnosis:0xbB98')
+    >>> merge_listings([(source, [[1, "a", "0x1", 130, True]])])
+    [[1, 'a', '0x1', 130, True, 'gnosis:0xbB98']]
+"""
+
+from typing import (
+    Any,
+    Callable,
+    Generator,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+
+SEPARATOR = ":"
+
+Request = Callable[[], Generator[None, None, Any]]
+
+
+class ListingSource(NamedTuple):
+    """A real estate contract on a chain, and the token its properties are paid in."""
+
+    chain_id: str
+    address: str
+    token: Optional[str] = None
+
+    @classmethod
+    def parse(cls, source: str) -> "ListingSource":
+        """Parse a `chain:address[:token]` source."""
+        parts = source.split(SEPARATOR)
+        if len(parts) not in (2, 3) or not all(parts):
+            raise ValueError(
+                f"Invalid listing source {source!r}, expected `chain:address[:token]`."
+            )
+        return cls(*parts)
+
+    @property
+    def tag(self) -> str:
+        """Get the tag of the properties of the source."""
+        return f"{self.chain_id}{SEPARATOR}{self.address}"
+
+
+def chain_of(tag: str) -> str:
+    """Get the chain of a source tag."""
+    return tag.split(SEPARATOR, 1)[0]
+
+
+def merge_listings(
+    results: Iterable[Tuple[ListingSource, Iterable[Sequence[Any]]]]
+) -> List[List[Any]]:
+    """Merge the rows read from each source into one index, tagging each row with its source."""
+    return [[*row, source.tag] for source, rows in results for row in rows]
+
+
+def gather(requests: Sequence[Request]) -> Generator[None, None, List[Any]]:
+    """
+    Run requests concurrently, and get all their answers in order.
+
+    As with `hedged`, the requests must only yield `None`, i.e., poll for
+    their responses instead of waiting for a message.
+    """
+    pending = {index: request() for index, request in enumerate(requests)}
+    answers: List[Any] = [None] * len(requests)
+    try:
+        while pending:
+            for index, request in list(pending.items()):
+                try:
+                    next(request)
+                except StopIteration as stop:
+                    del pending[index]
+                    answers[index] = stop.value
+            if pending:
+                yield
+    finally:
+        for request in pending.values():
+            request.close()
+    return answers
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+This module contains the streaming reader of the listings uploaded to IPFS.
+
+The listings file is a JSON object holding the properties for sale under
+`LISTINGS_KEY`. Instead of loading the whole object, `iter_listings` decodes
+the properties one at a time, on demand, so that a consumer which stops early
+never decodes the rest of the file.
+
+Example:
+
+    >>> listings = iter_listings('{"Properties for sale: ": [[1, "a"], [2, "b"]]}')
+    >>> next(listings)
+    [1, 'a']
+"""
+
+import json
+import re
+from typing import Any, Iterator
+
+
+LISTINGS_KEY = "Properties for sale: "
+LISTINGS_FILENAME = "ListedProperties.json"
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+def _skip_whitespace(text: str, index: int) -> int:
+    """Get the index of the next non-whitespace character."""
+    return _WHITESPACE.match(text, index).end()  # type: ignore
+
+
+def _expect(text: str, index: int, char: str) -> int:
+    """Check that the next non-whitespace character is `char`, and get the index after it."""
+    index = _skip_whitespace(text, index)
+    if text[index : index + 1] != char:
+        raise json.JSONDecodeError(f"Expecting {char!r}", text, index)
+    return index + 1
+
+
+def _iter_array(text: str, index: int) -> Iterator[Any]:
+    """Decode the items of the array starting at `index`, one at a time."""
+    index = _skip_whitespace(text, _expect(text, index, "["))
+    if text[index : index + 1] == "]":
+        return
+    while True:
+        item, index = _DECODER.raw_decode(text, index)
+        yield item
+        index = _skip_whitespace(text, index)
+        char = text[index : index + 1]
+        if char == "]":
+            return
+        if char != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, index)
+        index = _skip_whitespace(text, index + 1)
+
+
+def iter_listings(text: str, key: str = LISTINGS_KEY) -> Iterator[Any]:
+    """Decode the properties of a serialized listings file, one at a time."""
+    index = _skip_whitespace(text, _expect(text, 0, "{"))
+    if text[index : index + 1] == "}":
+        raise KeyError(key)
+    while True:
+        name, index = _DECODER.raw_decode(text, index)
+        index = _skip_whitespace(text, _expect(text, index, ":"))
+        if name == key:
+            yield from _iter_array(text, index)
+            return
+        # another member, which is decoded to be skipped
+        _, index = _DECODER.raw_decode(text, index)
+        index = _skip_whitespace(text, index)
+        if text[index : index + 1] != ",":
+            raise KeyError(key)
+        index = _skip_whitespace(text, index + 1)
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+This module contains the structured, sampled and rate-limited logs of the skill.
+
+Each line has a key, e.g. `listings`, and a message template which is only
+formatted once the line is emitted: at a level the logger is enabled for, for
+one in `sampling[key]` lines of the key, and within `rate_limits[key]` lines
+per minute. The lines left out are counted, and the count is reported with the
+next line of their key. The full dumps of the messages and responses are only
+logged at DEBUG, so they are not even formatted at the default level.
+
+With a sink, the lines are written as JSON by a background thread, in
+batches, so that the agent's loop never waits on the disk. The warnings and
+the errors are written to the logger of the skill as well.
+
+Example:
+
+    >>> log = SkillLog(logging.getLogger(__name__), sampling={"property": 10})
+    >>> [log.allow("property", now=0.0) for _ in range(12)].count(True)
+    2
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from packages.valory.skills.learning_abci.rate_limit import TokenBucket
+
+
+# the lines the sink holds before dropping the new ones
+SINK_CAPACITY = 10_000
+# the seconds the sink waits for its last lines to be written when closed
+SINK_CLOSE_TIMEOUT = 5.0
+
+Logger = Union[logging.Logger, logging.LoggerAdapter]
+
+
+class LogSink:
+    """A file of JSON lines, written by a background thread."""
+
+    def __init__(self, path: Path, capacity: int = SINK_CAPACITY) -> None:
+        """Initialize the sink, and start its thread."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.dropped = 0
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue(capacity)
+        self._thread = threading.Thread(
+            target=self._write, name="learning-log-sink", daemon=True
+        )
+        self._thread.start()
+
+    def put(self, line: str) -> None:
+        """Queue a line to be written, or drop it if the sink is full."""
+        try:
+            self._lines.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+
+    def _write(self) -> None:
+        """Write the queued lines, in batches, until the sink is closed."""
+        with open(self.path, "a", encoding="utf-8") as file:
+            while True:
+                batch: List[Optional[str]] = [self._lines.get()]
+                while True:
+                    try:
+                        batch.append(self._lines.get_nowait())
+                    except queue.Empty:
+                        break
+                file.writelines(line + "\n" for line in batch if line is not None)
+                file.flush()
+                if None in batch:
+                    return
+
+    def close(self) -> None:
+        """Write the queued lines, and stop the thread."""
+        self._lines.put(None)
+        self._thread.join(SINK_CLOSE_TIMEOUT)
+
+
+class SkillLog:
+    """The logs of the skill, sampled and rate limited per key."""
+
+    def __init__(
+        self,
+        logger: Logger,
+        sampling: Optional[Dict[str, int]] = None,
+        rate_limits: Optional[Dict[str, int]] = None,
+        sink: Optional[LogSink] = None,
+    ) -> None:
+        """Initialize the logs, keeping one line of a key out of every `sampling[key]`, up to `rate_limits[key]` per minute."""
+        self.logger = logger
+        self.sampling = sampling or {}
+        self.sink = sink
+        now = time.monotonic()
+        self.buckets = {
+            key: TokenBucket(per_minute, per_minute, now)
+            for key, per_minute in (rate_limits or {}).items()
+        }
+        self.seen: Dict[str, int] = {}
+        self.suppressed: Dict[str, int] = {}
+
+    def allow(self, key: str, now: float) -> bool:
+        """Check whether a line of a key is sampled and within its rate limit, and count it as suppressed if not."""
+        seen = self.seen.get(key, 0)
+        self.seen[key] = seen + 1
+        bucket = self.buckets.get(key, None)
+        if seen % self.sampling.get(key, 1) == 0 and (
+            bucket is None or bucket.take(now)
+        ):
+            return True
+        self.suppressed[key] = self.suppressed.get(key, 0) + 1
+        return False
+
+    def log(self, level: int, key: str, message: str, **fields: Any) -> None:
+        """Log a line of a key, formatting its message with the fields only if it is emitted."""
+        if not self.logger.isEnabledFor(level) or not self.allow(key, time.monotonic()):
+            return
+        text = message.format(**fields) if fields else message
+        suppressed = self.suppressed.pop(key, 0)
+        if suppressed:
+            text += f" ({suppressed} lines of {key} suppressed)"
+        if self.sink is not None:
+            record = {
+                "time": time.time(),
+                "level": logging.getLevelName(level),
+                "key": key,
+                "message": text,
+                **fields,
+            }
+            try:
+                line = json.dumps(record, default=str)
+            except (TypeError, ValueError):
+                # e.g., mappings with tuple keys
+                line = json.dumps(
+                    {**record, **{name: str(value) for name, value in fields.items()}}
+                )
+            self.sink.put(line)
+            if level < logging.WARNING:
+                return
+        self.logger.log(level, text)
+
+    def debug(self, key: str, message: str, **fields: Any) -> None:
+        """Log a line of a key at DEBUG."""
+        self.log(logging.DEBUG, key, message, **fields)
+
+    def info(self, key: str, message: str, **fields: Any) -> None:
+        """Log a line of a key at INFO."""
+        self.log(logging.INFO, key, message, **fields)
+
+    def warning(self, key: str, message: str, **fields: Any) -> None:
+        """Log a line of a key at WARNING."""
+        self.log(logging.WARNING, key, message, **fields)
+
+    def close(self) -> None:
+        """Close the sink, if any."""
+        if self.sink is not None:
+            self.sink.close()
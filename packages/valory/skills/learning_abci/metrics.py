@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the in-memory metrics registry of the LearningAbciApp."""
+
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+
+METRICS_PREFIX = "learning"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_WINDOW = 256
+QUANTILES = (0.5, 0.95, 0.99)
+NO_MAJORITY = "no_majority"
+ROUND_TIMEOUT = "round_timeout"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues) -> str:
+    """Format a label set, e.g. `{round="a",event="b"}`."""
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Summary:
+    """A summary over a rolling window of observations."""
+
+    __slots__ = ("count", "total", "_window")
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        """Initialize the summary."""
+        self.count = 0
+        self.total = 0.0
+        self._window: Deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        """Add an observation."""
+        self.count += 1
+        self.total += value
+        self._window.append(value)
+
+    def __len__(self) -> int:
+        """Get the number of observations in the rolling window."""
+        return len(self._window)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Get a quantile over the rolling window, if any observation."""
+        if not self._window:
+            return None
+        ordered = sorted(self._window)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def quantiles(self) -> List[Tuple[float, float]]:
+        """Get the configured quantiles over the rolling window."""
+        if not self._window:
+            return []
+        ordered = sorted(self._window)
+        last = len(ordered) - 1
+        return [(q, ordered[min(last, int(q * len(ordered)))]) for q in QUANTILES]
+
+
+class LearningMetrics:  # pylint: disable=too-many-instance-attributes
+    """
+    Pre-aggregated metrics of the learning skill.
+
+    Behaviours, rounds and models push observations while they run, so that
+    serving a scrape only walks a handful of small aggregates. The rendered
+    exposition text is cached until the next observation arrives.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        """Initialize the registry."""
+        self._window = window
+        self.period_count = 0
+        self.behaviour_durations: Dict[LabelValues, Summary] = {}
+        self.round_events: Dict[LabelValues, int] = {}
+        self.call_durations: Dict[LabelValues, Summary] = {}
+        self.ipfs_bytes: Dict[LabelValues, int] = {("in",): 0, ("out",): 0}
+        self.cache_requests: Dict[LabelValues, int] = {}
+        self.step_durations: Dict[LabelValues, Summary] = {}
+        self.blocking_steps: Dict[LabelValues, int] = {}
+        self.purchase_latencies: Dict[LabelValues, Summary] = {}
+        self._pending_no_majority: Set[str] = set()
+        self._rendered: Optional[str] = None
+
+    def _summary(self, series: Dict[LabelValues, Summary], key: LabelValues) -> Summary:
+        """Get or create the summary of a series."""
+        summary = series.get(key, None)
+        if summary is None:
+            summary = series[key] = Summary(self._window)
+        return summary
+
+    def _increment(
+        self, series: Dict[LabelValues, int], key: LabelValues, value: int = 1
+    ) -> None:
+        """Increment a counter series."""
+        series[key] = series.get(key, 0) + value
+        self._rendered = None
+
+    def set_period(self, period_count: int) -> None:
+        """Set the number of the last completed period."""
+        self.period_count = period_count
+        self._rendered = None
+
+    def observe_behaviour(
+        self, behaviour_id: str, block_type: str, seconds: float
+    ) -> None:
+        """Observe the duration of a benchmarked behaviour block."""
+        self._summary(self.behaviour_durations, (behaviour_id, block_type)).observe(
+            seconds
+        )
+        self._rendered = None
+
+    def observe_call(self, kind: str, seconds: float) -> None:
+        """Observe the latency of an external call (http, contract_api, ledger_api, ipfs)."""
+        self._summary(self.call_durations, (kind,)).observe(seconds)
+        self._rendered = None
+
+    def observe_step(self, behaviour_id: str, seconds: float) -> None:
+        """Observe the duration of a step of a behaviour, between two yields."""
+        self._summary(self.step_durations, (behaviour_id,)).observe(seconds)
+        self._rendered = None
+
+    def record_blocking_step(self, behaviour_id: str, location: str) -> None:
+        """Count a step of a behaviour over the budget, by the location it resumed from."""
+        self._increment(self.blocking_steps, (behaviour_id, location))
+
+    def observe_purchase(self, stages: Dict[str, float]) -> None:
+        """Observe the duration of the stages of a purchase, from the listing of its property to its inclusion."""
+        for stage, seconds in stages.items():
+            self._summary(self.purchase_latencies, (stage,)).observe(seconds)
+        self._rendered = None
+
+    def add_ipfs_bytes(self, direction: str, size: int) -> None:
+        """Count bytes sent to ("out") or received from ("in") IPFS."""
+        self._increment(self.ipfs_bytes, (direction,), size)
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        """Count a lookup on one of the skill's caches."""
+        self._increment(self.cache_requests, (cache, "hit" if hit else "miss"))
+
+    def record_no_majority(self, round_id: str) -> None:
+        """Count a round that ended without a majority."""
+        self._pending_no_majority.add(round_id)
+        self._increment(self.round_events, (round_id, NO_MAJORITY))
+
+    def record_round_retry(self, round_id: str) -> None:
+        """
+        Account for a round being entered again right after itself.
+
+        The learning rounds only loop onto themselves on `NO_MAJORITY` or on
+        `ROUND_TIMEOUT`. The former is reported by the round itself, so a retry
+        that has not been explained by it is a timeout.
+        """
+        if round_id in self._pending_no_majority:
+            self._pending_no_majority.discard(round_id)
+            return
+        self._increment(self.round_events, (round_id, ROUND_TIMEOUT))
+
+    def render(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        if self._rendered is None:
+            self._rendered = "\n".join(self._lines()) + "\n"
+        return self._rendered
+
+    def _lines(self) -> List[str]:
+        """Get the exposition lines of all the metrics."""
+        lines: List[str] = []
+
+        name = f"{METRICS_PREFIX}_period_count"
+        lines.append(f"# HELP {name} The number of the last completed period.")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {self.period_count}")
+
+        lines.extend(
+            self._summary_lines(
+                f"{METRICS_PREFIX}_behaviour_duration_seconds",
+                "Duration of the benchmarked behaviour blocks.",
+                ("behaviour", "block"),
+                self.behaviour_durations,
+            )
+        )
+        lines.extend(
+            self._counter_lines(
+                f"{METRICS_PREFIX}_round_events_total",
+                "Rounds that looped onto themselves, by event.",
+                ("round", "event"),
+                self.round_events,
+            )
+        )
+        lines.extend(
+            self._summary_lines(
+                f"{METRICS_PREFIX}_external_call_duration_seconds",
+                "Latency of the external calls.",
+                ("kind",),
+                self.call_durations,
+            )
+        )
+        lines.extend(
+            self._counter_lines(
+                f"{METRICS_PREFIX}_ipfs_bytes_total",
+                "Bytes exchanged with IPFS.",
+                ("direction",),
+                self.ipfs_bytes,
+            )
+        )
+        lines.extend(
+            self._counter_lines(
+                f"{METRICS_PREFIX}_cache_requests_total",
+                "Lookups on the skill's caches.",
+                ("cache", "result"),
+                self.cache_requests,
+            )
+        )
+
+        lines.extend(
+            self._summary_lines(
+                f"{METRICS_PREFIX}_behaviour_step_duration_seconds",
+                "Duration of the steps of the behaviours, between two yields.",
+                ("behaviour",),
+                self.step_durations,
+            )
+        )
+        lines.extend(
+            self._counter_lines(
+                f"{METRICS_PREFIX}_blocking_steps_total",
+                "Steps of the behaviours over the budget, by the location they resumed from.",
+                ("behaviour", "location"),
+                self.blocking_steps,
+            )
+        )
+        lines.extend(
+            self._summary_lines(
+                f"{METRICS_PREFIX}_purchase_latency_seconds",
+                "Latency of the stages of the purchases, from the listing of the property to the inclusion of the transaction.",
+                ("stage",),
+                self.purchase_latencies,
+            )
+        )
+
+        name = f"{METRICS_PREFIX}_cache_hit_ratio"
+        lines.append(f"# HELP {name} Share of the cache lookups that were hits.")
+        lines.append(f"# TYPE {name} gauge")
+        totals: Dict[str, List[int]] = {}
+        for (cache, result), value in self.cache_requests.items():
+            hits_and_total = totals.setdefault(cache, [0, 0])
+            hits_and_total[1] += value
+            if result == "hit":
+                hits_and_total[0] += value
+        for cache, (hits, total) in sorted(totals.items()):
+            labels = _format_labels(("cache",), (cache,))
+            lines.append(f"{name}{labels} {hits / total if total else 0.0}")
+
+        return lines
+
+    @staticmethod
+    def _counter_lines(
+        name: str,
+        help_text: str,
+        label_names: Tuple[str, ...],
+        series: Dict[LabelValues, int],
+    ) -> List[str]:
+        """Get the exposition lines of a counter."""
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for values, count in sorted(series.items()):
+            lines.append(f"{name}{_format_labels(label_names, values)} {count}")
+        return lines
+
+    @staticmethod
+    def _summary_lines(
+        name: str,
+        help_text: str,
+        label_names: Tuple[str, ...],
+        series: Dict[LabelValues, Summary],
+    ) -> List[str]:
+        """Get the exposition lines of a summary."""
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} summary"]
+        quantile_names = label_names + ("quantile",)
+        for values, summary in sorted(series.items()):
+            for quantile, value in summary.quantiles():
+                labels = _format_labels(quantile_names, values + (str(quantile),))
+                lines.append(f"{name}{labels} {value}")
+            labels = _format_labels(label_names, values)
+            lines.append(f"{name}_sum{labels} {summary.total}")
+            lines.append(f"{name}_count{labels} {summary.count}")
+        return lines
@@ -19,9 +19,16 @@
 
 """This module contains the shared state for the abci skill of LearningAbciApp."""
 
-from typing import Any
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Optional
 
-from packages.valory.skills.abstract_round_abci.models import BaseParams
+from aea.exceptions import enforce
+
+from packages.valory.skills.abstract_round_abci.models import (
+    BaseParams,
+    BenchmarkBehaviour,
+)
 from packages.valory.skills.abstract_round_abci.models import (
     BenchmarkTool as BaseBenchmarkTool,
 )
@@ -29,7 +36,26 @@ from packages.valory.skills.abstract_round_abci.models import Requests as BaseRe
 from packages.valory.skills.abstract_round_abci.models import (
     SharedState as BaseSharedState,
 )
+from packages.valory.skills.learning_abci.budget import BalanceCache, Budget
+from packages.valory.skills.learning_abci.candidates import CandidateQueue
+from packages.valory.skills.learning_abci.fees import FeeHistory
+from packages.valory.skills.learning_abci.latency import LatencyTracker
+from packages.valory.skills.learning_abci.listing_sources import ListingSource
+from packages.valory.skills.learning_abci.logs import LogSink, SkillLog
+from packages.valory.skills.learning_abci.metrics import DEFAULT_WINDOW, LearningMetrics
+from packages.valory.skills.learning_abci.price_feed import PriceFeed
+from packages.valory.skills.learning_abci.price_sources import PriceSources
+from packages.valory.skills.learning_abci.profiling import BehaviourProfiler
+from packages.valory.skills.learning_abci.rate_limit import RateLimiter
 from packages.valory.skills.learning_abci.rounds import LearningAbciApp
+from packages.valory.skills.learning_abci.settlement import SettlementBackoff
+from packages.valory.skills.learning_abci.store import IN_MEMORY, PropertyStore
+from packages.valory.skills.learning_abci.trace import ResponseTrace, TRACE_FILENAME
+from packages.valory.skills.learning_abci.watchdog import StepWatchdog
+
+
+# the share of the round timeout the backoff of a failed settlement may take
+SETTLEMENT_BACKOFF_SHARE = 0.5
 
 
 class SharedState(BaseSharedState):
@@ -37,9 +63,170 @@ class SharedState(BaseSharedState):
 
     abci_app_cls = LearningAbciApp
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the state."""
+        super().__init__(*args, **kwargs)
+        self.metrics = LearningMetrics()
+        self.trace: Optional[ResponseTrace] = None
+        self.profiler: Optional[BehaviourProfiler] = None
+        self.watchdog: Optional[StepWatchdog] = None
+        self.store: Optional[PropertyStore] = None
+        self.price_feed = PriceFeed()
+        self.price_sources: Optional[PriceSources] = None
+        self.rate_limiter: Optional[RateLimiter] = None
+        self.listing_sources: List[ListingSource] = []
+        self.candidates: Optional[CandidateQueue] = None
+        self.settlement_backoff: Optional[SettlementBackoff] = None
+        self.balances = BalanceCache()
+        self.budget: Optional[Budget] = None
+        self.fee_history: Optional[FeeHistory] = None
+        self.latency = LatencyTracker(DEFAULT_WINDOW)
+        self.log: Optional[SkillLog] = None
+
+    def setup(self) -> None:
+        """Set up the state, its logs, store, price and listing sources, candidates, budget, fee history, settlement failures and rate limits, and the watchdog, profiler and trace if enabled."""
+        super().setup()
+        params = self.context.params
+        self.listing_sources = [
+            ListingSource.parse(source) for source in params.listing_sources
+        ] or [
+            ListingSource(
+                params.default_chain_id,
+                params.real_estate_contract_address,
+                params.real_estate_token,
+            )
+        ]
+        self.candidates = CandidateQueue(
+            params.candidate_retry_periods, params.candidate_queue_size
+        )
+        self.log = SkillLog(
+            self.context.logger,
+            params.log_sampling,
+            params.log_rate_limits,
+            LogSink(Path(params.log_file)) if params.log_file else None,
+        )
+        self.budget = Budget(params.spend_budget)
+        self.fee_history = FeeHistory(params.fee_history_size, params.fee_percentile)
+        self.settlement_backoff = SettlementBackoff(
+            params.settlement_max_failures,
+            params.settlement_backoff,
+            params.round_timeout_seconds * SETTLEMENT_BACKOFF_SHARE,
+        )
+        self.price_feed = PriceFeed(params.price_pairs)
+        self.price_sources = PriceSources(
+            [params.coingecko_price_template, *params.price_sources],
+            params.price_hedge_percentile,
+            params.price_hedge_delay,
+        )
+        self.rate_limiter = RateLimiter(
+            params.http_rate_limits,
+            params.http_rate_burst,
+            params.http_backoff,
+            perf_counter(),
+        )
+        self.store = PropertyStore(params.store_path or IN_MEMORY, params.store_history)
+        self.store.load()
+        if self.store.snapshot is not None:
+            self.context.logger.info(
+                f"Loaded the listings of period {self.store.snapshot.period}, "
+                f"{len(self.store.prices)} prices and the last decision "
+                f"{self.store.last_decision} from {params.store_path}"
+            )
+        if params.step_budget > 0:
+            self.watchdog = StepWatchdog(
+                params.step_budget, self.metrics, self.context.logger
+            )
+        if params.profile_behaviours:
+            self.profiler = BehaviourProfiler(
+                params.profile_behaviours,
+                params.profile_mode,
+                self.context.benchmark_tool.log_dir
+                / self.context.agent_address
+                / "profiles",
+                params.profile_sample_interval,
+            )
+            self.context.logger.info(
+                f"Profiling the behaviours {sorted(self.profiler.behaviours)} "
+                f"({params.profile_mode})"
+            )
+        if params.trace_mode is None:
+            return
+        trace_file = (
+            Path(params.trace_file)
+            if params.trace_file
+            else self.context.benchmark_tool.log_dir
+            / self.context.agent_address
+            / TRACE_FILENAME
+        )
+        self.trace = ResponseTrace(
+            params.trace_mode, trace_file, params.trace_latency_scale
+        )
+        self.context.logger.info(
+            f"Trace of the external responses: {params.trace_mode} {trace_file}"
+        )
+
+    def teardown(self) -> None:
+        """Tear down the state."""
+        if self.trace is not None:
+            self.trace.close()
+        if self.profiler is not None:
+            self.profiler.close()
+        if self.store is not None:
+            self.store.close()
+        if self.log is not None:
+            self.log.close()
+        super().teardown()
+
 
 Requests = BaseRequests
-BenchmarkTool = BaseBenchmarkTool
+
+# the behaviours of the transaction settlement which end with the transaction
+# sent, and with it found mined
+FINALIZE_BEHAVIOUR_ID = "finalize_behaviour"
+VALIDATE_BEHAVIOUR_ID = "validate_transaction_behaviour"
+
+
+def _end_of(behaviour: Optional[BenchmarkBehaviour]) -> Optional[float]:
+    """Get the time at which the last measured block of a behaviour ended."""
+    if behaviour is None or not behaviour.local_data:
+        return None
+    return max(
+        block.start + block.total_time for block in behaviour.local_data.values()
+    )
+
+
+class BenchmarkTool(BaseBenchmarkTool):
+    """Benchmark tool which also feeds the skill's metrics."""
+
+    def save(self, period: int = 0, reset: bool = True) -> None:
+        """Aggregate the period's measurements into the metrics and save them, with the profiles and the latency of the purchase."""
+        metrics = self.context.state.metrics
+        self._complete_purchase()
+        profiler = self.context.state.profiler
+        if profiler is not None:
+            profiler.dump(period)
+        metrics.set_period(period)
+        for behaviour, tool in self.benchmark_data.items():
+            for block_type, block in tool.local_data.items():
+                metrics.observe_behaviour(behaviour, block_type, block.total_time)
+        super().save(period, reset)
+
+    def _complete_purchase(self) -> None:
+        """Complete the purchase in progress, if the period settled its transaction, and observe its latency."""
+        included_at = _end_of(self.benchmark_data.get(VALIDATE_BEHAVIOUR_ID, None))
+        if included_at is None:
+            return
+        settled_at = _end_of(self.benchmark_data.get(FINALIZE_BEHAVIOUR_ID, None))
+        purchase = self.context.state.latency.complete(settled_at, included_at)
+        if purchase is None:
+            return
+        stages = purchase.stages()
+        self.context.state.metrics.observe_purchase(stages)
+        self.context.logger.info(
+            f"Latency of the purchase of {purchase.key}, listed at block "
+            f"{purchase.listed_block}: "
+            + ", ".join(f"{stage}={seconds:.3f}s" for stage, seconds in stages.items())
+        )
 
 
 class Params(BaseParams):
@@ -57,10 +244,106 @@ class Params(BaseParams):
         self.real_estate_contract_address = self._ensure(
             "real_estate_contract_address", kwargs, str
         )
-        self.buy_price_range = self._ensure(
-            "buy_price_range", kwargs, list
+        self.buy_price_range = self._ensure("buy_price_range", kwargs, list)
+        self.real_estate_token = self._ensure("real_estate_token", kwargs, str)
+        self.trace_mode: Optional[str] = self._ensure(
+            "trace_mode", kwargs, Optional[str]
+        )
+        self.trace_file: Optional[str] = self._ensure(
+            "trace_file", kwargs, Optional[str]
+        )
+        self.trace_latency_scale: float = self._ensure(
+            "trace_latency_scale", kwargs, float
+        )
+        self.store_path: Optional[str] = self._ensure(
+            "store_path", kwargs, Optional[str]
+        )
+        self.store_history: int = self._ensure("store_history", kwargs, int)
+        self.step_budget: float = self._ensure("step_budget", kwargs, float)
+        self.profile_behaviours: List[str] = self._ensure(
+            "profile_behaviours", kwargs, List[str]
+        )
+        self.profile_mode: str = self._ensure("profile_mode", kwargs, str)
+        self.profile_sample_interval: float = self._ensure(
+            "profile_sample_interval", kwargs, float
+        )
+        self.shard_decisions: bool = self._ensure("shard_decisions", kwargs, bool)
+        self.keeper_fetch: bool = self._ensure("keeper_fetch", kwargs, bool)
+        self.keeper_audit_probability: float = self._ensure(
+            "keeper_audit_probability", kwargs, float
+        )
+        # how long the other agents wait for the payload of the keeper, in seconds
+        self.keeper_wait_timeout: float = self._ensure(
+            "keeper_wait_timeout", kwargs, float
+        )
+        self.price_tolerance: float = self._ensure("price_tolerance", kwargs, float)
+        # the first pair is the price the agents agree on
+        self.price_pairs: List[str] = self._ensure("price_pairs", kwargs, List[str])
+        # the alternates of `coingecko_price_template`, in the same format
+        self.price_sources: List[str] = self._ensure(
+            "price_sources", kwargs, List[str]
+        )
+        self.price_hedge_percentile: float = self._ensure(
+            "price_hedge_percentile", kwargs, float
         )
-        self.real_estate_token = self._ensure(
-            "real_estate_token", kwargs, str
+        self.price_hedge_delay: float = self._ensure(
+            "price_hedge_delay", kwargs, float
         )
+        # the requests per minute allowed to each host, e.g., {"api.coingecko.com": 30}
+        self.http_rate_limits: Dict[str, int] = self._ensure(
+            "http_rate_limits", kwargs, Dict[str, int]
+        )
+        self.http_rate_burst: int = self._ensure("http_rate_burst", kwargs, int)
+        self.http_backoff: float = self._ensure("http_backoff", kwargs, float)
+        # the `chain:address[:token]` real estate contracts to list the properties of,
+        # by default `real_estate_contract_address` on the default chain
+        self.listing_sources: List[str] = self._ensure(
+            "listing_sources", kwargs, List[str]
+        )
+        # the periods a candidate whose purchase failed is skipped for
+        self.candidate_retry_periods: int = self._ensure(
+            "candidate_retry_periods", kwargs, int
+        )
+        # the candidates kept from each listings, and whether they are ranked the
+        # cheapest first instead of in their listing order
+        self.candidate_queue_size: int = self._ensure(
+            "candidate_queue_size", kwargs, int
+        )
+        self.rank_cheapest_first: bool = self._ensure(
+            "rank_cheapest_first", kwargs, bool
+        )
+        # the failures of the settlement of a purchase before it is given up, and
+        # the backoff before the first retry, in seconds, doubled with each failure
+        self.settlement_max_failures: int = self._ensure(
+            "settlement_max_failures", kwargs, int
+        )
+        self.settlement_backoff: float = self._ensure(
+            "settlement_backoff", kwargs, float
+        )
+        # whether to simulate the purchases with an `eth_call` before settling them
+        self.preflight_simulation: bool = self._ensure(
+            "preflight_simulation", kwargs, bool
+        )
+        # the value the service may buy across the periods, in the smallest unit of
+        # the tokens, 0 for no cap besides the balance of the Safe
+        self.spend_budget: int = self._ensure("spend_budget", kwargs, int)
+        # the periods of fees sampled on each chain to suggest the fees of the
+        # purchases, 0 to leave them to the settlement, and the percentile used
+        self.fee_history_size: int = self._ensure("fee_history_size", kwargs, int)
+        self.fee_percentile: float = self._ensure("fee_percentile", kwargs, float)
+        # the one log of a key kept out of every n, the logs of a key allowed per
+        # minute, and the file of JSON lines the logs are written to, if any,
+        # instead of the log of the agent
+        self.log_sampling: Dict[str, int] = self._ensure(
+            "log_sampling", kwargs, Dict[str, int]
+        )
+        self.log_rate_limits: Dict[str, int] = self._ensure(
+            "log_rate_limits", kwargs, Dict[str, int]
+        )
+        self.log_file: Optional[str] = self._ensure("log_file", kwargs, Optional[str])
         super().__init__(*args, **kwargs)
+        # the agents which do not hear from the keeper fetch themselves in the same round
+        enforce(
+            self.keeper_wait_timeout < self.round_timeout_seconds,
+            "`keeper_wait_timeout` must be lower than `round_timeout_seconds`.",
+        )
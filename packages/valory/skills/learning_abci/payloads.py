@@ -31,6 +31,9 @@ class APICheckPayload(BaseTxPayload):
 
     price: Optional[float]
     ipfs_hash: str
+    # the digest of the listings and the blocks they were read at per chain, as JSON, in the keeper fetch mode
+    digest: Optional[str] = None
+    blocks: Optional[str] = None
 
 
 @dataclass(frozen=True)
@@ -46,3 +49,10 @@ class TxPreparationPayload(BaseTxPayload):
 
     tx_submitter: Optional[str] = None
     tx_hash: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class SettlementFailurePayload(BaseTxPayload):
+    """Represent a transaction payload for the SettlementFailureRound."""
+
+    event: str
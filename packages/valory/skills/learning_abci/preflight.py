@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+This module contains the encoding of the pre-flight simulations of the Safe transactions.
+
+A Safe transaction is simulated with an `eth_call` of the `simulateAndRevert`
+method of the Safe, which delegate calls the target, e.g., the MultiSend
+contract, in the context of the Safe, without checking any signature. The
+call always reverts with its outcome: a word for the success of the delegate
+call, a word for the size of its return data, then the return data. The
+ledger connection reports the revert as an error, with the revert data as its
+message.
+
+Example:
+
+    >>> calldata = encode_simulation("0x" + "ab" * 20, bytes.fromhex("8d80ff0a"))
+    >>> calldata[:10], len(calldata)
+    ('0xb4faba09', 266)
+    >>> simulation_succeeded("0x" + "0" * 63 + "1" + "0" * 64)
+    True
+    >>> simulation_succeeded("execution reverted") is None
+    True
+"""
+
+import re
+from typing import Optional
+
+
+# the selector of `simulateAndRevert(address,bytes)`
+SIMULATE_AND_REVERT_SELECTOR = "b4faba09"
+WORD_SIZE = 32
+
+# the success word and the size word of the outcome, at least
+_REVERT_DATA = re.compile(r"0x([0-9a-fA-F]{128,})")
+
+
+def _word(value: int) -> str:
+    """Encode an unsigned integer as an ABI word."""
+    return f"{value:064x}"
+
+
+def encode_simulation(target: str, data: bytes) -> str:
+    """Get the calldata of `simulateAndRevert(target, data)`, which simulates a delegate call of the Safe to `target`."""
+    padding = -len(data) % WORD_SIZE
+    return (
+        "0x"
+        + SIMULATE_AND_REVERT_SELECTOR
+        + _word(int(target, 16))
+        # the offset of the data, after the two head words
+        + _word(2 * WORD_SIZE)
+        + _word(len(data))
+        + (data + bytes(padding)).hex()
+    )
+
+
+def simulation_succeeded(revert: str) -> Optional[bool]:
+    """Get whether the simulated call succeeded from the revert data of the simulation, or `None` if there is none."""
+    match = _REVERT_DATA.search(revert)
+    if match is None:
+        return None
+    return int(match.group(1)[: 2 * WORD_SIZE], 16) == 1
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+This module contains the price feed of the token and currency pairs.
+
+The pairs needed by the skill are collected in a `PriceFeed`, and refreshed
+together with a single request to the Coingecko simple price endpoint, which
+prices every id in every currency. The quotes are kept in the table of the
+feed with their timestamp, so that adding a pair costs no extra request.
+
+Example:
+
+    >>> feed = PriceFeed(["autonolas/usd", "ethereum/eur"])
+    >>> feed.url("https://api.coingecko.com/api/v3/simple/price?ids=autonolas&vs_currencies=usd")
+    'https://api.coingecko.com/api/v3/simple/price?ids=autonolas,ethereum&vs_currencies=eur,usd'
+    >>> feed.update({"autonolas": {"usd": 1.5, "eur": 1.4}}, timestamp=10.0)
+    2
+    >>> feed.quote("autonolas", "usd")
+    Quote(price=1.5, timestamp=10.0)
+"""
+
+import time
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+
+PAIR_SEPARATOR = "/"
+IDS_PARAMETER = "ids"
+CURRENCIES_PARAMETER = "vs_currencies"
+# the key of the update time of a token, when the request includes `include_last_updated_at`
+LAST_UPDATED_AT = "last_updated_at"
+
+Pair = Tuple[str, str]
+
+
+class Quote(NamedTuple):
+    """The price of a token in a currency, and when it was quoted."""
+
+    price: float
+    timestamp: float
+
+
+def parse_pair(pair: str) -> Pair:
+    """Parse a `token/currency` pair, e.g., `autonolas/usd`."""
+    token, separator, currency = pair.partition(PAIR_SEPARATOR)
+    if not separator or not token or not currency:
+        raise ValueError(f"Invalid price pair {pair!r}, expected 'token/currency'.")
+    return token.lower(), currency.lower()
+
+
+class PriceFeed:
+    """The token and currency pairs needed by the skill, and their last quotes."""
+
+    def __init__(self, pairs: Iterable[str] = ()) -> None:
+        """Initialize the feed with some `token/currency` pairs."""
+        self.pairs: Dict[Pair, None] = {}
+        self.table: Dict[Pair, Quote] = {}
+        for pair in pairs:
+            self.require(*parse_pair(pair))
+
+    def require(self, token: str, currency: str) -> None:
+        """Add a pair to the ones refreshed by the next request."""
+        self.pairs.setdefault((token.lower(), currency.lower()), None)
+
+    @property
+    def tokens(self) -> List[str]:
+        """Get the ids of the tokens to price."""
+        return sorted({token for token, _ in self.pairs})
+
+    @property
+    def currencies(self) -> List[str]:
+        """Get the currencies to price the tokens in."""
+        return sorted({currency for _, currency in self.pairs})
+
+    def url(self, template: str) -> str:
+        """Get the URL requesting all the pairs, from the URL of the endpoint with any ids and currencies."""
+        base, _, query = template.partition("?")
+        parameters = [
+            parameter
+            for parameter in query.split("&")
+            if parameter
+            and parameter.partition("=")[0] not in (IDS_PARAMETER, CURRENCIES_PARAMETER)
+        ]
+        requested = [
+            f"{IDS_PARAMETER}={','.join(self.tokens)}",
+            f"{CURRENCIES_PARAMETER}={','.join(self.currencies)}",
+        ]
+        return f"{base}?{'&'.join(requested + parameters)}"
+
+    def update(self, body: Mapping[str, Any], timestamp: Optional[float] = None) -> int:
+        """Update the table with the body of a response, and get the number of quotes in it."""
+        if timestamp is None:
+            timestamp = time.time()
+        updated = 0
+        for token, prices in body.items():
+            if not isinstance(prices, Mapping):
+                continue
+            quoted_at = float(prices.get(LAST_UPDATED_AT, timestamp))
+            for currency, price in prices.items():
+                if currency == LAST_UPDATED_AT or not isinstance(price, (int, float)):
+                    continue
+                self.table[(token, currency)] = Quote(float(price), quoted_at)
+                updated += 1
+        return updated
+
+    def quote(self, token: str, currency: str) -> Optional[Quote]:
+        """Get the last quote of a pair, if any."""
+        return self.table.get((token.lower(), currency.lower()), None)
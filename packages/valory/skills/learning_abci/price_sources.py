@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+This module contains the hedged requests to the price sources.
+
+The sources are URL templates answering in the format of the Coingecko simple
+price endpoint, e.g., Coingecko itself, a mirror of it or a local stand-in.
+`hedged` sends a request to the first source, and to the next one whenever
+the pending requests are slower than the hedging delay, or as soon as one
+answers with an invalid response. The first valid answer wins, and the other
+requests are dropped.
+"""
+
+from time import perf_counter
+from typing import Any, Callable, Generator, List, Optional, Sequence
+
+from packages.valory.skills.learning_abci.metrics import Summary
+
+
+# the latencies observed before hedging at their percentile instead of the initial delay
+MIN_SAMPLES = 10
+
+RequestFactory = Callable[[], Generator[None, None, Optional[Any]]]
+
+
+class PriceSources:
+    """The price sources, and the latencies which the hedging delay follows."""
+
+    def __init__(
+        self, urls: Sequence[str], percentile: float, initial_delay: float
+    ) -> None:
+        """Initialize the sources."""
+        self.urls = list(urls)
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.latencies = Summary()
+
+    def hedge_delay(self) -> float:
+        """Get the delay after which a request is hedged, i.e., the latency percentile of the last answers."""
+        quantile = self.latencies.quantile(self.percentile / 100)
+        if quantile is None or len(self.latencies) < MIN_SAMPLES:
+            return self.initial_delay
+        return quantile
+
+    def observe(self, seconds: float) -> None:
+        """Observe the latency of a valid answer."""
+        self.latencies.observe(seconds)
+
+
+def hedged(
+    requests: Sequence[RequestFactory], delay: float
+) -> Generator[None, None, Optional[Any]]:
+    """
+    Run requests to the sources, hedged after `delay` seconds, and get the first non-`None` answer.
+
+    The requests must only yield `None`, i.e., poll for their responses
+    instead of waiting for a message, so that several can be in flight.
+    """
+    pending: List[Generator[None, None, Optional[Any]]] = []
+    started = 0
+    deadline = 0.0
+    try:
+        while True:
+            if started < len(requests) and (not pending or perf_counter() >= deadline):
+                pending.append(requests[started]())
+                started += 1
+                deadline = perf_counter() + delay
+            if not pending:
+                return None
+            for request in list(pending):
+                try:
+                    next(request)
+                except StopIteration as stop:
+                    pending.remove(request)
+                    if stop.value is not None:
+                        return stop.value
+                    # fail over to the next source right away
+                    deadline = perf_counter()
+            if pending:
+                yield
+    finally:
+        for request in pending:
+            request.close()
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the profiler of the steps of the behaviours."""
+
+import cProfile
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Dict, Generator, Iterable, Optional, Tuple
+
+
+PSTATS = "pstats"
+COLLAPSED = "collapsed"
+PROFILE_MODES = (PSTATS, COLLAPSED)
+
+
+def _frame_label(frame: FrameType) -> str:
+    """Get the label of a frame in a collapsed stack."""
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", code.co_filename)
+    return f"{code.co_name} ({module}:{frame.f_lineno})"
+
+
+class StackSampler(threading.Thread):
+    """
+    Sample the stack of a thread while it runs a profiled step.
+
+    The stacks are cut at the frame of the profiled generator, so that they
+    only show what the step did, and are counted per behaviour, ready to be
+    written in the collapsed format of the flame graph tools.
+    """
+
+    def __init__(self, interval: float) -> None:
+        """Initialize the sampler."""
+        super().__init__(name="behaviour-profiler", daemon=True)
+        self.interval = interval
+        self.samples: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._stopped = False
+        self._step: Optional[Tuple[int, str]] = None
+
+    def start_step(self, behaviour_id: str) -> None:
+        """Start sampling the current thread for a step of a behaviour."""
+        self._step = (threading.get_ident(), behaviour_id)
+        self._active.set()
+
+    def stop_step(self) -> None:
+        """Stop sampling until the next step."""
+        self._active.clear()
+        self._step = None
+
+    def run(self) -> None:
+        """Take the samples."""
+        while not self._stopped:
+            self._active.wait()
+            time.sleep(self.interval)
+            step = self._step
+            if step is None:
+                continue
+            thread_id, behaviour_id = step
+            frame = sys._current_frames().get(  # pylint: disable=protected-access
+                thread_id, None
+            )
+            stack = []
+            while frame is not None and frame.f_code is not _STEPS_CODE:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if frame is None or not stack:
+                # the step ended in the meantime
+                continue
+            with self._lock:
+                self.samples.setdefault(behaviour_id, Counter())[
+                    ";".join(reversed(stack))
+                ] += 1
+
+    def pop_samples(self) -> Dict[str, Counter]:
+        """Get the samples taken so far, and start over."""
+        with self._lock:
+            samples, self.samples = self.samples, {}
+        return samples
+
+    def stop(self) -> None:
+        """Stop the sampler."""
+        self._stopped = True
+        self._active.set()
+
+
+class BehaviourProfiler:
+    """
+    Profile each step of the `async_act` of the chosen behaviours.
+
+    In `pstats` mode, the steps run under `cProfile`, and in `collapsed` mode
+    a background thread samples their stacks every `interval` seconds. At the
+    end of each period, `dump` writes a file per profiled behaviour under
+    `<directory>/period_<period>/`, either a pstats file to open with
+    `python -m pstats` or snakeviz, or collapsed stacks to feed to
+    `flamegraph.pl` or speedscope.
+    """
+
+    def __init__(
+        self,
+        behaviours: Iterable[str],
+        mode: str,
+        directory: Path,
+        interval: float = 0.005,
+    ) -> None:
+        """Initialize the profiler."""
+        if mode not in PROFILE_MODES:
+            raise ValueError(
+                f"Unknown profile mode {mode!r}, expected one of {PROFILE_MODES}."
+            )
+        self.behaviours = frozenset(behaviours)
+        self.mode = mode
+        self.directory = directory
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._sampler: Optional[StackSampler] = None
+        if mode == COLLAPSED:
+            self._sampler = StackSampler(interval)
+            self._sampler.start()
+
+    def profile(self, behaviour_id: str, steps: Generator) -> Generator:
+        """Run the steps of a behaviour under the profiler."""
+        if self._sampler is not None:
+            return _sampled_steps(self._sampler, behaviour_id, steps)
+        profile = self._profiles.setdefault(behaviour_id, cProfile.Profile())
+        return _profiled_steps(profile, steps)
+
+    def dump(self, period: int) -> None:
+        """Write the profiles of a period, and start over."""
+        directory = self.directory / f"period_{period}"
+        if self._sampler is not None:
+            for behaviour_id, stacks in self._sampler.pop_samples().items():
+                directory.mkdir(parents=True, exist_ok=True)
+                lines = (f"{stack} {count}\n" for stack, count in stacks.items())
+                path = directory / f"{behaviour_id}.collapsed"
+                path.write_text("".join(lines), encoding="utf-8")
+            return
+        profiles, self._profiles = self._profiles, {}
+        for behaviour_id, profile in profiles.items():
+            directory.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(str(directory / f"{behaviour_id}.pstats"))
+
+    def close(self) -> None:
+        """Stop the profiler."""
+        if self._sampler is not None:
+            self._sampler.stop()
+
+
+def _profiled_steps(profile: cProfile.Profile, steps: Generator) -> Generator:
+    """Run each step of a generator under `cProfile`."""
+    value = None
+    try:
+        while True:
+            profile.enable()
+            try:
+                yielded = steps.send(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                profile.disable()
+            value = yield yielded
+    finally:
+        steps.close()
+
+
+def _sampled_steps(
+    sampler: StackSampler, behaviour_id: str, steps: Generator
+) -> Generator:
+    """Run each step of a generator while the sampler watches it."""
+    value = None
+    try:
+        while True:
+            sampler.start_step(behaviour_id)
+            try:
+                yielded = steps.send(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                sampler.stop_step()
+            value = yield yielded
+    finally:
+        steps.close()
+
+
+# the frame at which the sampled stacks are cut
+_STEPS_CODE = _sampled_steps.__code__
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+This module contains the typed records of the properties.
+
+The contract returns each property as a `[id, name, owner, value, for_sale]`
+row, and the rows are uploaded to IPFS with the tag of the source they were
+read from appended, see `listing_sources`. They are decoded once into
+`Property` records, or into the columns of a `PropertyTable`.
+
+Example:
+
+    >>> table = PropertyTable.from_rows([[1, "a", "0x1", "130", True], [2, "b", "0x2", 90, True]])
+    >>> table[0]
+    Property(id=1, name='a', owner='0x1', value=130, for_sale=True)
+    >>> table.values[1]
+    90
+"""
+
+from array import array
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Union,
+)
+
+
+Row = Sequence[Any]
+IntColumn = Union["array[int]", List[int]]
+
+
+class Property:
+    """A property of the real estate contract."""
+
+    __slots__ = ("id", "name", "owner", "value", "for_sale", "source")
+
+    def __init__(  # pylint: disable=too-many-arguments,redefined-builtin
+        self,
+        id: int,
+        name: str,
+        owner: str,
+        value: int,
+        for_sale: bool,
+        source: Optional[str] = None,
+    ) -> None:
+        """Initialize the property."""
+        self.id = id  # pylint: disable=invalid-name
+        self.name = name
+        self.owner = owner
+        self.value = value
+        self.for_sale = for_sale
+        # the `chain:address` tag of the contract listing the property
+        self.source = source
+
+    @classmethod
+    def from_row(cls, row: Row) -> "Property":
+        """Decode a property from a row of the contract, optionally tagged with its source."""
+        id_, name, owner, value, for_sale, *tag = row
+        source = str(tag[0]) if tag else None
+        return cls(int(id_), str(name), str(owner), int(value), bool(for_sale), source)
+
+    def to_row(self) -> List[Any]:
+        """Encode the property as a row of the contract, tagged with its source if any."""
+        row = [self.id, self.name, self.owner, self.value, self.for_sale]
+        if self.source is not None:
+            row.append(self.source)
+        return row
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare two properties."""
+        if not isinstance(other, Property):
+            return NotImplemented
+        return self.to_row() == other.to_row()
+
+    def __repr__(self) -> str:
+        """Get the representation of the property."""
+        source = "" if self.source is None else f", source={self.source!r}"
+        return (
+            f"Property(id={self.id!r}, name={self.name!r}, owner={self.owner!r}, "
+            f"value={self.value!r}, for_sale={self.for_sale!r}{source})"
+        )
+
+
+def iter_properties(rows: Iterable[Row]) -> Iterator[Property]:
+    """Decode rows of the contract into properties, lazily."""
+    return map(Property.from_row, rows)
+
+
+def decode_properties(rows: Iterable[Row]) -> List[Property]:
+    """Decode a batch of rows of the contract, e.g., the body of `get_properties_for_sale`."""
+    return list(iter_properties(rows))
+
+
+def _int_column(values: Iterable[int]) -> IntColumn:
+    """Get a packed column of integers, or a list if some of them do not fit in 64 bits, e.g., token amounts in wei."""
+    values = list(values)
+    try:
+        return array("q", values)
+    except OverflowError:
+        return values
+
+
+class PropertyTable:
+    """
+    The properties stored column by column.
+
+    The ids and the values are packed in `array`s, which take 8 bytes per
+    property instead of a list slot and an int object each. The records are
+    only built on access.
+    """
+
+    __slots__ = ("ids", "names", "owners", "values", "for_sale", "sources")
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        ids: IntColumn,
+        names: List[str],
+        owners: List[str],
+        values: IntColumn,
+        for_sale: MutableSequence[int],
+        sources: Optional[List[Optional[str]]] = None,
+    ) -> None:
+        """Initialize the table."""
+        self.ids = ids
+        self.names = names
+        self.owners = owners
+        self.values = values
+        self.for_sale = for_sale
+        self.sources = [None] * len(ids) if sources is None else sources
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Row]) -> "PropertyTable":
+        """Decode rows of the contract into a table."""
+        return cls.from_properties(iter_properties(rows))
+
+    @classmethod
+    def from_properties(cls, properties: Iterable[Property]) -> "PropertyTable":
+        """Build a table from property records."""
+        properties = list(properties)
+        # a single string per source, shared by the properties it lists
+        tags: Dict[Optional[str], Optional[str]] = {}
+        return cls(
+            _int_column(property_.id for property_ in properties),
+            [property_.name for property_ in properties],
+            [property_.owner for property_ in properties],
+            _int_column(property_.value for property_ in properties),
+            bytearray(property_.for_sale for property_ in properties),
+            [
+                tags.setdefault(property_.source, property_.source)
+                for property_ in properties
+            ],
+        )
+
+    def __len__(self) -> int:
+        """Get the number of properties."""
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> Property:
+        """Get the record of a property."""
+        return Property(
+            self.ids[index],
+            self.names[index],
+            self.owners[index],
+            self.values[index],
+            bool(self.for_sale[index]),
+            self.sources[index],
+        )
+
+    def __iter__(self) -> Iterator[Property]:
+        """Iterate over the records of the properties."""
+        return (self[index] for index in range(len(self)))
+
+    def rows(self) -> List[List[Any]]:
+        """Encode the properties as rows of the contract."""
+        return [property_.to_row() for property_ in self]
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+This module contains the client-side rate limits of the outbound HTTP requests.
+
+Each host with a quota gets a token bucket, refilled at its quota per minute
+and holding up to `burst` tokens, so that restarts and retries do not burst
+over the quota. A host answering `429 Too Many Requests` is backed off, for
+its `Retry-After` or an exponentially growing delay. The identical requests
+in flight are coalesced into one.
+
+Example:
+
+    >>> bucket = TokenBucket(per_minute=60, burst=1, now=0.0)
+    >>> bucket.take(now=0.0), bucket.take(now=0.5), bucket.take(now=1.0)
+    (True, False, True)
+"""
+
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+
+HTTP_TOO_MANY_REQUESTS = 429
+RETRY_AFTER = "retry-after"
+# the longest backoff of a host, in seconds
+MAX_BACKOFF = 60.0
+
+
+def host_of(url: str) -> str:
+    """Get the host of a URL."""
+    return urlsplit(url).hostname or ""
+
+
+def retry_after(headers: str) -> Optional[float]:
+    """Get the delay of the `Retry-After` header of a response, if given in seconds."""
+    for line in headers.splitlines():
+        name, _, value = line.partition(":")
+        if name.strip().lower() == RETRY_AFTER:
+            try:
+                return max(0.0, float(value.strip()))
+            except ValueError:
+                return None
+    return None
+
+
+class TokenBucket:
+    """A token bucket, refilled at a number of tokens per minute."""
+
+    def __init__(self, per_minute: float, burst: int, now: float) -> None:
+        """Initialize a full bucket."""
+        self.rate = per_minute / 60
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self.updated_at = now
+
+    def take(self, now: float) -> bool:
+        """Take a token, if there is one left."""
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class InFlight:
+    """A request in flight, whose response the identical requests wait for."""
+
+    __slots__ = ("done", "response")
+
+    def __init__(self) -> None:
+        """Initialize the request."""
+        self.done = False
+        self.response: Optional[object] = None
+
+
+class RateLimiter:
+    """The token buckets and the backoffs of the hosts, and the requests in flight."""
+
+    def __init__(
+        self, quotas: Dict[str, int], burst: int, backoff: float, now: float
+    ) -> None:
+        """Initialize the limiter, with the quotas per minute of the hosts."""
+        self.buckets = {
+            host: TokenBucket(per_minute, burst, now)
+            for host, per_minute in quotas.items()
+        }
+        self.backoff = backoff
+        self.backoff_until: Dict[str, float] = {}
+        self.throttles: Dict[str, int] = {}
+        self.in_flight: Dict[str, InFlight] = {}
+
+    def acquire(self, url: str, now: float) -> bool:
+        """Check whether a request to a URL can be sent now, and take a token for it if so."""
+        host = host_of(url)
+        if now < self.backoff_until.get(host, 0.0):
+            return False
+        bucket = self.buckets.get(host, None)
+        return bucket is None or bucket.take(now)
+
+    def throttled(self, url: str, now: float, delay: Optional[float] = None) -> float:
+        """Back off a host which answered 429, and get the delay."""
+        host = host_of(url)
+        throttles = self.throttles.get(host, 0)
+        self.throttles[host] = throttles + 1
+        if delay is None:
+            delay = min(MAX_BACKOFF, self.backoff * 2**throttles)
+        self.backoff_until[host] = now + delay
+        return delay
+
+    def succeeded(self, url: str) -> None:
+        """Reset the backoff of a host which answered."""
+        self.throttles.pop(host_of(url), None)
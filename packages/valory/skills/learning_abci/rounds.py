@@ -37,8 +37,11 @@ from packages.valory.skills.abstract_round_abci.base import (
 from packages.valory.skills.learning_abci.payloads import (
     APICheckPayload,
     DecisionMakingPayload,
+    SettlementFailurePayload,
     TxPreparationPayload,
 )
+from packages.valory.skills.learning_abci.listing_sources import chain_of
+from packages.valory.skills.learning_abci.sharding import global_best
 import json
 
 
@@ -130,6 +133,16 @@ class SynchronizedData(BaseSynchronizedData):
         """
         return self.db.get("property_value")
 
+    @property
+    def property_source(self) -> Optional[str]:
+        """Get the `chain:address` tag of the contract listing the property, if any."""
+        return self.db.get("property_source", None)
+
+    @property
+    def settlement_failures(self) -> int:
+        """Get the failures of the settlement of the last prepared transaction so far."""
+        return int(self.db.get("settlement_failures", 0))
+
 
 class APICheckRound(CollectSameUntilThresholdRound):
     """APICheckRound"""
@@ -144,6 +157,13 @@ class APICheckRound(CollectSameUntilThresholdRound):
         get_name(SynchronizedData.ipfs_hash),
     )
 
+    def end_block(self) -> Optional[Tuple[BaseSynchronizedData, Event]]:
+        """Process the end of the block."""
+        result = super().end_block()
+        if result is not None and result[1] == Event.NO_MAJORITY:
+            self.context.state.metrics.record_no_majority(self.auto_round_id())
+        return result
+
     # Event.ROUND_TIMEOUT  # this needs to be referenced for static checkers
 
 
@@ -152,9 +172,13 @@ class DecisionMakingRound(CollectSameUntilThresholdRound):
 
     payload_class = DecisionMakingPayload
     synchronized_data_class = SynchronizedData
+    # the blocks to wait for the missing candidates, once the threshold is reached
+    shard_block_confirmations = 3
 
     def end_block(self) -> Optional[Tuple[BaseSynchronizedData, Event]]:
         """Process the end of the block."""
+        if self.context.params.shard_decisions:
+            return self._reduce_shards()
 
         if self.threshold_reached:
             payload = json.loads(self.most_voted_payload)
@@ -185,10 +209,41 @@ class DecisionMakingRound(CollectSameUntilThresholdRound):
         if not self.is_majority_possible(
             self.collection, self.synchronized_data.nb_participants
         ):
+            self.context.state.metrics.record_no_majority(self.auto_round_id())
             return self.synchronized_data, Event.NO_MAJORITY
 
         return None
 
+    def _reduce_shards(self) -> Optional[Tuple[BaseSynchronizedData, Event]]:
+        """Reduce the candidates of the shards to the global best, once all of them or the threshold are in."""
+        participants = self.synchronized_data.sorted_participants
+        threshold_reached = (
+            len(self.collection) >= self.synchronized_data.consensus_threshold
+        )
+        if threshold_reached:
+            self.block_confirmations += 1
+        if len(self.collection) < len(participants) and (
+            not threshold_reached
+            or self.block_confirmations <= self.shard_block_confirmations
+        ):
+            return None
+
+        candidates = {}
+        for sender, payload in self.collection.items():
+            try:
+                content = json.loads(cast(DecisionMakingPayload, payload).content)
+                candidates[sender] = content.get("property_data", {})
+            except (AttributeError, ValueError):
+                self.context.logger.warning(f"Invalid candidate from {sender}.")
+        low, high = self.context.params.buy_price_range
+        best = global_best(candidates, participants, low, high)
+        if best is None:
+            return self.synchronized_data, Event.DONE
+        synchronized_data = self.synchronized_data.update(
+            synchronized_data_class=SynchronizedData, **best
+        )
+        return synchronized_data, Event.TRANSACT
+
     # Event.DONE, Event.ERROR, Event.TRANSACT, Event.ROUND_TIMEOUT  # this needs to be referenced for static checkers
 
 
@@ -214,19 +269,63 @@ class TxPreparationRound(CollectSameUntilThresholdRound):
                         SynchronizedData.most_voted_tx_hash
                     ): self.most_voted_payload,
                     get_name(SynchronizedData.tx_submitter): self.auto_round_id(),
+                    # a new transaction, whose settlement has not failed yet
+                    get_name(SynchronizedData.settlement_failures): 0,
                 },
             )
+            property_source = cast(
+                SynchronizedData, self.synchronized_data
+            ).property_source
+            if property_source is not None:
+                # the chain the transaction settlement sends the transaction to
+                state = state.update(
+                    synchronized_data_class=self.synchronized_data_class,
+                    chain_id=chain_of(property_source),
+                )
             return state, Event.DONE
         
         if not self.is_majority_possible(
             self.collection, self.synchronized_data.nb_participants
         ):
+            self.context.state.metrics.record_no_majority(self.auto_round_id())
             return self.synchronized_data, Event.NO_MAJORITY
 
         return None
     # Event.ROUND_TIMEOUT  # this needs to be referenced for static checkers
 
 
+class SettlementFailureRound(CollectSameUntilThresholdRound):
+    """SettlementFailureRound"""
+
+    payload_class = SettlementFailurePayload
+    synchronized_data_class = SynchronizedData
+
+    def end_block(self) -> Optional[Tuple[BaseSynchronizedData, Event]]:
+        """Process the end of the block."""
+        if self.threshold_reached:
+            synchronized_data = cast(SynchronizedData, self.synchronized_data)
+            synchronized_data = synchronized_data.update(
+                synchronized_data_class=SynchronizedData,
+                **{
+                    get_name(SynchronizedData.settlement_failures): (
+                        synchronized_data.settlement_failures + 1
+                    )
+                },
+            )
+            # TRANSACT to settle the transaction again, ERROR to give the purchase up
+            return synchronized_data, Event(self.most_voted_payload)
+
+        if not self.is_majority_possible(
+            self.collection, self.synchronized_data.nb_participants
+        ):
+            self.context.state.metrics.record_no_majority(self.auto_round_id())
+            return self.synchronized_data, Event.NO_MAJORITY
+
+        return None
+
+    # Event.TRANSACT, Event.ERROR, Event.ROUND_TIMEOUT  # this needs to be referenced for static checkers
+
+
 class FinishedDecisionMakingRound(DegenerateRound):
     """FinishedDecisionMakingRound"""
 
@@ -235,12 +334,17 @@ class FinishedTxPreparationRound(DegenerateRound):
     """FinishedLearningRound"""
 
 
+class FinishedSettlementFailureRound(DegenerateRound):
+    """FinishedSettlementFailureRound"""
+
+
 class LearningAbciApp(AbciApp[Event]):
     """LearningAbciApp"""
 
     initial_round_cls: AppState = APICheckRound
     initial_states: Set[AppState] = {
         APICheckRound,
+        SettlementFailureRound,
     }
     transition_function: AbciAppTransitionFunction = {
         APICheckRound: {
@@ -259,20 +363,34 @@ class LearningAbciApp(AbciApp[Event]):
             Event.NO_MAJORITY: TxPreparationRound,
             Event.ROUND_TIMEOUT: TxPreparationRound,
             Event.DONE: FinishedTxPreparationRound,
+            Event.ERROR: FinishedDecisionMakingRound,
+        },
+        SettlementFailureRound: {
+            Event.NO_MAJORITY: SettlementFailureRound,
+            Event.ROUND_TIMEOUT: SettlementFailureRound,
+            Event.TRANSACT: FinishedSettlementFailureRound,
+            Event.ERROR: APICheckRound,
         },
         FinishedDecisionMakingRound: {},
         FinishedTxPreparationRound: {},
+        FinishedSettlementFailureRound: {},
     }
     final_states: Set[AppState] = {
         FinishedDecisionMakingRound,
         FinishedTxPreparationRound,
+        FinishedSettlementFailureRound,
     }
     event_to_timeout: EventToTimeout = {}
     cross_period_persisted_keys: FrozenSet[str] = frozenset()
     db_pre_conditions: Dict[AppState, Set[str]] = {
         APICheckRound: set(),
+        SettlementFailureRound: set(),
     }
     db_post_conditions: Dict[AppState, Set[str]] = {
         FinishedDecisionMakingRound: set(),
         FinishedTxPreparationRound: {get_name(SynchronizedData.most_voted_tx_hash)},
+        # the transaction is settled again, as prepared before the failure
+        FinishedSettlementFailureRound: {
+            get_name(SynchronizedData.most_voted_tx_hash)
+        },
     }
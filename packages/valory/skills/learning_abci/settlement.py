@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+This module contains the backoff policy of the failed settlements.
+
+Only one purchase is settled at a time, so the failures of the settlement of
+the last prepared transaction are counted in the synchronized data, from the
+`TxPreparationRound` which prepared it, and all the agents agree on them. Each
+failure is retried after a backoff doubling with every failure, capped by
+`max_delay`, until the circuit opens at `max_failures`, and the purchase is
+given up.
+
+Example:
+
+    >>> policy = SettlementBackoff(max_failures=3, backoff=1.0, max_delay=3.0)
+    >>> [policy.delay(failures) for failures in (1, 2, 3)]
+    [1.0, 2.0, 3.0]
+    >>> policy.is_open(2), policy.is_open(3)
+    (False, True)
+"""
+
+
+class SettlementBackoff:
+    """The backoff and the circuit breaker of the settlement of a prepared transaction."""
+
+    def __init__(self, max_failures: int, backoff: float, max_delay: float) -> None:
+        """Initialize the policy."""
+        self.max_failures = max_failures
+        self.backoff = backoff
+        # the delay is kept below the timeout of the round which waits it out
+        self.max_delay = max_delay
+
+    def delay(self, failures: int) -> float:
+        """Get the backoff before the transaction is settled again, after `failures` failures."""
+        return min(self.backoff * 2 ** max(failures - 1, 0), self.max_delay)
+
+    def is_open(self, failures: int) -> bool:
+        """Check whether the circuit is open, i.e., whether the transaction failed too many times to be retried."""
+        return failures >= self.max_failures
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""
+This module contains the sharded evaluation of the listings.
+
+In the sharded decision mode, the property ids are split across the
+participants: the participant at position `shard` of the sorted participants
+owns the ids for which `shard_of(id, shards) == shard`. Each participant only
+evaluates its own shard, and sends its cheapest property within the buying
+range as its candidate, with the id and the value as its proof, and the tag
+of the source listing it. The round reduces the candidates whose proof holds
+to the global best.
+
+Example:
+
+    >>> shard_of(3, shards=2)
+    1
+    >>> candidates = {
+    ...     "0xa": {"property_id": 2, "property_value": 150},
+    ...     "0xb": {"property_id": 3, "property_value": 120},
+    ... }
+    >>> global_best(candidates, ["0xa", "0xb"], low=100, high=200)
+    {'property_id': 3, 'property_value': 120}
+"""
+
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+
+def shard_of(property_id: int, shards: int) -> int:
+    """Get the shard which owns a property id."""
+    return property_id % shards
+
+
+def _key(value: int, property_id: int, source: Optional[str]) -> Tuple[int, int, str]:
+    """Get the sort key of a property, the cheapest first, then the lowest id and source."""
+    return value, property_id, source or ""
+
+
+def shard_index(participants: Sequence[str], address: str) -> Optional[int]:
+    """Get the shard of a participant, given the sorted participants."""
+    try:
+        return list(participants).index(address)
+    except ValueError:
+        return None
+
+
+def holds(
+    candidate: Mapping[str, Any], shard: int, shards: int, low: int, high: int
+) -> bool:
+    """Check the proof of a candidate, i.e., that its id is in the shard of its sender and its value within the buying range."""
+    property_id = candidate.get("property_id", None)
+    property_value = candidate.get("property_value", None)
+    property_source = candidate.get("property_source", None)
+    return (
+        isinstance(property_id, int)
+        and isinstance(property_value, int)
+        and (property_source is None or isinstance(property_source, str))
+        and shard_of(property_id, shards) == shard
+        and low < property_value < high
+    )
+
+
+def global_best(
+    candidates: Mapping[str, Mapping[str, Any]],
+    participants: Sequence[str],
+    low: int,
+    high: int,
+) -> Optional[Dict[str, Any]]:
+    """Reduce the candidates sent by the participants to the cheapest one whose proof holds."""
+    shards = len(participants)
+    best: Optional[Dict[str, Any]] = None
+    for shard, sender in enumerate(participants):
+        candidate = candidates.get(sender, None)
+        if not candidate or not holds(candidate, shard, shards, low, high):
+            continue
+        key = _key(
+            candidate["property_value"],
+            candidate["property_id"],
+            candidate.get("property_source", None),
+        )
+        if best is None or key < _key(
+            best["property_value"],
+            best["property_id"],
+            best.get("property_source", None),
+        ):
+            best = {
+                "property_id": candidate["property_id"],
+                "property_value": candidate["property_value"],
+            }
+            if candidate.get("property_source", None) is not None:
+                best["property_source"] = candidate["property_source"]
+    return best
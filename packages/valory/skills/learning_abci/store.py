@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the local store of the listings, the prices and the decisions."""
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, NamedTuple, Optional
+
+from packages.valory.skills.learning_abci.properties import PropertyTable
+
+
+IN_MEMORY = ":memory:"
+# the listing snapshots kept, besides the last one
+SNAPSHOTS_KEPT = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    period INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    digest TEXT NOT NULL,
+    ipfs_hash TEXT NOT NULL,
+    properties TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS prices (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    period INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    price REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS decisions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    period INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    event TEXT NOT NULL,
+    property_data TEXT NOT NULL
+);
+"""
+
+
+def listing_digest(properties: List[Any]) -> str:
+    """Get the digest of the properties for sale."""
+    encoded = json.dumps(properties, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class ListingSnapshot(NamedTuple):
+    """The properties for sale in a period, and the IPFS hash they were uploaded under."""
+
+    period: int
+    digest: str
+    ipfs_hash: str
+    properties: PropertyTable
+
+
+class PricePoint(NamedTuple):
+    """The price of the token in a period."""
+
+    period: int
+    timestamp: float
+    price: float
+
+
+class Decision(NamedTuple):
+    """The decision of a period."""
+
+    period: int
+    timestamp: float
+    event: str
+    property_data: Dict[str, Any]
+
+
+class PropertyStore:
+    """
+    A SQLite store of the listing snapshots, the price history and the decisions.
+
+    Every write is committed right away, so that a restarted agent loads the
+    state of its last period in `load`: the last listing snapshot lets it skip
+    the IPFS upload and download of unchanged listings on its first period. A
+    snapshot is only inserted when the listings change, and only the last
+    `history` prices and decisions are kept. With the default in-memory
+    database, the store only lasts as long as the agent.
+    """
+
+    def __init__(self, path: str = IN_MEMORY, history: int = 1000) -> None:
+        """Initialize the store."""
+        if path != IN_MEMORY:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.history = history
+        self.snapshot: Optional[ListingSnapshot] = None
+        self.prices: Deque[PricePoint] = deque(maxlen=history)
+        self.last_decision: Optional[Decision] = None
+        self._connection = sqlite3.connect(path)
+        with self._connection:
+            self._connection.executescript(SCHEMA)
+
+    def load(self) -> None:
+        """Load the last snapshot, the price history and the last decision."""
+        connection = self._connection
+        row = connection.execute(
+            "SELECT period, digest, ipfs_hash, properties FROM listings "
+            "ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        if row is not None:
+            period, digest, ipfs_hash, properties = row
+            self.snapshot = ListingSnapshot(
+                period,
+                digest,
+                ipfs_hash,
+                PropertyTable.from_rows(json.loads(properties)),
+            )
+        rows = connection.execute(
+            "SELECT period, timestamp, price FROM prices ORDER BY id DESC LIMIT ?",
+            (self.history,),
+        ).fetchall()
+        self.prices.extend(PricePoint(*row) for row in reversed(rows))
+        row = connection.execute(
+            "SELECT period, timestamp, event, property_data FROM decisions "
+            "ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        if row is not None:
+            period, timestamp, event, property_data = row
+            self.last_decision = Decision(
+                period, timestamp, event, json.loads(property_data)
+            )
+
+    def ipfs_hash_of(self, digest: str) -> Optional[str]:
+        """Get the IPFS hash of the last snapshot, if its listings have the given digest."""
+        if self.snapshot is None or self.snapshot.digest != digest:
+            return None
+        return self.snapshot.ipfs_hash
+
+    def listings(self, ipfs_hash: str) -> Optional[PropertyTable]:
+        """Get the properties of the last snapshot, if it was uploaded under the given hash."""
+        if self.snapshot is None or self.snapshot.ipfs_hash != ipfs_hash:
+            return None
+        return self.snapshot.properties
+
+    def save_snapshot(
+        self, period: int, properties: List[Any], ipfs_hash: str, digest: str
+    ) -> None:
+        """Save the listings of a period, unless they are the ones of the last snapshot."""
+        snapshot = self.snapshot
+        with self._connection as connection:
+            if (
+                snapshot is not None
+                and snapshot.digest == digest
+                and snapshot.ipfs_hash == ipfs_hash
+            ):
+                connection.execute(
+                    "UPDATE listings SET period = ? WHERE id = "
+                    "(SELECT MAX(id) FROM listings)",
+                    (period,),
+                )
+                self.snapshot = snapshot._replace(period=period)
+                return
+            connection.execute(
+                "INSERT INTO listings (period, timestamp, digest, ipfs_hash, properties) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (period, time.time(), digest, ipfs_hash, json.dumps(properties)),
+            )
+            self._prune(connection, "listings", SNAPSHOTS_KEPT + 1)
+        self.snapshot = ListingSnapshot(
+            period, digest, ipfs_hash, PropertyTable.from_rows(properties)
+        )
+
+    def add_price(self, period: int, price: float) -> None:
+        """Add the price of a period to the history."""
+        point = PricePoint(period, time.time(), price)
+        with self._connection as connection:
+            connection.execute(
+                "INSERT INTO prices (period, timestamp, price) VALUES (?, ?, ?)",
+                point,
+            )
+            self._prune(connection, "prices", self.history)
+        self.prices.append(point)
+
+    def save_decision(
+        self, period: int, event: str, property_data: Dict[str, Any]
+    ) -> None:
+        """Save the decision of a period."""
+        decision = Decision(period, time.time(), event, property_data)
+        with self._connection as connection:
+            connection.execute(
+                "INSERT INTO decisions (period, timestamp, event, property_data) "
+                "VALUES (?, ?, ?, ?)",
+                (period, decision.timestamp, event, json.dumps(property_data)),
+            )
+            self._prune(connection, "decisions", self.history)
+        self.last_decision = decision
+
+    @staticmethod
+    def _prune(connection: sqlite3.Connection, table: str, kept: int) -> None:
+        """Delete all but the last `kept` rows of a table."""
+        connection.execute(
+            f"DELETE FROM {table} WHERE id <= (SELECT MAX(id) FROM {table}) - ?",  # nosec
+            (kept,),
+        )
+
+    def close(self) -> None:
+        """Close the store."""
+        self._connection.close()
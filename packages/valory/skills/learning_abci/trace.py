@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the record and replay trace of the external responses."""
+
+import base64
+import gzip
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, IO, Optional, Tuple, Type
+
+from aea.helpers.transaction.base import RawMessage, RawTransaction, State
+from aea.protocols.base import Message
+
+from packages.valory.protocols.contract_api import ContractApiMessage
+from packages.valory.protocols.http import HttpMessage
+from packages.valory.protocols.ipfs import IpfsMessage
+from packages.valory.protocols.ledger_api import LedgerApiMessage
+
+
+RECORD = "record"
+REPLAY = "replay"
+TRACE_MODES = (RECORD, REPLAY)
+TRACE_VERSION = 2
+TRACE_FILENAME = "trace.jsonl.gz"
+MESSAGE_TYPES: Dict[str, Type[Message]] = {
+    "http": HttpMessage,
+    "contract_api": ContractApiMessage,
+    "ipfs": IpfsMessage,
+    "ledger_api": LedgerApiMessage,
+}
+BYTES_TAG = "__bytes__"
+TUPLE_TAG = "__tuple__"
+DICT_TAG = "__dict__"
+TYPE_TAG = "__type__"
+CUSTOM_TYPES = {cls.__name__: cls for cls in (State, RawTransaction, RawMessage)}
+TAGS = (BYTES_TAG, TUPLE_TAG, DICT_TAG, TYPE_TAG)
+
+
+def _encode(value: Any) -> Any:
+    """Encode a field of a message to JSON, tagging the types JSON cannot tell apart."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, bytes):
+        return {BYTES_TAG: base64.b64encode(value).decode()}
+    if isinstance(value, tuple):
+        return {TUPLE_TAG: [_encode(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        if all(isinstance(key, str) and key not in TAGS for key in value):
+            return {key: _encode(item) for key, item in value.items()}
+        return {
+            DICT_TAG: [[_encode(key), _encode(item)] for key, item in value.items()]
+        }
+    if type(value).__name__ in CUSTOM_TYPES:
+        encoded = {TYPE_TAG: type(value).__name__, "ledger_id": value.ledger_id}
+        encoded["body"] = _encode(value.body)
+        if isinstance(value, RawMessage):
+            encoded["is_deprecated_mode"] = value.is_deprecated_mode
+        return encoded
+    raise TypeError(f"Cannot record a value of type {type(value).__name__}.")
+
+
+def _decode(value: Any) -> Any:
+    """Decode a field of a message from JSON."""
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if BYTES_TAG in value:
+        return base64.b64decode(value[BYTES_TAG])
+    if TUPLE_TAG in value:
+        return tuple(_decode(item) for item in value[TUPLE_TAG])
+    if DICT_TAG in value:
+        return {_decode(key): _decode(item) for key, item in value[DICT_TAG]}
+    if TYPE_TAG in value:
+        fields = {key: _decode(item) for key, item in value.items() if key != TYPE_TAG}
+        return CUSTOM_TYPES[value[TYPE_TAG]](**fields)
+    return {key: _decode(item) for key, item in value.items()}
+
+
+def encode_message(message: Message) -> Dict[str, Any]:
+    """Encode the body of a response message to JSON."""
+    body = dict(message._body)  # pylint: disable=protected-access
+    body["performative"] = message.performative.value
+    return _encode(body)
+
+
+def decode_message(kind: str, encoded: Dict[str, Any]) -> Message:
+    """Decode a response message of a kind of request from JSON."""
+    message_type = MESSAGE_TYPES[kind]
+    body = _decode(encoded)
+    performative = message_type.Performative(body.pop("performative"))  # type: ignore
+    return message_type(performative=performative, **body)
+
+
+def _open(path: Path, mode: str) -> IO[str]:
+    """Open a trace file, gzipped if its name ends with `.gz`."""
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")  # pylint: disable=consider-using-with
+
+
+class ResponseTrace:
+    """
+    A trace of the responses to the http, contract_api, ledger_api and IPFS requests.
+
+    In record mode, every response is appended to a JSON lines file, along
+    with the request key, the time it was received and how long it took. In
+    replay mode, the file is loaded and the responses are served back, in
+    their original order for each request key, with their original latency
+    multiplied by `latency_scale`.
+
+    The bodies of the responses are stored as JSON rather than
+    protobuf-encoded, as the contract states may hold mixed-type lists, which
+    the protocol serializers reject. Only the message types of the traced
+    requests and the State, RawTransaction and RawMessage types are decoded.
+    """
+
+    def __init__(self, mode: str, path: Path, latency_scale: float = 1.0) -> None:
+        """Initialize the trace."""
+        if mode not in TRACE_MODES:
+            raise ValueError(
+                f"Unknown trace mode {mode!r}, expected one of {TRACE_MODES}."
+            )
+        self.mode = mode
+        self.path = path
+        self.latency_scale = latency_scale
+        self._file: Optional[IO[str]] = None
+        self._start = time.time()
+        self._responses: Dict[Tuple[str, str], Deque[Tuple[Message, float]]] = {}
+
+        if mode == REPLAY:
+            self._load()
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = _open(path, "w")
+        self._write({"version": TRACE_VERSION, "started": self._start})
+
+    @property
+    def recording(self) -> bool:
+        """Whether the responses are being recorded."""
+        return self.mode == RECORD
+
+    @property
+    def replaying(self) -> bool:
+        """Whether the responses are being replayed."""
+        return self.mode == REPLAY
+
+    def _write(self, entry: Dict) -> None:
+        """Write an entry of the trace and flush it, so that it survives a crash."""
+        if self._file is None:
+            return
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def _load(self) -> None:
+        """Load the responses of a trace file."""
+        with _open(self.path, "r") as file:
+            header = json.loads(file.readline())
+            if header.get("version", None) != TRACE_VERSION:
+                raise ValueError(f"Unsupported trace version in {self.path}: {header}.")
+            for line in file:
+                entry = json.loads(line)
+                message = decode_message(entry["k"], entry["m"])
+                self._responses.setdefault((entry["k"], entry["q"]), deque()).append(
+                    (message, entry["d"])
+                )
+
+    def record(self, kind: str, key: str, response: Message, seconds: float) -> None:
+        """Record a response which took `seconds` to arrive."""
+        self._write(
+            {
+                "t": round(time.time() - self._start, 6),
+                "d": round(seconds, 6),
+                "k": kind,
+                "q": key,
+                "m": encode_message(response),
+            }
+        )
+
+    def next_response(self, kind: str, key: str) -> Optional[Tuple[Message, float]]:
+        """Get the next recorded response to a request, and the latency to replay it with."""
+        responses = self._responses.get((kind, key), None)
+        if not responses:
+            return None
+        message, seconds = responses.popleft()
+        return message, seconds * self.latency_scale
+
+    def close(self) -> None:
+        """Close the trace file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the watchdog of the steps which block the agent's loop."""
+
+import logging
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Generator, Optional
+
+from packages.valory.skills.learning_abci.metrics import LearningMetrics
+
+
+START = "start"
+END = "end"
+
+
+def suspension_point(generator: Any, filename: str) -> Optional[str]:
+    """
+    Get the location at which a chain of generators is suspended, following `yield from`.
+
+    Only the frames of `filename` are kept, e.g.
+    `behaviours.py: async_act:296 > make_transaction_decision:316`.
+    """
+    frames = []
+    while generator is not None:
+        frame = getattr(generator, "gi_frame", None)
+        if frame is None:
+            break
+        code = frame.f_code
+        if code.co_filename == filename:
+            frames.append(f"{code.co_name}:{frame.f_lineno}")
+        generator = generator.gi_yieldfrom
+    if not frames:
+        return None
+    return f"{Path(filename).name}: {' > '.join(frames)}"
+
+
+class StepWatchdog:
+    """
+    Time each step of the behaviours, i.e., the code run between two yields.
+
+    The behaviours share the agent's loop with all the handlers, which a long
+    step stalls. The steps are observed in the metrics, and the ones over the
+    budget are counted and logged with the location they resumed from, which
+    is where the blocking code starts.
+    """
+
+    def __init__(
+        self, budget: float, metrics: LearningMetrics, logger: logging.Logger
+    ) -> None:
+        """Initialize the watchdog."""
+        self.budget = budget
+        self.metrics = metrics
+        self.logger = logger
+
+    def watch(self, behaviour_id: str, steps: Generator, filename: str) -> Generator:
+        """Run the steps of a behaviour defined in `filename`, timing each of them."""
+        value = None
+        resumed_at = START
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    yielded = steps.send(value)
+                except StopIteration as stop:
+                    self._observe(behaviour_id, perf_counter() - start, resumed_at, END)
+                    return stop.value
+                seconds = perf_counter() - start
+                suspended_at = suspension_point(steps, filename) or END
+                self._observe(behaviour_id, seconds, resumed_at, suspended_at)
+                resumed_at = suspended_at
+                value = yield yielded
+        finally:
+            steps.close()
+
+    def _observe(
+        self, behaviour_id: str, seconds: float, resumed_at: str, suspended_at: str
+    ) -> None:
+        """Observe the duration of a step, and flag it if over the budget."""
+        self.metrics.observe_step(behaviour_id, seconds)
+        if seconds <= self.budget:
+            return
+        self.metrics.record_blocking_step(behaviour_id, resumed_at)
+        self.logger.warning(
+            f"A step of {behaviour_id} blocked the agent for {seconds * 1000:.1f}ms "
+            f"(budget {self.budget * 1000:.1f}ms), from {resumed_at} to {suspended_at}."
+        )
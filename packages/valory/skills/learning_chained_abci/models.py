@@ -19,13 +19,13 @@
 
 """This module contains the shared state for the abci skill of LearningChainedSkillAbciApp."""
 
-from packages.valory.skills.abstract_round_abci.models import (
-    BenchmarkTool as BaseBenchmarkTool,
-)
 from packages.valory.skills.abstract_round_abci.models import Requests as BaseRequests
 from packages.valory.skills.abstract_round_abci.tests.data.dummy_abci.models import (
     RandomnessApi as BaseRandomnessApi,
 )
+from packages.valory.skills.learning_abci.models import (
+    BenchmarkTool as LearningBenchmarkTool,
+)
 from packages.valory.skills.learning_abci.models import Params as LearningParams
 from packages.valory.skills.learning_abci.models import SharedState as BaseSharedState
 from packages.valory.skills.learning_abci.rounds import Event as LearningEvent
@@ -37,7 +37,7 @@ from packages.valory.skills.termination_abci.models import TerminationParams
 
 
 Requests = BaseRequests
-BenchmarkTool = BaseBenchmarkTool
+BenchmarkTool = LearningBenchmarkTool
 
 RandomnessApi = BaseRandomnessApi
 
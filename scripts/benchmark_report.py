@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Aggregate the BenchmarkTool logs of the agents into per-behaviour percentile reports.
+
+The BenchmarkTool saves one `<log_dir>/<agent_address>/<period>.json` file per
+agent and period. This script streams those files, one at a time, into
+fixed-size log-scale histograms, so that weeks of logs can be processed in
+constant memory. It then
+
+- prints p50, p95 and p99 of the local, consensus and total time of each behaviour;
+- lists the worst outliers, i.e. samples above `--outlier-factor` times the median;
+- flags the regressions against the CSV of a previous run, if `--baseline` is given;
+- writes the aggregated figures to `--csv`, which can be the baseline of a later run.
+
+Example:
+
+    python scripts/benchmark_report.py /logs --csv report.csv --baseline last_week.csv
+"""
+
+import csv
+import heapq
+import json
+import math
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import click
+
+
+ALL_AGENTS = "*"
+PERCENTILES = (50, 95, 99)
+PRECISION = 0.01
+CSV_FIELDS = (
+    "behaviour",
+    "block",
+    "agent",
+    "count",
+    "mean",
+    "p50",
+    "p95",
+    "p99",
+    "max",
+)
+
+
+class Sample(NamedTuple):
+    """A single measurement of a behaviour block."""
+
+    agent: str
+    period: int
+    behaviour: str
+    block: str
+    value: float
+
+
+class LogHistogram:
+    """A histogram with logarithmic buckets, bounding the relative error of the quantiles."""
+
+    def __init__(self, precision: float = PRECISION) -> None:
+        """Initialize the histogram."""
+        self._log_gamma = math.log1p(2 * precision)
+        self.buckets: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        """Add a value to the histogram."""
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        if value <= 0:
+            self.zeros += 1
+            return
+        index = math.floor(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    @property
+    def mean(self) -> float:
+        """Get the mean of the values."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        """Get an approximation of a percentile of the values."""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(percentile / 100 * self.count)
+        seen = self.zeros
+        if seen >= rank:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # the middle of the bucket, capped to the largest value seen
+                return min(self.max, math.exp((index + 0.5) * self._log_gamma))
+        return self.max  # pragma: nocover
+
+
+def iter_log_files(log_dirs: Tuple[Path, ...]) -> Iterator[Tuple[str, int, Path]]:
+    """Yield the (agent, period, path) of the benchmark files, in period order per agent."""
+    for log_dir in log_dirs:
+        for agent_dir in sorted(p for p in log_dir.iterdir() if p.is_dir()):
+            periods = []
+            for path in agent_dir.glob("*.json"):
+                try:
+                    periods.append((int(path.stem), path))
+                except ValueError:
+                    continue
+            for period, path in sorted(periods):
+                yield agent_dir.name, period, path
+
+
+def iter_samples(log_dirs: Tuple[Path, ...]) -> Iterator[Sample]:
+    """Stream the samples of all the benchmark files."""
+    for agent, period, path in iter_log_files(log_dirs):
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                entries = json.load(file)
+        except (OSError, json.JSONDecodeError) as e:
+            click.echo(f"Skipping unreadable file {path}: {e}", err=True)
+            continue
+        for entry in entries:
+            for block, value in entry.get("data", {}).items():
+                yield Sample(agent, period, entry["behaviour"], block, float(value))
+
+
+def aggregate(
+    log_dirs: Tuple[Path, ...], per_agent: bool
+) -> Dict[Tuple[str, str, str], LogHistogram]:
+    """Build the histograms of all the (behaviour, block, agent) series."""
+    histograms: Dict[Tuple[str, str, str], LogHistogram] = {}
+    for sample in iter_samples(log_dirs):
+        agents = (ALL_AGENTS, sample.agent) if per_agent else (ALL_AGENTS,)
+        for agent in agents:
+            key = (sample.behaviour, sample.block, agent)
+            histogram = histograms.get(key, None)
+            if histogram is None:
+                histogram = histograms[key] = LogHistogram()
+            histogram.add(sample.value)
+    return histograms
+
+
+def find_outliers(
+    log_dirs: Tuple[Path, ...],
+    histograms: Dict[Tuple[str, str, str], LogHistogram],
+    factor: float,
+    limit: int,
+) -> List[Tuple[float, Sample]]:
+    """Stream the samples again and keep the `limit` worst ones above `factor` times the median."""
+    medians = {
+        (behaviour, block): histogram.percentile(50)
+        for (behaviour, block, agent), histogram in histograms.items()
+        if agent == ALL_AGENTS
+    }
+    worst: List[Tuple[float, int, Sample]] = []
+    for position, sample in enumerate(iter_samples(log_dirs)):
+        median = medians.get((sample.behaviour, sample.block), 0.0)
+        if median <= 0 or sample.value <= factor * median:
+            continue
+        item = (sample.value / median, position, sample)
+        if len(worst) < limit:
+            heapq.heappush(worst, item)
+        else:
+            heapq.heappushpop(worst, item)
+    return [(ratio, sample) for ratio, _, sample in sorted(worst, reverse=True)]
+
+
+def to_rows(
+    histograms: Dict[Tuple[str, str, str], LogHistogram]
+) -> List[Dict[str, str]]:
+    """Convert the histograms to CSV rows."""
+    rows = []
+    for (behaviour, block, agent), histogram in sorted(histograms.items()):
+        row = {
+            "behaviour": behaviour,
+            "block": block,
+            "agent": agent,
+            "count": str(histogram.count),
+            "mean": f"{histogram.mean:.6f}",
+            "max": f"{histogram.max:.6f}",
+        }
+        for percentile in PERCENTILES:
+            row[f"p{percentile}"] = f"{histogram.percentile(percentile):.6f}"
+        rows.append(row)
+    return rows
+
+
+def load_baseline(path: Path) -> Dict[Tuple[str, str, str], Dict[str, str]]:
+    """Load the rows of a previous report."""
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        return {
+            (row["behaviour"], row["block"], row["agent"]): row
+            for row in csv.DictReader(file)
+        }
+
+
+def find_regressions(
+    rows: List[Dict[str, str]],
+    baseline: Dict[Tuple[str, str, str], Dict[str, str]],
+    threshold: float,
+) -> List[Tuple[Dict[str, str], str, float, float]]:
+    """Get the (row, percentile, old, new) figures that got slower than `threshold` allows."""
+    regressions = []
+    for row in rows:
+        previous = baseline.get((row["behaviour"], row["block"], row["agent"]), None)
+        if previous is None:
+            continue
+        for percentile in PERCENTILES:
+            field = f"p{percentile}"
+            old, new = float(previous[field]), float(row[field])
+            if old > 0 and new > old * (1 + threshold):
+                regressions.append((row, field, old, new))
+    return regressions
+
+
+def print_report(
+    rows: List[Dict[str, str]],
+    outliers: List[Tuple[float, Sample]],
+    regressions: Optional[List[Tuple[Dict[str, str], str, float, float]]],
+) -> None:
+    """Print a compact report."""
+    behaviour_width = max([len("behaviour")] + [len(row["behaviour"]) for row in rows])
+    header = f"{'behaviour':<{behaviour_width}} {'block':<9} {'agent':<12} {'count':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"
+    click.echo(header)
+    click.echo("-" * len(header))
+    for row in rows:
+        click.echo(
+            f"{row['behaviour']:<{behaviour_width}} {row['block']:<9} {row['agent'][:12]:<12} {row['count']:>7} "
+            f"{float(row['p50']):>9.3f} {float(row['p95']):>9.3f} {float(row['p99']):>9.3f} {float(row['max']):>9.3f}"
+        )
+
+    click.echo(f"\nOutliers ({len(outliers)}):")
+    for ratio, sample in outliers:
+        click.echo(
+            f"  {sample.behaviour} {sample.block}: {sample.value:.3f}s "
+            f"({ratio:.1f}x median) agent={sample.agent} period={sample.period}"
+        )
+
+    if regressions is None:
+        return
+    click.echo(f"\nRegressions ({len(regressions)}):")
+    for row, field, old, new in regressions:
+        click.echo(
+            f"  {row['behaviour']} {row['block']} agent={row['agent']} {field}: "
+            f"{old:.3f}s -> {new:.3f}s (+{(new / old - 1) * 100:.0f}%)"
+        )
+
+
+@click.command()
+@click.argument(
+    "log_dirs",
+    nargs=-1,
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+)
+@click.option(
+    "--csv",
+    "csv_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write the aggregated figures to this CSV file.",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="The CSV of a previous run to detect regressions against.",
+)
+@click.option("--per-agent", is_flag=True, help="Also report each agent separately.")
+@click.option("--outlier-factor", type=float, default=5.0, show_default=True)
+@click.option("--max-outliers", type=int, default=20, show_default=True)
+@click.option(
+    "--regression-threshold",
+    type=float,
+    default=0.2,
+    show_default=True,
+    help="Relative slowdown of a percentile to be reported as a regression.",
+)
+def main(  # pylint: disable=too-many-arguments
+    log_dirs: Tuple[Path, ...],
+    csv_path: Optional[Path],
+    baseline: Optional[Path],
+    per_agent: bool,
+    outlier_factor: float,
+    max_outliers: int,
+    regression_threshold: float,
+) -> None:
+    """Aggregate the BenchmarkTool logs found in LOG_DIRS (default: /logs)."""
+    log_dirs = log_dirs or (Path("/logs"),)
+    histograms = aggregate(log_dirs, per_agent)
+    if not histograms:
+        click.echo(f"No benchmark data found in {', '.join(map(str, log_dirs))}.")
+        sys.exit(1)
+
+    rows = to_rows(histograms)
+    outliers = find_outliers(log_dirs, histograms, outlier_factor, max_outliers)
+    regressions = (
+        find_regressions(rows, load_baseline(baseline), regression_threshold)
+        if baseline is not None
+        else None
+    )
+    print_report(rows, outliers, regressions)
+
+    if csv_path is not None:
+        with open(csv_path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
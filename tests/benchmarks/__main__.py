@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Run the offline throughput benchmarks of the LearningAbciApp.
+
+Example:
+
+    python -m tests.benchmarks --sizes 10,1000,100000 --periods 20
+    python -m tests.benchmarks --synthetic --churn-rate 0.01 --distribution normal
+    python -m tests.benchmarks --update-baseline
+"""
+
+import json
+import sys
+from pathlib import Path
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+
+import click
+
+from tests.benchmarks.catalog import LOGNORMAL, PRICE_DISTRIBUTIONS, CatalogSpec
+from tests.benchmarks.harness import BenchmarkConfig, find_regressions, run_benchmark
+from tests.benchmarks.stubs import Latencies
+
+
+BASELINE = Path(__file__).parent / "baseline.json"
+DEFAULT_SIZES = "10,100,1000,10000,100000"
+
+
+def print_summary(size: str, summary: Dict[str, Any]) -> None:
+    """Print the figures of a run."""
+    click.echo(f"catalog={size:>7} periods/s={summary['periods_per_second']:>10.3f}")
+    for round_id, figures in summary["rounds"].items():
+        click.echo(
+            f"    {round_id:<24} p50={figures['p50'] * 1000:>9.3f}ms "
+            f"p95={figures['p95'] * 1000:>9.3f}ms max={figures['max'] * 1000:>9.3f}ms"
+        )
+
+
+@click.command()
+@click.option("--sizes", default=DEFAULT_SIZES, show_default=True)
+@click.option("--periods", type=int, default=10, show_default=True)
+@click.option("--agents", "n_agents", type=int, default=4, show_default=True)
+@click.option("--http-latency", type=float, default=0.0, show_default=True)
+@click.option("--contract-latency", type=float, default=0.0, show_default=True)
+@click.option("--ipfs-latency", type=float, default=0.0, show_default=True)
+@click.option(
+    "--hold",
+    is_flag=True,
+    help="No property is buyable, so the periods end after the decision.",
+)
+@click.option(
+    "--synthetic",
+    is_flag=True,
+    help="Use a synthetic catalog, which changes every period, instead of a static one.",
+)
+@click.option(
+    "--distribution",
+    type=click.Choice(PRICE_DISTRIBUTIONS),
+    default=LOGNORMAL,
+    show_default=True,
+    help="The price distribution of the synthetic catalog.",
+)
+@click.option("--listed-ratio", type=float, default=0.8, show_default=True)
+@click.option("--churn-rate", type=float, default=0.0, show_default=True)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option(
+    "--baseline",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=BASELINE,
+    show_default=True,
+)
+@click.option("--update-baseline", is_flag=True, help="Overwrite the baseline.")
+@click.option("--threshold", type=float, default=0.2, show_default=True)
+def main(  # pylint: disable=too-many-arguments,too-many-locals
+    sizes: str,
+    periods: int,
+    n_agents: int,
+    http_latency: float,
+    contract_latency: float,
+    ipfs_latency: float,
+    hold: bool,
+    synthetic: bool,
+    distribution: str,
+    listed_ratio: float,
+    churn_rate: float,
+    seed: int,
+    baseline: Path,
+    update_baseline: bool,
+    threshold: float,
+) -> None:
+    """Benchmark the LearningAbciApp offline, for catalogs of the given SIZES."""
+    latencies = Latencies(http_latency, contract_latency, ipfs_latency)
+    buy_index: Optional[int] = None if hold else -1
+    config = {
+        "periods": periods,
+        "n_agents": n_agents,
+        "latencies": latencies._asdict(),
+        "buy_index": buy_index,
+    }
+
+    results = {}
+    for size in sizes.split(","):
+        catalog_spec = None
+        if synthetic:
+            catalog_spec = CatalogSpec(
+                size=int(size),
+                seed=seed,
+                price_distribution=distribution,
+                listed_ratio=listed_ratio,
+                churn_rate=churn_rate,
+            )
+            config["catalog"] = {
+                key: value
+                for key, value in asdict(catalog_spec).items()
+                if key != "size"
+            }
+        result = run_benchmark(
+            BenchmarkConfig(
+                catalog_size=int(size),
+                periods=periods,
+                n_agents=n_agents,
+                latencies=latencies,
+                buy_index=buy_index,
+                seed=seed,
+                catalog_spec=catalog_spec,
+            )
+        )
+        results[size] = result.summary()
+        print_summary(size, results[size])
+
+    if update_baseline:
+        with open(baseline, "w", encoding="utf-8") as file:
+            json.dump({"config": config, "results": results}, file, indent=2)
+            file.write("\n")
+        click.echo(f"\nBaseline written to {baseline}.")
+        return
+
+    if not baseline.exists():
+        return
+    with open(baseline, "r", encoding="utf-8") as file:
+        stored = json.load(file)
+    if stored["config"] != config:
+        click.echo(
+            f"\nNot comparing with {baseline}, it was run with {stored['config']}."
+        )
+        return
+
+    regressions = find_regressions(results, stored["results"], threshold)
+    click.echo(f"\nRegressions against {baseline} ({len(regressions)}):")
+    for size, figure, old, new in regressions:
+        click.echo(f"  catalog={size} {figure}: {old:.6f} -> {new:.6f}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
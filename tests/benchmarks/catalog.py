@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+A deterministic generator of synthetic real estate catalogs.
+
+The properties have the shape of the tuples returned by the
+`get_properties_for_sale` callable of the real estate contract, i.e.,
+`[id, name, owner, value, for_sale]`. The same spec and seed always give the
+same catalog and the same sequence of per-block deltas, so that benchmarks
+and load tests can be compared across runs.
+
+Example:
+
+    >>> generator = CatalogGenerator(CatalogSpec(size=1000, seed=7, churn_rate=0.01))
+    >>> response = generator.response()
+    >>> len(response["data"]) == len(generator.listed_ids)
+    True
+    >>> delta = generator.step()
+    >>> delta.block
+    1
+"""
+
+import math
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, NamedTuple
+
+
+Property = List[Any]
+
+UNIFORM = "uniform"
+NORMAL = "normal"
+LOGNORMAL = "lognormal"
+PRICE_DISTRIBUTIONS = (UNIFORM, NORMAL, LOGNORMAL)
+
+LIST = "list"
+DELIST = "delist"
+REPRICE = "reprice"
+SELL = "sell"
+CHURN_EVENTS = (LIST, DELIST, REPRICE, SELL)
+
+ID = 0
+OWNER = 2
+VALUE = 3
+FOR_SALE = 4
+
+
+@dataclass(frozen=True)
+class CatalogSpec:  # pylint: disable=too-many-instance-attributes
+    """The parameters of a synthetic catalog."""
+
+    size: int
+    seed: int = 0
+    price_distribution: str = LOGNORMAL
+    # the median price, and the relative spread around it
+    price_median: float = 150.0
+    price_spread: float = 0.35
+    min_price: int = 1
+    # the share of the registered properties which are for sale
+    listed_ratio: float = 0.8
+    # the share of the properties changing in each block
+    churn_rate: float = 0.0
+    # the relative weights of the list, delist, reprice and sell events
+    churn_weights: tuple = (1.0, 1.0, 2.0, 1.0)
+    owners: int = 1000
+
+    def __post_init__(self) -> None:
+        """Check the spec."""
+        if self.size < 0:
+            raise ValueError(f"Invalid catalog size {self.size}.")
+        if self.price_distribution not in PRICE_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown price distribution {self.price_distribution!r}, "
+                f"expected one of {PRICE_DISTRIBUTIONS}."
+            )
+        if not 0 <= self.listed_ratio <= 1 or not 0 <= self.churn_rate <= 1:
+            raise ValueError("The listed ratio and the churn rate must be in [0, 1].")
+        if len(self.churn_weights) != len(CHURN_EVENTS):
+            raise ValueError(f"Expected a weight for each of {CHURN_EVENTS}.")
+
+
+class Delta(NamedTuple):
+    """The changes of the catalog in a block."""
+
+    block: int
+    # the properties which were listed or repriced, in their new state
+    upserted: List[Property]
+    # the ids of the properties which were delisted or sold
+    removed: List[int]
+
+
+class CatalogGenerator:
+    """Generate a catalog and evolve it block by block."""
+
+    def __init__(self, spec: CatalogSpec) -> None:
+        """Initialize the generator."""
+        self.spec = spec
+        self.block = 0
+        self._rng = random.Random(spec.seed)
+        self._owners = [
+            f"0x{self._rng.getrandbits(160):040x}" for _ in range(max(1, spec.owners))
+        ]
+        self.properties: List[Property] = [
+            self._new_property(index) for index in range(spec.size)
+        ]
+        self.listed_ids = {
+            property_[ID] for property_ in self.properties if property_[FOR_SALE]
+        }
+
+    def _price(self) -> int:
+        """Draw a price."""
+        spec, rng = self.spec, self._rng
+        if spec.price_distribution == UNIFORM:
+            half_width = spec.price_median * spec.price_spread
+            price = rng.uniform(
+                spec.price_median - half_width, spec.price_median + half_width
+            )
+        elif spec.price_distribution == NORMAL:
+            price = rng.gauss(spec.price_median, spec.price_median * spec.price_spread)
+        else:
+            price = rng.lognormvariate(math.log(spec.price_median), spec.price_spread)
+        return max(spec.min_price, int(round(price)))
+
+    def _new_property(self, index: int) -> Property:
+        """Draw a property."""
+        return [
+            index,
+            f"Property {index}",
+            self._rng.choice(self._owners),
+            self._price(),
+            self._rng.random() < self.spec.listed_ratio,
+        ]
+
+    def listings(self) -> Iterator[Property]:
+        """Iterate over the properties for sale, in id order."""
+        return (property_ for property_ in self.properties if property_[FOR_SALE])
+
+    def response(self) -> Dict[str, List[Property]]:
+        """Get the body of a `get_properties_for_sale` response for the current block."""
+        return {"data": [list(property_) for property_ in self.listings()]}
+
+    def step(self) -> Delta:
+        """Move to the next block and get its changes."""
+        self.block += 1
+        spec, rng = self.spec, self._rng
+        upserted: Dict[int, Property] = {}
+        removed = set()
+        changes = int(len(self.properties) * spec.churn_rate)
+        # spread the rounding error over the blocks
+        if rng.random() < len(self.properties) * spec.churn_rate - changes:
+            changes += 1
+
+        for _ in range(changes):
+            property_ = rng.choice(self.properties)
+            event = rng.choices(CHURN_EVENTS, weights=spec.churn_weights)[0]
+            property_id = property_[ID]
+            if event == LIST and not property_[FOR_SALE]:
+                property_[FOR_SALE] = True
+                property_[VALUE] = self._price()
+            elif event == REPRICE and property_[FOR_SALE]:
+                # move the price by up to the spread, in either direction
+                factor = 1 + rng.uniform(-spec.price_spread, spec.price_spread)
+                property_[VALUE] = max(spec.min_price, int(property_[VALUE] * factor))
+            elif event in (DELIST, SELL) and property_[FOR_SALE]:
+                property_[FOR_SALE] = False
+                if event == SELL:
+                    property_[OWNER] = rng.choice(self._owners)
+            else:
+                continue
+
+            if property_[FOR_SALE]:
+                self.listed_ids.add(property_id)
+                removed.discard(property_id)
+                upserted[property_id] = list(property_)
+            else:
+                self.listed_ids.discard(property_id)
+                upserted.pop(property_id, None)
+                removed.add(property_id)
+
+        return Delta(
+            self.block,
+            [upserted[key] for key in sorted(upserted)],
+            sorted(removed),
+        )
+
+    def deltas(self, blocks: int) -> Iterator[Delta]:
+        """Get the changes of the next `blocks` blocks, lazily."""
+        for _ in range(blocks):
+            yield self.step()
+
+
+def apply_delta(listings: Dict[int, Property], delta: Delta) -> None:
+    """Apply a delta to a mapping of the properties for sale by id."""
+    for property_id in delta.removed:
+        listings.pop(property_id, None)
+    for property_ in delta.upserted:
+        listings[property_[ID]] = property_
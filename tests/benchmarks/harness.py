@@ -0,0 +1,508 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+An offline driver of the LearningAbciApp.
+
+The real behaviours, rounds and AbciApp of the learning skill are run in
+process. Only the edges are replaced: the http, contract_api and IPFS requests
+are answered by the stand-ins of `tests.benchmarks.stubs`, and the payloads
+are delivered straight to the AbciApp, along with identical payloads of the
+other participants, instead of going through Tendermint.
+"""
+
+import logging
+import tempfile
+from abc import ABC
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, Generator, List, Optional, Tuple, Type, cast
+
+import yaml
+
+from packages.valory.protocols.contract_api import ContractApiMessage
+from packages.valory.protocols.http import HttpMessage
+from packages.valory.protocols.ipfs import IpfsMessage
+from packages.valory.protocols.ledger_api import LedgerApiMessage
+from packages.valory.skills.abstract_round_abci.base import (
+    AbciApp,
+    BaseTxPayload,
+    Transaction,
+)
+from packages.valory.skills.abstract_round_abci.behaviours import BaseBehaviour
+from packages.valory.skills.learning_abci.behaviours import (
+    APICheckBehaviour,
+    DecisionMakingBehaviour,
+    PollingBehaviour,
+    SettlementFailureBehaviour,
+    TxPreparationBehaviour,
+)
+from packages.valory.skills.learning_abci.models import (
+    BenchmarkTool,
+    Params,
+    SharedState,
+)
+from packages.valory.skills.learning_abci.rounds import LearningAbciApp
+from tests.benchmarks.catalog import CatalogGenerator, CatalogSpec
+from tests.benchmarks.stubs import Latencies, StandIns, make_catalog
+
+
+PACKAGES_DIR = Path(__file__).parents[2] / "packages"
+SKILL_YAML = PACKAGES_DIR / "valory" / "skills" / "learning_chained_abci" / "skill.yaml"
+SKILL_ID = "valory/learning_abci:0.1.0"
+LEDGER_ID = "ethereum"
+BUY_PRICE_RANGE = (125, 200)
+LEARNING_BEHAVIOURS: Tuple[Type[BaseBehaviour], ...] = (
+    APICheckBehaviour,
+    DecisionMakingBehaviour,
+    TxPreparationBehaviour,
+    SettlementFailureBehaviour,
+)
+
+
+@dataclass
+class BenchmarkConfig:  # pylint: disable=too-many-instance-attributes
+    """The configuration of a benchmark run."""
+
+    catalog_size: int
+    periods: int = 10
+    n_agents: int = 4
+    latencies: Latencies = field(default_factory=Latencies)
+    buy_price_range: Tuple[int, int] = BUY_PRICE_RANGE
+    # the position of the only buyable property; `None` makes every period end with a HOLD
+    buy_index: Optional[int] = -1
+    seed: int = 0
+    # a synthetic catalog, evolving every period, instead of a static one
+    catalog_spec: Optional[CatalogSpec] = None
+    # overrides of the params of the skill
+    params: Dict[str, Any] = field(default_factory=dict)
+    log_level: int = logging.ERROR
+
+
+@dataclass
+class BenchmarkResult:
+    """The measurements of a benchmark run."""
+
+    catalog_size: int
+    periods: int
+    seconds: float
+    round_latencies: Dict[str, List[float]]
+
+    @property
+    def periods_per_second(self) -> float:
+        """Get the throughput of the run."""
+        return self.periods / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the figures of the run, in the format of the baseline file."""
+        return {
+            "periods_per_second": round(self.periods_per_second, 3),
+            "rounds": {
+                round_id: {
+                    "p50": round(percentile(latencies, 50), 6),
+                    "p95": round(percentile(latencies, 95), 6),
+                    "max": round(max(latencies), 6),
+                }
+                for round_id, latencies in sorted(self.round_latencies.items())
+            },
+        }
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Get the nearest-rank percentile of some values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
+
+
+class OfflineSkillContext:  # pylint: disable=too-many-instance-attributes
+    """The parts of the skill context used by the learning behaviours, models and rounds."""
+
+    def __init__(self, agent_address: str, logger: logging.Logger) -> None:
+        """Initialize the context."""
+        self.agent_address = agent_address
+        self.logger = logger
+        self.skill_id = SKILL_ID
+        self.default_ledger_id = LEDGER_ID
+        self.is_abstract_component = True
+        self.params: Optional[Params] = None
+        self.state: Optional[SharedState] = None
+        self.benchmark_tool: Optional[BenchmarkTool] = None
+
+
+class StandInIO(PollingBehaviour, ABC):  # pylint: disable=too-many-ancestors
+    """
+    Answer the requests of a behaviour with the stand-ins.
+
+    It sits right below the learning behaviours in the MRO, so that their own
+    overrides, e.g., the instrumentation of the requests, still run, and above
+    the polling of the responses, which it replaces.
+    """
+
+    stand_ins: StandIns
+
+    def get_http_response(
+        self,
+        method: str,
+        url: str,
+        content: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        parameters: Optional[Dict[str, str]] = None,
+    ) -> Generator[None, None, HttpMessage]:
+        """Answer an http request with the Coingecko stand-in."""
+        yield from ()
+        status_code, body = self.stand_ins.coingecko.request(method, url, headers)
+        return self._http_message(status_code, body)
+
+    @staticmethod
+    def _http_message(status_code: int, body: bytes) -> HttpMessage:
+        """Build the response to an http request."""
+        return HttpMessage(
+            performative=HttpMessage.Performative.RESPONSE,  # type: ignore
+            version="",
+            status_code=status_code,
+            status_text="",
+            headers="",
+            body=body,
+        )
+
+    def get_contract_api_response(
+        self,
+        performative: ContractApiMessage.Performative,
+        contract_address: Optional[str],
+        contract_id: str,
+        contract_callable: str,
+        ledger_id: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Generator[None, None, ContractApiMessage]:
+        """Answer a contract api request with the contract stand-in."""
+        yield from ()
+        body = self.stand_ins.contract_api.request(contract_callable, **kwargs)
+        return self._contract_api_message(
+            performative, ledger_id, contract_id, contract_callable, body
+        )
+
+    @staticmethod
+    def _contract_api_message(
+        performative: ContractApiMessage.Performative,
+        ledger_id: Optional[str],
+        contract_id: str,
+        contract_callable: str,
+        body: Optional[Dict[str, Any]],
+    ) -> ContractApiMessage:
+        """Build the response to a contract api request, an error if there is no body."""
+        ledger_id = ledger_id or LEDGER_ID
+        if body is None:
+            return ContractApiMessage(
+                performative=ContractApiMessage.Performative.ERROR,  # type: ignore
+                code=0,
+                message=f"Unknown callable {contract_callable} of {contract_id}.",
+                data=b"",
+            )
+        if performative == ContractApiMessage.Performative.GET_RAW_TRANSACTION:
+            return ContractApiMessage(
+                performative=ContractApiMessage.Performative.RAW_TRANSACTION,  # type: ignore
+                raw_transaction=ContractApiMessage.RawTransaction(ledger_id, body),
+            )
+        return ContractApiMessage(
+            performative=ContractApiMessage.Performative.STATE,  # type: ignore
+            state=ContractApiMessage.State(ledger_id, body),
+        )
+
+    def get_ledger_api_response(
+        self,
+        performative: LedgerApiMessage.Performative,
+        ledger_callable: str,
+        **kwargs: Any,
+    ) -> Generator[None, None, LedgerApiMessage]:
+        """Answer a ledger api request with the ledger stand-in, reporting the reverts as errors like the ledger connection."""
+        yield from ()
+        ledger = self.stand_ins.ledger
+        if ledger_callable == "get_block":
+            return LedgerApiMessage(
+                performative=LedgerApiMessage.Performative.STATE,  # type: ignore
+                ledger_id=LEDGER_ID,
+                state=LedgerApiMessage.State(LEDGER_ID, ledger.get_block()),
+            )
+        if ledger_callable == "fee_history":
+            body = ledger.fee_history(
+                kwargs["block_count"],
+                kwargs["newest_block"],
+                kwargs["reward_percentiles"],
+            )
+            return LedgerApiMessage(
+                performative=LedgerApiMessage.Performative.STATE,  # type: ignore
+                ledger_id=LEDGER_ID,
+                state=LedgerApiMessage.State(LEDGER_ID, body),
+            )
+        message = f"Unknown ledger callable {ledger_callable}."
+        if ledger_callable == "call":
+            message = ledger.call(kwargs["transaction"], kwargs["block_identifier"])
+        return LedgerApiMessage(
+            performative=LedgerApiMessage.Performative.ERROR,  # type: ignore
+            code=0,
+            message=message,
+        )
+
+    def _build_ipfs_message(  # type: ignore
+        self,
+        performative: IpfsMessage.Performative,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Tuple[IpfsMessage, None]:
+        """Build an IPFS message without a dialogue."""
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        return IpfsMessage(performative=performative, **kwargs), None
+
+    def _do_ipfs_request(  # type: ignore
+        self,
+        dialogue: None,
+        message: IpfsMessage,
+        timeout: Optional[float] = None,
+    ) -> Generator[None, None, IpfsMessage]:
+        """Answer an IPFS request with the IPFS stand-in."""
+        yield from ()
+        if message.performative == IpfsMessage.Performative.STORE_FILES:
+            ipfs_hash = self.stand_ins.ipfs.store(message.files)
+            return IpfsMessage(
+                performative=IpfsMessage.Performative.IPFS_HASH,  # type: ignore
+                ipfs_hash=ipfs_hash,
+            )
+        files = self.stand_ins.ipfs.get(message.ipfs_hash)
+        if files is None:
+            return IpfsMessage(
+                performative=IpfsMessage.Performative.ERROR,  # type: ignore
+                reason=f"{message.ipfs_hash} not found.",
+            )
+        return IpfsMessage(
+            performative=IpfsMessage.Performative.FILES,  # type: ignore
+            files=files,
+        )
+
+
+class OfflineIO(StandInIO, ABC):  # pylint: disable=too-many-ancestors
+    """Answer the requests with the stand-ins, and hand the payloads over to the driver."""
+
+    submitted: List[BaseTxPayload]
+
+    def send_a2a_transaction(
+        self, payload: BaseTxPayload, resetting: bool = False
+    ) -> Generator:
+        """Hand the payload over to the driver."""
+        yield from ()
+        round_count = self.synchronized_data.round_count
+        object.__setattr__(payload, "round_count", round_count)
+        self.submitted.append(payload)
+
+    def wait_until_round_end(
+        self, timeout: Optional[float] = None
+    ) -> Generator[None, None, None]:
+        """Return right away, the driver ends the round after the behaviour."""
+        yield from ()
+
+
+def offline_behaviours(
+    stand_ins: StandIns, submitted: List[BaseTxPayload]
+) -> Dict[str, Type[BaseBehaviour]]:
+    """Get the offline version of the learning behaviours, by the id of their round."""
+    behaviours: Dict[str, Type[BaseBehaviour]] = {}
+    for behaviour_cls in LEARNING_BEHAVIOURS:
+        offline_cls = type(
+            behaviour_cls.__name__,
+            (behaviour_cls, OfflineIO),
+            {
+                "behaviour_id": behaviour_cls.auto_behaviour_id(),
+                "stand_ins": stand_ins,
+                "submitted": submitted,
+            },
+        )
+        behaviours[behaviour_cls.matching_round.auto_round_id()] = offline_cls
+    return behaviours
+
+
+def load_params(
+    context: OfflineSkillContext,
+    participants: List[str],
+    overrides: Dict[str, Any],
+    params_cls: Type[Params] = Params,
+) -> Params:
+    """Load the params of the composed skill, for the given participants."""
+    with open(SKILL_YAML, "r", encoding="utf-8") as file:
+        args = yaml.safe_load(file)["models"]["params"]["args"]
+    args["setup"]["all_participants"] = participants
+    args.update(overrides)
+    return params_cls(name="params", skill_context=context, **args)
+
+
+class FSMBenchmark:
+    """Run periods of the LearningAbciApp for one agent, with its peers always agreeing."""
+
+    def __init__(self, config: BenchmarkConfig) -> None:
+        """Initialize the benchmark."""
+        self.config = config
+        self.participants = [f"0x{index + 1:040x}" for index in range(config.n_agents)]
+        logger = logging.getLogger("learning_benchmark")
+        logger.setLevel(config.log_level)
+
+        generator = None
+        if config.catalog_spec is not None:
+            generator = CatalogGenerator(config.catalog_spec)
+            catalog = generator.properties
+        else:
+            buy_index = config.buy_index
+            if buy_index is not None and buy_index < 0:
+                buy_index += config.catalog_size
+            catalog = make_catalog(
+                config.catalog_size, config.buy_price_range, buy_index, config.seed
+            )
+        self.stand_ins = StandIns(catalog, config.latencies, generator)
+        self.submitted: List[BaseTxPayload] = []
+        self.behaviours = offline_behaviours(self.stand_ins, self.submitted)
+
+        # pylint: disable-next=consider-using-with
+        self._log_dir = tempfile.TemporaryDirectory()
+        self.context = OfflineSkillContext(self.participants[0], logger)
+        context = cast(Any, self.context)
+        self.context.params = load_params(
+            context,
+            self.participants,
+            {"buy_price_range": list(config.buy_price_range), **config.params},
+        )
+        self.context.state = SharedState(name="state", skill_context=context)
+        self.context.benchmark_tool = BenchmarkTool(
+            name="benchmark_tool", skill_context=context, log_dir=self._log_dir.name
+        )
+        self.context.state.setup()
+        # there are no blocks to catch up with
+        self.context.state.round_sequence.end_sync()
+        self.abci_app.synchronized_data.db.update(participants=tuple(self.participants))
+
+    @property
+    def abci_app(self) -> AbciApp:
+        """Get the AbciApp of the agent."""
+        return cast(SharedState, self.context.state).round_sequence.abci_app
+
+    def run(self) -> BenchmarkResult:
+        """Run the configured number of periods."""
+        round_latencies: Dict[str, List[float]] = {}
+        start = perf_counter()
+        for _ in range(self.config.periods):
+            for round_id, latency in self.run_period():
+                round_latencies.setdefault(round_id, []).append(latency)
+        seconds = perf_counter() - start
+        cast(SharedState, self.context.state).teardown()
+        self._log_dir.cleanup()
+        return BenchmarkResult(
+            self.config.catalog_size, self.config.periods, seconds, round_latencies
+        )
+
+    def run_period(self) -> List[Tuple[str, float]]:
+        """Run the rounds of a period and start the next one."""
+        latencies = []
+        while type(self.abci_app.current_round) not in LearningAbciApp.final_states:
+            start = perf_counter()
+            round_id = self.run_round()
+            latencies.append((round_id, perf_counter() - start))
+        self.next_period()
+        return latencies
+
+    def run_round(self) -> str:
+        """Run the behaviour of the current round, then deliver the payloads and end the round."""
+        round_id = cast(str, self.abci_app.current_round_id)
+        behaviour_cls = self.behaviours[round_id]
+        behaviour = behaviour_cls(
+            name=behaviour_cls.auto_behaviour_id(), skill_context=self.context
+        )
+        for _ in behaviour.async_act_wrapper():
+            # the stand-ins answer right away, only the sleeps are left to spin on
+            continue
+        if not self.submitted:
+            raise RuntimeError(f"{behaviour.behaviour_id} did not send a payload.")
+        payload = self.submitted.pop()
+
+        for sender in self.participants:
+            peer_payload = type(payload)(sender=sender, **payload.data)  # type: ignore
+            object.__setattr__(peer_payload, "round_count", payload.round_count)
+            # what the ABCI handler receives from Tendermint
+            transaction = Transaction.decode(Transaction(peer_payload, "").encode())
+            self.abci_app.check_transaction(transaction)
+            self.abci_app.process_transaction(transaction)
+
+        result = self.abci_app.current_round.end_block()
+        if result is None:
+            raise RuntimeError(f"{round_id} did not reach consensus.")
+        synchronized_data, event = result
+        self.abci_app.process_event(event, result=synchronized_data)
+        return round_id
+
+    def next_period(self) -> None:
+        """Start a new period, as the reset and pause round of the composed app does."""
+        params = cast(Params, self.context.params)
+        db = self.abci_app.synchronized_data.db
+        db.create(
+            **{
+                key: db.get_strict(key)
+                for key in (
+                    "all_participants",
+                    "participants",
+                    "safe_contract_address",
+                    "consensus_threshold",
+                )
+            }
+        )
+        db.cleanup(params.cleanup_history_depth, params.cleanup_history_depth_current)
+        state = cast(SharedState, self.context.state)
+        state.round_sequence.setup(
+            LearningAbciApp.initial_round_cls.synchronized_data_class(db=db),
+            self.context.logger,
+        )
+        cast(BenchmarkTool, self.context.benchmark_tool).reset()
+
+
+def run_benchmark(config: BenchmarkConfig) -> BenchmarkResult:
+    """Run a benchmark."""
+    return FSMBenchmark(config).run()
+
+
+def find_regressions(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float,
+) -> List[Tuple[str, str, float, float]]:
+    """Get the (catalog size, figure, old, new) figures that got worse than `threshold` allows."""
+    regressions = []
+    for size, summary in results.items():
+        previous = baseline.get(size, None)
+        if previous is None:
+            continue
+        old, new = previous["periods_per_second"], summary["periods_per_second"]
+        if new < old * (1 - threshold):
+            regressions.append((size, "periods_per_second", old, new))
+        for round_id, figures in summary["rounds"].items():
+            old_figures = previous["rounds"].get(round_id, None)
+            if old_figures is None:
+                continue
+            old, new = old_figures["p95"], figures["p95"]
+            if old > 0 and new > old * (1 + threshold):
+                regressions.append((size, f"{round_id}.p95", old, new))
+    return regressions
@@ -0,0 +1,752 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+An in-process simulation of a service of N agents running the LearningChainedSkillAbciApp.
+
+Every agent has its own key, params, shared state and round behaviour, and
+runs all the behaviours of the composed skill, from the registration to the
+settlement and the reset. The payloads are really signed, broadcast, checked
+and delivered in blocks to the ABCI app of every agent, by a single stand-in
+for the Tendermint nodes. Coingecko, the contracts, the ledger and IPFS are
+answered by the stand-ins of `tests.benchmarks.stubs`, with their latencies
+simulated without blocking the other agents.
+
+Two things are not simulated: the randomness always comes from the latest
+block, as the drand beacons cannot be verified offline, and the Tendermint
+nodes are never hard reset.
+
+Example:
+
+    python -m tests.benchmarks.simulation --agents 1,4,16 --periods 5
+"""
+
+import hashlib
+import json
+import logging
+import tempfile
+from abc import ABC
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter, time
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    cast,
+)
+
+import click
+from aea_ledger_ethereum import EthereumCrypto
+
+from packages.valory.protocols.abci.custom_types import (
+    BlockID,
+    ConsensusVersion,
+    Evidences,
+    Header,
+    LastCommitInfo,
+    PartSetHeader,
+    Timestamp,
+)
+from packages.valory.protocols.contract_api import ContractApiMessage
+from packages.valory.protocols.http import HttpMessage
+from packages.valory.protocols.ipfs import IpfsMessage
+from packages.valory.protocols.ledger_api import LedgerApiMessage
+from packages.valory.skills.abstract_round_abci.base import (
+    LateArrivingTransaction,
+    RoundSequence,
+    SignatureNotValidError,
+    Transaction,
+    TransactionNotValidError,
+    TransactionTypeNotRecognizedError,
+)
+from packages.valory.skills.abstract_round_abci.behaviour_utils import (
+    RPCResponseStatus,
+)
+from packages.valory.skills.abstract_round_abci.behaviours import (
+    AbstractRoundBehaviour,
+    BaseBehaviour,
+)
+from packages.valory.skills.abstract_round_abci.handlers import exception_to_info_msg
+from packages.valory.skills.learning_abci.rounds import APICheckRound
+from packages.valory.skills.learning_chained_abci.behaviours import (
+    LearningChainedConsensusBehaviour,
+)
+from packages.valory.skills.learning_chained_abci.models import (
+    BenchmarkTool,
+    Params,
+    SharedState,
+)
+from packages.valory.skills.registration_abci.behaviours import (
+    RegistrationStartupBehaviour,
+)
+from tests.benchmarks.harness import (
+    BUY_PRICE_RANGE,
+    LEDGER_ID,
+    OfflineSkillContext,
+    StandInIO,
+    load_params,
+    percentile,
+)
+from tests.benchmarks.stubs import SAFE_CALLABLES, Latencies, StandIns, make_catalog
+
+
+CHAIN_ID = "learning-simulation"
+OK_CODE = 0
+CHECK_TX_FAILED = 1
+DELIVER_TX_FAILED = 2
+HTTP_OK = 200
+HTTP_INTERNAL_ERROR = 500
+# far beyond any simulated period, as the hard resets are not simulated
+NO_TENDERMINT_RESET = 1_000_000
+FIRST_ROUND_ID = APICheckRound.auto_round_id()
+
+
+@dataclass
+class SimulationConfig:  # pylint: disable=too-many-instance-attributes
+    """The configuration of a simulation run."""
+
+    n_agents: int
+    periods: int = 3
+    catalog_size: int = 100
+    latencies: Latencies = field(default_factory=Latencies)
+    # the minimum time between two blocks, i.e., Tendermint's `timeout_commit`
+    block_interval: float = 0.0
+    # the time after which a block is produced even without transactions
+    empty_block_interval: float = 1.0
+    # the factor of the pauses between the periods, which cannot be configured below 10s
+    pause_scale: float = 1.0
+    buy_price_range: Tuple[int, int] = BUY_PRICE_RANGE
+    # the position of the only buyable property; `None` makes every period end with a HOLD
+    buy_index: Optional[int] = -1
+    seed: int = 0
+    # overrides of the params of the skill
+    params: Dict[str, Any] = field(default_factory=dict)
+    # the wall time after which a run is considered stuck
+    timeout: float = 600.0
+    log_level: int = logging.ERROR
+
+
+@dataclass
+class PeriodStats:
+    """The measurements of a period, from an entry in the first round of the learning skill to the next."""
+
+    seconds: float
+    blocks: int
+    rounds: List[str]
+    # the payloads which had to be broadcast again
+    tx_retries: int
+    # the transactions which were delivered but rejected by the ABCI app, e.g., late ones
+    rejected_txs: int
+
+    @property
+    def round_retries(self) -> int:
+        """Get the number of rounds which were entered more than once."""
+        return len(self.rounds) - len(set(self.rounds))
+
+
+@dataclass
+class SimulationResult:
+    """The measurements of a simulation run."""
+
+    n_agents: int
+    periods: List[PeriodStats]
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the figures of the run."""
+        seconds = [period.seconds for period in self.periods]
+        return {
+            "n_agents": self.n_agents,
+            "periods": len(self.periods),
+            "period_seconds": {
+                "p50": round(percentile(seconds, 50), 6),
+                "p95": round(percentile(seconds, 95), 6),
+                "max": round(max(seconds, default=0.0), 6),
+            },
+            "blocks_per_period": round(
+                sum(period.blocks for period in self.periods)
+                / max(1, len(self.periods)),
+                3,
+            ),
+            "round_retries": sum(period.round_retries for period in self.periods),
+            "tx_retries": sum(period.tx_retries for period in self.periods),
+            "rejected_txs": sum(period.rejected_txs for period in self.periods),
+        }
+
+
+def make_header(height: int, timestamp: float) -> Header:
+    """Build the header of a block."""
+    seconds = int(timestamp)
+    nanos = int((timestamp - seconds) * 10**9)
+    return Header(
+        ConsensusVersion(0, 0),
+        CHAIN_ID,
+        height,
+        Timestamp(seconds, nanos),
+        BlockID(b"", PartSetHeader(0, b"")),
+        *(b"" for _ in range(9)),
+    )
+
+
+class TendermintStandIn:  # pylint: disable=too-many-instance-attributes
+    """
+    A block producer standing in for the Tendermint nodes of all the agents.
+
+    The transactions broadcast by any agent go to a shared mempool, which is
+    emptied into a block when one is due. Each block is delivered to the ABCI
+    app of every agent, with the same checks as the ABCI handler, and the
+    results of the transactions are kept per agent, as each agent only queries
+    its own node.
+    """
+
+    def __init__(
+        self,
+        round_sequences: Dict[str, RoundSequence],
+        block_interval: float = 0.0,
+        empty_block_interval: float = 1.0,
+    ) -> None:
+        """Initialize the stand-in."""
+        self.round_sequences = round_sequences
+        self.block_interval = block_interval
+        self.empty_block_interval = empty_block_interval
+        self.height = 0
+        self.mempool: List[Tuple[str, bytes]] = []
+        self.results: Dict[str, Dict[str, Tuple[int, str, int]]] = {
+            address: {} for address in round_sequences
+        }
+        self.retries = 0
+        self.rejected = 0
+        self._broadcast: Set[Tuple[str, int]] = set()
+        self._last_block = perf_counter()
+
+    def broadcast_tx_sync(
+        self, address: str, tx_bytes: bytes
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Check a transaction on the node of an agent, and add it to the mempool."""
+        tx_hash = hashlib.sha256(tx_bytes).hexdigest().upper()
+        try:
+            transaction = Transaction.decode(tx_bytes)
+            transaction.verify(LEDGER_ID)
+            self.round_sequences[address].check_is_finished()
+        except (
+            SignatureNotValidError,
+            TransactionNotValidError,
+            TransactionTypeNotRecognizedError,
+        ) as exception:
+            log = exception_to_info_msg(exception)
+            return HTTP_OK, {
+                "result": {"code": CHECK_TX_FAILED, "hash": tx_hash, "log": log}
+            }
+
+        payload = transaction.payload
+        key = (payload.sender, cast(int, payload.round_count))
+        if key in self._broadcast:
+            self.retries += 1
+        self._broadcast.add(key)
+        self.mempool.append((tx_hash, tx_bytes))
+        return HTTP_OK, {"result": {"code": OK_CODE, "hash": tx_hash, "log": ""}}
+
+    def tx(self, address: str, tx_hash: str) -> Tuple[int, Dict[str, Any]]:
+        """Get the result of a transaction from the node of an agent."""
+        result = self.results[address].get(tx_hash, None)
+        if result is None:
+            return HTTP_INTERNAL_ERROR, {
+                "error": {
+                    "code": -32603,
+                    "message": "Internal error",
+                    "data": f"tx ({tx_hash}) not found",
+                }
+            }
+        code, info, height = result
+        return HTTP_OK, {
+            "result": {
+                "hash": tx_hash,
+                "height": str(height),
+                "tx_result": {"code": code, "info": info},
+            }
+        }
+
+    def status(self) -> Dict[str, Any]:
+        """Get the status of the nodes."""
+        return {"result": {"sync_info": {"latest_block_height": str(self.height)}}}
+
+    def tick(self) -> bool:
+        """Produce a block if one is due, and tell whether it did."""
+        elapsed = perf_counter() - self._last_block
+        if elapsed < self.block_interval:
+            return False
+        if not self.mempool and elapsed < self.empty_block_interval:
+            return False
+        self.produce_block()
+        return True
+
+    def produce_block(self) -> None:
+        """Deliver the transactions of the mempool in a new block to every agent."""
+        self.height += 1
+        self._last_block = perf_counter()
+        transactions, self.mempool = self.mempool, []
+        header = make_header(self.height, time())
+        for index, (address, round_sequence) in enumerate(self.round_sequences.items()):
+            results = self.results[address]
+            round_sequence.begin_block(header, Evidences([]), LastCommitInfo(0, []))
+            for tx_hash, tx_bytes in transactions:
+                code, info = self._deliver_tx(round_sequence, tx_bytes)
+                results[tx_hash] = (code, info, self.height)
+                if index == 0 and code != OK_CODE:
+                    self.rejected += 1
+            round_sequence.tm_height = self.height
+            round_sequence.end_block()
+            round_sequence.commit()
+
+    @staticmethod
+    def _deliver_tx(round_sequence: RoundSequence, tx_bytes: bytes) -> Tuple[int, str]:
+        """Deliver a transaction to the ABCI app of an agent, as the ABCI handler does."""
+        try:
+            transaction = Transaction.decode(tx_bytes)
+            transaction.verify(LEDGER_ID)
+            round_sequence.check_is_finished()
+            round_sequence.deliver_tx(transaction)
+        except (
+            SignatureNotValidError,
+            TransactionNotValidError,
+            TransactionTypeNotRecognizedError,
+            LateArrivingTransaction,
+        ) as exception:
+            return DELIVER_TX_FAILED, exception_to_info_msg(exception)
+        return OK_CODE, ""
+
+
+class ChainRandomnessApi:
+    """Always fall back to the randomness of the latest block, as the drand beacons cannot be verified offline."""
+
+    api_id = "latest_block"
+
+    @staticmethod
+    def is_retries_exceeded() -> bool:
+        """Skip the randomness API."""
+        return True
+
+    def reset_retries(self) -> None:
+        """Nothing to reset."""
+
+
+class SimulatedSkillContext(OfflineSkillContext):
+    """The context of a simulated agent, which signs with its own key."""
+
+    def __init__(self, signer: EthereumCrypto, logger: logging.Logger) -> None:
+        """Initialize the context."""
+        super().__init__(signer.address, logger)
+        self.signer = signer
+        self.randomness_api = ChainRandomnessApi()
+
+
+class SimulatedIO(StandInIO, ABC):  # pylint: disable=too-many-ancestors
+    """Answer the requests of a behaviour with the stand-ins, including the ledger and Tendermint ones."""
+
+    tendermint: TendermintStandIn
+    latencies: Latencies
+    pause_scale: float
+
+    def _latency(self, seconds: float) -> Generator[None, None, None]:
+        """Wait for the latency of a service, letting the other agents act."""
+        if seconds > 0:
+            yield from self.sleep(seconds)
+
+    def wait_from_last_timestamp(self, seconds: float) -> Any:
+        """Wait for the scaled pause from the timestamp of the last block."""
+        yield from super().wait_from_last_timestamp(seconds * self.pause_scale)
+
+    def get_http_response(
+        self,
+        method: str,
+        url: str,
+        content: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        parameters: Optional[Dict[str, str]] = None,
+    ) -> Generator[None, None, HttpMessage]:
+        """Answer an http request with the Coingecko stand-in, after its latency."""
+        yield from self._latency(self.latencies.http)
+        response = yield from super().get_http_response(
+            method, url, content, headers, parameters
+        )
+        return response
+
+    def get_contract_api_response(
+        self,
+        performative: ContractApiMessage.Performative,
+        contract_address: Optional[str],
+        contract_id: str,
+        contract_callable: str,
+        ledger_id: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Generator[None, None, ContractApiMessage]:
+        """Answer a contract api request with the Safe or the contract stand-in, after its latency."""
+        yield from self._latency(self.latencies.contract_api)
+        if contract_callable not in SAFE_CALLABLES:
+            response = yield from super().get_contract_api_response(
+                performative,
+                contract_address,
+                contract_id,
+                contract_callable,
+                ledger_id,
+                **kwargs,
+            )
+            return response
+        body = self.stand_ins.ledger.request(contract_callable, **kwargs)
+        return self._contract_api_message(
+            performative, ledger_id, contract_id, contract_callable, body
+        )
+
+    def _do_ipfs_request(  # type: ignore
+        self,
+        dialogue: None,
+        message: IpfsMessage,
+        timeout: Optional[float] = None,
+    ) -> Generator[None, None, IpfsMessage]:
+        """Answer an IPFS request with the IPFS stand-in, after its latency."""
+        yield from self._latency(self.latencies.ipfs)
+        response = yield from super()._do_ipfs_request(dialogue, message, timeout)
+        return response
+
+    def get_signature(
+        self, message: bytes, is_deprecated_mode: bool = False
+    ) -> Generator[None, None, str]:
+        """Sign a message with the key of the agent."""
+        yield from ()
+        signer = cast(SimulatedSkillContext, self.context).signer
+        return signer.sign_message(message, is_deprecated_mode)
+
+    def send_raw_transaction(  # pylint: disable=too-many-arguments
+        self,
+        transaction: Any,
+        use_flashbots: bool = False,
+        target_block_numbers: Optional[List[int]] = None,
+        raise_on_failed_simulation: bool = False,
+        chain_id: Optional[str] = None,
+    ) -> Generator[None, None, Tuple[Optional[str], RPCResponseStatus]]:
+        """Send a transaction to the ledger stand-in, after its latency."""
+        yield from self._latency(self.latencies.contract_api)
+        tx_hash = self.stand_ins.ledger.send(transaction.body, chain_id)
+        return tx_hash, RPCResponseStatus.SUCCESS
+
+    def get_transaction_receipt(
+        self,
+        tx_digest: str,
+        retry_timeout: Optional[int] = None,
+        retry_attempts: Optional[int] = None,
+        chain_id: Optional[str] = None,
+    ) -> Generator[None, None, Optional[Dict]]:
+        """Get a receipt from the ledger stand-in, after its latency."""
+        yield from self._latency(self.latencies.contract_api)
+        return self.stand_ins.ledger.receipt(tx_digest)
+
+    def get_ledger_api_response(
+        self,
+        performative: LedgerApiMessage.Performative,
+        ledger_callable: str,
+        **kwargs: Any,
+    ) -> Generator[None, None, LedgerApiMessage]:
+        """Answer a ledger api request with the ledger stand-in, after its latency."""
+        yield from self._latency(self.latencies.contract_api)
+        response = yield from super().get_ledger_api_response(
+            performative, ledger_callable, **kwargs
+        )
+        return response
+
+    def _submit_tx(
+        self, tx_bytes: bytes, timeout: Optional[float] = None
+    ) -> Generator[None, None, HttpMessage]:
+        """Broadcast a transaction to the Tendermint stand-in."""
+        yield from ()
+        status_code, body = self.tendermint.broadcast_tx_sync(
+            self.context.agent_address, tx_bytes
+        )
+        return self._http_message(status_code, json.dumps(body).encode())
+
+    def _get_tx_info(
+        self, tx_hash: str, timeout: Optional[float] = None
+    ) -> Generator[None, None, HttpMessage]:
+        """Get the result of a transaction from the Tendermint stand-in."""
+        yield from ()
+        status_code, body = self.tendermint.tx(self.context.agent_address, tx_hash)
+        return self._http_message(status_code, json.dumps(body).encode())
+
+    def _get_status(self) -> Generator[None, None, HttpMessage]:
+        """Get the status of the Tendermint stand-in."""
+        yield from ()
+        return self._http_message(
+            HTTP_OK, json.dumps(self.tendermint.status()).encode()
+        )
+
+
+def simulated_round_behaviour(
+    stand_ins: StandIns,
+    tendermint: TendermintStandIn,
+    latencies: Latencies,
+    pause_scale: float = 1.0,
+) -> Type[AbstractRoundBehaviour]:
+    """Get the round behaviour of the composed skill, with all its behaviours talking to the stand-ins."""
+    attributes = {
+        "stand_ins": stand_ins,
+        "tendermint": tendermint,
+        "latencies": latencies,
+        "pause_scale": pause_scale,
+    }
+    behaviours: Dict[Type[BaseBehaviour], Type[BaseBehaviour]] = {}
+    for behaviour_cls in LearningChainedConsensusBehaviour.behaviours:
+        behaviours[behaviour_cls] = type(
+            behaviour_cls.__name__,
+            (behaviour_cls, SimulatedIO),
+            {"behaviour_id": behaviour_cls.auto_behaviour_id(), **attributes},
+        )
+    return type(
+        "SimulatedConsensusBehaviour",
+        (LearningChainedConsensusBehaviour,),
+        {
+            "behaviours": set(behaviours.values()),
+            "initial_behaviour_cls": behaviours[RegistrationStartupBehaviour],
+        },
+    )
+
+
+def make_signers(n_agents: int, seed: int, directory: Path) -> List[EthereumCrypto]:
+    """Get deterministic keys for the agents."""
+    signers = []
+    for index in range(n_agents):
+        key_path = directory / f"ethereum_private_key_{index}.txt"
+        key = hashlib.sha256(f"learning-simulation-{seed}-{index}".encode())
+        key_path.write_text("0x" + key.hexdigest(), encoding="utf-8")
+        signers.append(EthereumCrypto(private_key_path=str(key_path)))
+    return signers
+
+
+class Simulation:
+    """Run the periods of a service of N agents in process."""
+
+    def __init__(self, config: SimulationConfig) -> None:
+        """Initialize the simulation."""
+        self.config = config
+        logger = logging.getLogger("learning_simulation")
+        logger.setLevel(config.log_level)
+
+        buy_index = config.buy_index
+        if buy_index is not None and buy_index < 0:
+            buy_index += config.catalog_size
+        catalog = make_catalog(
+            config.catalog_size, config.buy_price_range, buy_index, config.seed
+        )
+        # the latencies are simulated by the behaviours, without blocking
+        self.stand_ins = StandIns(catalog, Latencies())
+
+        # pylint: disable-next=consider-using-with
+        self._directory = tempfile.TemporaryDirectory()
+        directory = Path(self._directory.name)
+        signers = make_signers(config.n_agents, config.seed, directory)
+        participants = [signer.address for signer in signers]
+        overrides = {
+            "buy_price_range": list(config.buy_price_range),
+            "reset_tendermint_after": NO_TENDERMINT_RESET,
+            **config.params,
+        }
+
+        self.states: List[SharedState] = []
+        for signer in signers:
+            context = SimulatedSkillContext(signer, logger)
+            skill_context = cast(Any, context)
+            context.params = load_params(skill_context, participants, overrides, Params)
+            context.state = SharedState(name="state", skill_context=skill_context)
+            context.benchmark_tool = BenchmarkTool(
+                name="benchmark_tool",
+                skill_context=skill_context,
+                log_dir=str(directory / "logs"),
+            )
+            context.state.setup()
+            self.states.append(context.state)
+
+        self.tendermint = TendermintStandIn(
+            {
+                participant: state.round_sequence
+                for participant, state in zip(participants, self.states)
+            },
+            config.block_interval,
+            config.empty_block_interval,
+        )
+        round_behaviour_cls = simulated_round_behaviour(
+            self.stand_ins, self.tendermint, config.latencies, config.pause_scale
+        )
+        self.round_behaviours = []
+        for state in self.states:
+            round_behaviour = round_behaviour_cls(
+                name="main", skill_context=state.context
+            )
+            round_behaviour.setup()
+            self.round_behaviours.append(round_behaviour)
+
+    def _mark(self) -> Tuple[float, int, int, int]:
+        """Get the time and the counters at the start of a period."""
+        tendermint = self.tendermint
+        return (
+            perf_counter(),
+            tendermint.height,
+            tendermint.retries,
+            tendermint.rejected,
+        )
+
+    def _period(
+        self, mark: Tuple[float, int, int, int], rounds: List[str]
+    ) -> PeriodStats:
+        """Get the measurements of a period which started at `mark`."""
+        start, height, retries, rejected = mark
+        tendermint = self.tendermint
+        return PeriodStats(
+            seconds=perf_counter() - start,
+            blocks=tendermint.height - height,
+            rounds=rounds,
+            tx_retries=tendermint.retries - retries,
+            rejected_txs=tendermint.rejected - rejected,
+        )
+
+    def run(self) -> SimulationResult:
+        """Run the configured number of periods."""
+        deadline = perf_counter() + self.config.timeout
+        # the first agent's view, which all the others share
+        round_sequence = self.states[0].round_sequence
+        round_height = -1
+        mark: Optional[Tuple[float, int, int, int]] = None
+        rounds: List[str] = []
+        periods: List[PeriodStats] = []
+        try:
+            while len(periods) < self.config.periods:
+                for round_behaviour in self.round_behaviours:
+                    round_behaviour.act()
+                if not self.tendermint.tick():
+                    if perf_counter() > deadline:
+                        raise RuntimeError(
+                            f"The simulation is stuck in {round_sequence.current_round_id}."
+                        )
+                    continue
+                if round_sequence.current_round_height == round_height:
+                    continue
+                round_height = round_sequence.current_round_height
+                round_id = cast(str, round_sequence.current_round_id)
+                if round_id == FIRST_ROUND_ID:
+                    if mark is not None:
+                        periods.append(self._period(mark, rounds))
+                    mark, rounds = self._mark(), []
+                rounds.append(round_id)
+        finally:
+            for state in self.states:
+                state.teardown()
+            self._directory.cleanup()
+        return SimulationResult(self.config.n_agents, periods)
+
+
+def run_simulation(config: SimulationConfig) -> SimulationResult:
+    """Run a simulation."""
+    return Simulation(config).run()
+
+
+@click.command()
+@click.option("--agents", default="1,2,4,8,16", show_default=True)
+@click.option("--periods", type=int, default=3, show_default=True)
+@click.option("--catalog-size", type=int, default=100, show_default=True)
+@click.option(
+    "--block-interval",
+    type=float,
+    default=0.0,
+    show_default=True,
+    help="The minimum time between two blocks, i.e., Tendermint's timeout_commit.",
+)
+@click.option(
+    "--empty-block-interval",
+    type=float,
+    default=1.0,
+    show_default=True,
+    help="The time after which a block is produced even without transactions.",
+)
+@click.option("--http-latency", type=float, default=0.0, show_default=True)
+@click.option("--contract-latency", type=float, default=0.0, show_default=True)
+@click.option("--ipfs-latency", type=float, default=0.0, show_default=True)
+@click.option(
+    "--pause-scale",
+    type=float,
+    default=1.0,
+    show_default=True,
+    help="The factor of the pauses between the periods.",
+)
+@click.option(
+    "--hold",
+    is_flag=True,
+    help="No property is buyable, so the periods skip the settlement.",
+)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--json", "as_json", is_flag=True, help="Print the figures as JSON.")
+def main(  # pylint: disable=too-many-arguments
+    agents: str,
+    periods: int,
+    catalog_size: int,
+    block_interval: float,
+    empty_block_interval: float,
+    http_latency: float,
+    contract_latency: float,
+    ipfs_latency: float,
+    pause_scale: float,
+    hold: bool,
+    seed: int,
+    as_json: bool,
+) -> None:
+    """Simulate services of each of the given numbers of AGENTS."""
+    summaries = []
+    for n_agents in agents.split(","):
+        result = run_simulation(
+            SimulationConfig(
+                n_agents=int(n_agents),
+                periods=periods,
+                catalog_size=catalog_size,
+                latencies=Latencies(http_latency, contract_latency, ipfs_latency),
+                block_interval=block_interval,
+                empty_block_interval=empty_block_interval,
+                pause_scale=pause_scale,
+                buy_index=None if hold else -1,
+                seed=seed,
+            )
+        )
+        summary = result.summary()
+        summaries.append(summary)
+        if as_json:
+            continue
+        seconds = summary["period_seconds"]
+        click.echo(
+            f"agents={summary['n_agents']:>3} "
+            f"period p50={seconds['p50']:>8.3f}s p95={seconds['p95']:>8.3f}s "
+            f"max={seconds['max']:>8.3f}s blocks/period={summary['blocks_per_period']:>7.1f} "
+            f"round retries={summary['round_retries']} tx retries={summary['tx_retries']} "
+            f"rejected txs={summary['rejected_txs']}"
+        )
+    if as_json:
+        click.echo(json.dumps(summaries, indent=2))
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
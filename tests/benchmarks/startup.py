@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""
+Measure the cold import time of the skills, in fresh interpreters.
+
+Each run imports a module in a new process with `-X importtime`, and reports
+the median, min and max of its cumulative import time, the packages which
+took the longest to import, and the contract packages which were loaded.
+
+Example:
+
+    python -m tests.benchmarks.startup --runs 10
+    python -m tests.benchmarks.startup --module packages.valory.skills.learning_abci.behaviours
+"""
+
+import json
+import statistics
+import subprocess  # nosec
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import click
+
+
+ROOT = Path(__file__).parents[2]
+DEFAULT_MODULES = (
+    "packages.valory.skills.learning_abci.behaviours",
+    "packages.valory.skills.learning_chained_abci.behaviours",
+)
+CONTRACTS_PACKAGE = "packages.valory.contracts."
+SCRIPT = "import json, sys; import {module}; print(json.dumps(sorted(sys.modules)))"
+
+
+@dataclass
+class StartupResult:
+    """The import times of a module, over several runs."""
+
+    module: str
+    # the cumulative import time of the module in each run, in seconds
+    seconds: List[float]
+    # the self import time of the top level packages in the last run, in seconds
+    packages: Dict[str, float]
+    contracts: List[str]
+
+    def summary(self, top: int = 10) -> Dict:
+        """Get the figures of the runs."""
+        slowest = sorted(self.packages.items(), key=lambda item: -item[1])[:top]
+        return {
+            "module": self.module,
+            "median": round(statistics.median(self.seconds), 6),
+            "min": round(min(self.seconds), 6),
+            "max": round(max(self.seconds), 6),
+            "slowest_packages": {name: round(value, 6) for name, value in slowest},
+            "contracts": self.contracts,
+        }
+
+
+def parse_importtime(output: str, module: str) -> Tuple[float, Dict[str, float]]:
+    """Get the cumulative import time of `module`, and the self time per top level package, from `-X importtime`."""
+    cumulative = 0.0
+    packages: Dict[str, float] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            # the header
+            continue
+        name = name.strip()
+        top_level = name.split(".")[0]
+        packages[top_level] = packages.get(top_level, 0.0) + int(self_us) / 1e6
+        if name == module:
+            cumulative = int(cumulative_us) / 1e6
+    return cumulative, packages
+
+
+def measure(module: str, runs: int) -> StartupResult:
+    """Import a module in `runs` fresh interpreters."""
+    seconds = []
+    packages: Dict[str, float] = {}
+    modules: List[str] = []
+    for _ in range(runs):
+        process = subprocess.run(  # nosec
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                SCRIPT.format(module=module),
+            ],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        cumulative, packages = parse_importtime(process.stderr, module)
+        seconds.append(cumulative)
+        modules = json.loads(process.stdout.splitlines()[-1])
+    contracts = sorted(
+        {
+            name[len(CONTRACTS_PACKAGE) :].split(".")[0]
+            for name in modules
+            if name.startswith(CONTRACTS_PACKAGE)
+        }
+    )
+    return StartupResult(module, seconds, packages, contracts)
+
+
+@click.command()
+@click.option(
+    "--module",
+    "modules",
+    multiple=True,
+    default=DEFAULT_MODULES,
+    show_default=True,
+)
+@click.option("--runs", type=int, default=5, show_default=True)
+@click.option("--top", type=int, default=10, show_default=True)
+@click.option("--json", "as_json", is_flag=True, help="Print the figures as JSON.")
+def main(modules: Tuple[str, ...], runs: int, top: int, as_json: bool) -> None:
+    """Measure the cold import time of the MODULES."""
+    summaries = [measure(module, runs).summary(top) for module in modules]
+    if as_json:
+        click.echo(json.dumps(summaries, indent=2))
+        return
+    for summary in summaries:
+        click.echo(
+            f"{summary['module']}: median={summary['median'] * 1000:.1f}ms "
+            f"min={summary['min'] * 1000:.1f}ms max={summary['max'] * 1000:.1f}ms"
+        )
+        click.echo(f"    contracts loaded: {', '.join(summary['contracts']) or '-'}")
+        for name, seconds in summary["slowest_packages"].items():
+            click.echo(f"    {name:<32} {seconds * 1000:>9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Local stand-ins for Coingecko, the contract_api responses, the ledger and IPFS."""
+
+import hashlib
+import json
+import random
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from packages.valory.skills.learning_abci.preflight import (
+    SIMULATE_AND_REVERT_SELECTOR,
+    WORD_SIZE,
+)
+from tests.benchmarks.catalog import CatalogGenerator, Property
+
+
+HTTP_OK = 200
+HTTP_NOT_FOUND = 404
+HTTP_TOO_MANY_REQUESTS = 429
+HTTP_UNAVAILABLE = 503
+TOKEN_PRICE = 1.23
+SAFE_TX_GAS = 500_000
+GAS_PRICE = 2_000_000_000
+BASE_FEE = 1_000_000_000
+PRIORITY_FEE = 100_000_000
+SAFE_BALANCE = 10**21
+SAFE_CALLABLES = ("get_raw_safe_transaction", "verify_tx", "get_safe_nonce")
+
+
+class Latencies(NamedTuple):
+    """The simulated latency of each external service, in seconds."""
+
+    http: float = 0.0
+    contract_api: float = 0.0
+    ipfs: float = 0.0
+
+
+def _wait(seconds: float) -> None:
+    """Simulate the latency of a service."""
+    if seconds > 0:
+        time.sleep(seconds)
+
+
+def make_catalog(
+    size: int, buy_price_range: Tuple[int, int], buy_index: Optional[int], seed: int = 0
+) -> List[Property]:
+    """
+    Build a catalog of properties for sale.
+
+    All the values are outside `buy_price_range`, except for the property at
+    `buy_index`, so that the position of the first buyable property, if any,
+    is under control of the caller.
+    """
+    low, high = buy_price_range
+    rng = random.Random(seed)
+    catalog = []
+    for index in range(size):
+        if index == buy_index:
+            value = (low + high) // 2
+        else:
+            value = rng.choice(
+                (rng.randint(1, max(1, low)), rng.randint(high, 2 * high))
+            )
+        owner = f"0x{rng.getrandbits(160):040x}"
+        catalog.append([index, f"Property {index}", owner, value, True])
+    return catalog
+
+
+class CoingeckoStub:
+    """Stand-in for the Coingecko price API."""
+
+    def __init__(self, latency: float = 0.0, price: float = TOKEN_PRICE) -> None:
+        """Initialize the stand-in."""
+        self.latency = latency
+        self.price = price
+        self.calls = 0
+        # the prefixes of the URLs which are down
+        self.unavailable: Set[str] = set()
+        # the number of the next requests to answer with a 429
+        self.throttled = 0
+        # the URL and the headers of each request
+        self.requests: List[Tuple[str, Dict[str, str]]] = []
+
+    def request(
+        self, method: str, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, bytes]:
+        """Get the status code and the body of a response."""
+        self.calls += 1
+        self.requests.append((url, dict(headers or {})))
+        _wait(self.latency)
+        if any(url.startswith(prefix) for prefix in self.unavailable):
+            return HTTP_UNAVAILABLE, b"Service Unavailable"
+        if self.throttled > 0:
+            self.throttled -= 1
+            return HTTP_TOO_MANY_REQUESTS, b"Too Many Requests"
+        if method != "GET" or "simple/price" not in url:
+            return HTTP_NOT_FOUND, b"{}"
+        return HTTP_OK, json.dumps({"autonolas": {"usd": self.price}}).encode()
+
+
+class ContractApiStub:
+    """
+    Stand-in for the ledger connection's contract dispatcher.
+
+    With a catalog generator, every `get_properties_for_sale` call moves the
+    catalog one block forward. Otherwise, a property bought is sold, and a new
+    one of the same value is listed, so that every period has one to buy.
+    """
+
+    def __init__(
+        self,
+        catalog: List[Property],
+        latency: float = 0.0,
+        generator: Optional[CatalogGenerator] = None,
+    ) -> None:
+        """Initialize the stand-in."""
+        self.catalog = catalog
+        self.latency = latency
+        self.generator = generator
+        self.calls: Dict[str, int] = {}
+        # the ids of the properties bought, and whether the purchases go through
+        self.purchases: List[Any] = []
+        self.selling = True
+        # the property bought by each MultiSend transaction, by its data
+        self.multisends: Dict[str, Any] = {}
+        # the token balance of the Safe
+        self.balance = SAFE_BALANCE
+
+    def request(
+        self, contract_callable: str, **kwargs: Any
+    ) -> Optional[Dict[str, Any]]:
+        """Get the body of a response, or `None` if the callable is unknown."""
+        self.calls[contract_callable] = self.calls.get(contract_callable, 0) + 1
+        _wait(self.latency)
+        digest = hashlib.sha256(
+            json.dumps(
+                [contract_callable, kwargs], sort_keys=True, default=str
+            ).encode()
+        ).hexdigest()
+        if contract_callable == "get_properties_for_sale":
+            if self.generator is not None:
+                self.generator.step()
+                return self.generator.response()
+            return {"data": self.catalog}
+        if contract_callable == "get_buy_property_tx":
+            self.purchases.append(kwargs.get("id", None))
+            if self.selling and self.generator is None:
+                self.sell(kwargs.get("id", None))
+        if contract_callable in ("build_approval_tx", "get_buy_property_tx"):
+            # a selector followed by two words of arguments
+            return {"data": "0x" + digest[:8] + digest * 2}
+        if contract_callable == "check_balance":
+            return {"token": self.balance, "wallet": 0}
+        if contract_callable == "get_raw_safe_transaction_hash":
+            return {"tx_hash": "0x" + digest}
+        if contract_callable == "get_tx_data":
+            data = "0x8d80ff0a" + digest * 8
+            self.multisends[data] = self.purchases[-1] if self.purchases else None
+            return {"data": data}
+        return None
+
+    def sell(self, property_id: Any) -> None:
+        """Sell a property for sale, and list a new one of the same value."""
+        for row in self.catalog:
+            if row[0] == property_id and row[4]:
+                row[4] = False
+                self.catalog.append(
+                    [
+                        len(self.catalog),
+                        f"Property {len(self.catalog)}",
+                        *row[2:4],
+                        True,
+                    ]
+                )
+                return
+
+
+class IpfsStub:
+    """Stand-in for an IPFS node, keeping the files in memory."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        """Initialize the stand-in."""
+        self.latency = latency
+        self.files: Dict[str, Dict[str, str]] = {}
+
+    def store(self, files: Dict[str, str]) -> str:
+        """Store some files and get their hash."""
+        _wait(self.latency)
+        hasher = hashlib.sha256()
+        for name, content in sorted(files.items()):
+            hasher.update(name.encode())
+            hasher.update(content.encode())
+        ipfs_hash = "bafybei" + hasher.hexdigest()[:52]
+        self.files[ipfs_hash] = dict(files)
+        return ipfs_hash
+
+    def get(self, ipfs_hash: str) -> Optional[Dict[str, str]]:
+        """Get the files stored under a hash."""
+        _wait(self.latency)
+        return self.files.get(ipfs_hash, None)
+
+
+class LedgerStub:
+    """
+    Stand-in for the ledger connection and the Safe contract.
+
+    The Safe transactions are mined as soon as they are sent, and each one
+    moves the chain one block forward. The `eth_call`s of `simulateAndRevert`
+    execute the MultiSend transactions of the contract stand-in, which revert
+    for the properties in `reverting`.
+    """
+
+    def __init__(
+        self, latency: float = 0.0, contract_api: Optional[ContractApiStub] = None
+    ) -> None:
+        """Initialize the stand-in."""
+        self.latency = latency
+        self.contract_api = contract_api
+        self.reverting: Set[Any] = set()
+        self.block = 0
+        self.nonce = 0
+        self.transactions: Dict[str, Dict[str, Any]] = {}
+        # the chain each transaction was sent to
+        self.chain_ids: Dict[str, Optional[str]] = {}
+        self.calls: Dict[str, int] = {}
+
+    def _count(self, name: str) -> None:
+        """Count a call and simulate its latency."""
+        self.calls[name] = self.calls.get(name, 0) + 1
+        _wait(self.latency)
+
+    def get_block(self) -> Dict[str, Any]:
+        """Get the latest block."""
+        self._count("get_block")
+        block_hash = hashlib.sha256(str(self.block).encode()).hexdigest()
+        return {"number": self.block, "hash": "0x" + block_hash}
+
+    def fee_history(
+        self, block_count: int, newest_block: Any, reward_percentiles: List[float]
+    ) -> Dict[str, Any]:
+        """Get the fee history of the last blocks, whose base fee rises with the block number."""
+        self._count("fee_history")
+        oldest = max(0, self.block - block_count + 1)
+        return {
+            "oldestBlock": oldest,
+            "baseFeePerGas": [
+                BASE_FEE + block * BASE_FEE // 8
+                for block in range(oldest, self.block + 2)
+            ],
+            "gasUsedRatio": [1.0] * (self.block + 1 - oldest),
+            "reward": [[PRIORITY_FEE] * len(reward_percentiles)]
+            * (self.block + 1 - oldest),
+        }
+
+    def call(
+        self, transaction: Dict[str, Any], block_identifier: Any = "latest"
+    ) -> str:
+        """Execute an `eth_call`, all of which revert here, and get its revert data."""
+        self._count("call")
+        if block_identifier != "latest" and block_identifier > self.block:
+            return f"Unknown block {block_identifier}."
+        calldata = transaction.get("data", "")
+        if not calldata.startswith("0x" + SIMULATE_AND_REVERT_SELECTOR):
+            return "execution reverted"
+        # the data of the delegate call follows the target, its offset and its size
+        words = calldata[2 + len(SIMULATE_AND_REVERT_SELECTOR) :]
+        size = int(words[4 * WORD_SIZE : 6 * WORD_SIZE], 16)
+        data = "0x" + words[6 * WORD_SIZE : 6 * WORD_SIZE + 2 * size]
+        multisends = {} if self.contract_api is None else self.contract_api.multisends
+        success = multisends.get(data, None) not in self.reverting
+        return f"0x{int(success):064x}{0:064x}"
+
+    def request(
+        self, contract_callable: str, **kwargs: Any
+    ) -> Optional[Dict[str, Any]]:
+        """Get the body of a Safe contract response, or `None` if the callable is unknown."""
+        self._count(contract_callable)
+        if contract_callable == "get_raw_safe_transaction":
+            return {
+                "to": kwargs.get("to_address", None),
+                "nonce": self.nonce,
+                "gas": SAFE_TX_GAS,
+                "maxFeePerGas": kwargs.get("max_fee_per_gas", None) or GAS_PRICE,
+                "maxPriorityFeePerGas": kwargs.get("max_priority_fee_per_gas", None)
+                or GAS_PRICE // 10,
+            }
+        if contract_callable == "verify_tx":
+            return {"verified": kwargs.get("tx_hash", None) in self.transactions}
+        if contract_callable == "get_safe_nonce":
+            return {"safe_nonce": self.nonce}
+        return None
+
+    def send(self, transaction: Dict[str, Any], chain_id: Optional[str] = None) -> str:
+        """Mine a transaction and get its hash."""
+        self._count("send_signed_transaction")
+        tx_hash = hashlib.sha256(
+            json.dumps(transaction, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        self.transactions["0x" + tx_hash] = transaction
+        self.chain_ids["0x" + tx_hash] = chain_id
+        self.block += 1
+        self.nonce += 1
+        return "0x" + tx_hash
+
+    def receipt(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        """Get the receipt of a mined transaction."""
+        self._count("get_transaction_receipt")
+        if tx_hash not in self.transactions:
+            return None
+        return {"transactionHash": tx_hash, "status": 1}
+
+
+class StandIns:
+    """The stand-ins of all the services an agent talks to."""
+
+    def __init__(
+        self,
+        catalog: List[Property],
+        latencies: Latencies,
+        generator: Optional[CatalogGenerator] = None,
+    ) -> None:
+        """Initialize the stand-ins."""
+        self.coingecko = CoingeckoStub(latencies.http)
+        self.contract_api = ContractApiStub(catalog, latencies.contract_api, generator)
+        self.ipfs = IpfsStub(latencies.ipfs)
+        self.ledger = LedgerStub(latencies.contract_api, self.contract_api)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests of the synthetic catalog generator."""
+
+import pytest
+
+from tests.benchmarks.catalog import (
+    PRICE_DISTRIBUTIONS,
+    CatalogGenerator,
+    CatalogSpec,
+    apply_delta,
+)
+
+
+@pytest.mark.parametrize("distribution", PRICE_DISTRIBUTIONS)
+def test_deterministic(distribution: str) -> None:
+    """The same spec gives the same catalog and deltas."""
+    spec = CatalogSpec(
+        size=500, seed=3, price_distribution=distribution, churn_rate=0.05
+    )
+    first, second = CatalogGenerator(spec), CatalogGenerator(spec)
+
+    assert first.response() == second.response()
+    assert list(first.deltas(10)) == list(second.deltas(10))
+    assert (
+        first.response() != CatalogGenerator(CatalogSpec(size=500, seed=4)).response()
+    )
+
+
+def test_deltas_replay_the_catalog() -> None:
+    """Applying the deltas to the initial listings gives the current listings."""
+    generator = CatalogGenerator(CatalogSpec(size=1000, churn_rate=0.02))
+    listings = {property_[0]: property_ for property_ in generator.response()["data"]}
+
+    changes = 0
+    for delta in generator.deltas(50):
+        apply_delta(listings, delta)
+        changes += len(delta.upserted) + len(delta.removed)
+
+    assert changes > 0
+    assert [listings[key] for key in sorted(listings)] == generator.response()["data"]
+
+
+def test_listed_ratio_and_prices() -> None:
+    """The statuses and the prices follow the spec."""
+    spec = CatalogSpec(size=10_000, listed_ratio=0.25, price_median=150, min_price=10)
+    data = CatalogGenerator(spec).response()["data"]
+
+    assert 0.2 < len(data) / spec.size < 0.3
+    assert all(property_[4] and property_[3] >= 10 for property_ in data)
+    prices = sorted(property_[3] for property_ in data)
+    assert 130 < prices[len(prices) // 2] < 170
+
+
+def test_invalid_spec() -> None:
+    """Invalid specs are rejected."""
+    with pytest.raises(ValueError, match="Unknown price distribution"):
+        CatalogSpec(size=10, price_distribution="pareto")
+    with pytest.raises(ValueError, match="churn rate"):
+        CatalogSpec(size=10, churn_rate=2)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests of the offline benchmark harness."""
+
+from tests.benchmarks.harness import (
+    BenchmarkConfig,
+    FSMBenchmark,
+    find_regressions,
+    percentile,
+)
+
+
+API_CHECK = "a_p_i_check_round"
+DECISION_MAKING = "decision_making_round"
+TX_PREPARATION = "tx_preparation_round"
+
+
+def test_periods_with_a_purchase() -> None:
+    """The periods go through all the rounds when a property is buyable."""
+    benchmark = FSMBenchmark(BenchmarkConfig(catalog_size=50, periods=3))
+    result = benchmark.run()
+
+    assert result.periods == 3
+    assert sorted(result.round_latencies) == [
+        API_CHECK,
+        DECISION_MAKING,
+        TX_PREPARATION,
+    ]
+    assert all(len(latencies) == 3 for latencies in result.round_latencies.values())
+    assert benchmark.abci_app.synchronized_data.period_count == 3
+    assert benchmark.stand_ins.contract_api.calls["get_properties_for_sale"] == 3
+
+
+def test_periods_with_a_hold() -> None:
+    """The periods end after the decision when no property is buyable."""
+    result = FSMBenchmark(
+        BenchmarkConfig(catalog_size=50, periods=2, buy_index=None)
+    ).run()
+
+    assert sorted(result.round_latencies) == [API_CHECK, DECISION_MAKING]
+    assert result.periods_per_second > 0
+
+
+def test_find_regressions() -> None:
+    """Only the figures which got worse than the threshold are reported."""
+    baseline = {
+        "10": {
+            "periods_per_second": 100.0,
+            "rounds": {API_CHECK: {"p50": 0.01, "p95": 0.02, "max": 0.03}},
+        }
+    }
+    results = {
+        "10": {
+            "periods_per_second": 70.0,
+            "rounds": {API_CHECK: {"p50": 0.01, "p95": 0.021, "max": 0.05}},
+        },
+        "100": {"periods_per_second": 1.0, "rounds": {}},
+    }
+
+    assert find_regressions(results, baseline, 0.2) == [
+        ("10", "periods_per_second", 100.0, 70.0)
+    ]
+    assert percentile([3.0, 1.0, 2.0, 4.0], 50) == 2.0
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests of the multi-agent simulation."""
+
+import pytest
+
+from tests.benchmarks.simulation import Simulation, SimulationConfig
+
+
+@pytest.mark.parametrize("n_agents", (1, 4))
+def test_buy_periods(n_agents: int) -> None:
+    """Every period settles a purchase, in one block per round."""
+    config = SimulationConfig(
+        n_agents=n_agents, periods=2, catalog_size=10, pause_scale=0.0, timeout=60.0
+    )
+    simulation = Simulation(config)
+    result = simulation.run()
+
+    assert len(result.periods) == 2
+    for period in result.periods:
+        assert "finalization_round" in period.rounds
+        assert period.blocks >= len(period.rounds)
+    summary = result.summary()
+    assert summary["round_retries"] == summary["tx_retries"] == 0
+    assert summary["rejected_txs"] == 0
+    assert len(simulation.stand_ins.ledger.transactions) == 2
+
+
+def test_hold_periods() -> None:
+    """The periods without a buyable property skip the settlement."""
+    config = SimulationConfig(
+        n_agents=3, periods=2, catalog_size=10, buy_index=None, pause_scale=0.0
+    )
+    simulation = Simulation(config)
+    result = simulation.run()
+
+    assert [period.rounds for period in result.periods] == [
+        ["a_p_i_check_round", "decision_making_round", "reset_and_pause_round"]
+    ] * 2
+    assert not simulation.stand_ins.ledger.transactions
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests of the startup benchmark and of the lazy imports of the learning skill."""
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from packages.valory.skills.learning_abci import behaviours
+from tests.benchmarks.startup import measure, parse_importtime
+
+
+SKILL_YAML = Path(behaviours.__file__).parent / "skill.yaml"
+IMPORTTIME = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   web3.types
+import time:        30 |        150 | web3
+import time:       500 |        650 | packages.valory.skills.learning_abci.behaviours
+"""
+
+
+def test_parse_importtime() -> None:
+    """The cumulative time of the module and the self time of the packages are parsed."""
+    cumulative, packages = parse_importtime(
+        IMPORTTIME, "packages.valory.skills.learning_abci.behaviours"
+    )
+    assert cumulative == pytest.approx(650e-6)
+    assert packages == pytest.approx({"web3": 150e-6, "packages": 500e-6})
+
+
+def test_contracts_are_loaded_lazily() -> None:
+    """Importing the behaviours of the learning skill does not load its contracts."""
+    result = measure("packages.valory.skills.learning_abci.behaviours", runs=1)
+    assert result.seconds[0] > 0
+    assert not {"erc20", "gnosis_safe", "multisend", "real_estate_solution"} & set(
+        result.contracts
+    )
+
+
+def test_contract_ids() -> None:
+    """The ids of the contracts are the ones the skill depends on."""
+    with open(SKILL_YAML, "r", encoding="utf-8") as file:
+        dependencies = {
+            contract.rsplit(":", 1)[0] for contract in yaml.safe_load(file)["contracts"]
+        }
+    assert {
+        behaviours.REAL_ESTATE_CONTRACT_ID,
+        behaviours.GNOSIS_SAFE_CONTRACT_ID,
+        behaviours.ERC20_CONTRACT_ID,
+        behaviours.MULTISEND_CONTRACT_ID,
+    } == dependencies
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests of the aggregation of the BenchmarkTool logs."""
+
+import csv
+import json
+from pathlib import Path
+from typing import Dict, List
+
+from click.testing import CliRunner
+
+from scripts.benchmark_report import LogHistogram, main
+
+
+BEHAVIOUR = "decision_making"
+
+
+def _write_logs(log_dir: Path, totals: Dict[str, List[float]]) -> None:
+    """Write the BenchmarkTool files of some agents, one period per total time."""
+    for agent, values in totals.items():
+        agent_dir = log_dir / agent
+        agent_dir.mkdir(parents=True)
+        for period, value in enumerate(values):
+            entries = [
+                {
+                    "behaviour": BEHAVIOUR,
+                    "data": {
+                        "local": value / 2,
+                        "consensus": value / 2,
+                        "total": value,
+                    },
+                }
+            ]
+            (agent_dir / f"{period}.json").write_text(json.dumps(entries))
+        (agent_dir / "notes.json").write_text("[]")
+
+
+def _read_rows(path: Path) -> Dict[tuple, Dict[str, str]]:
+    """Read the rows of a report."""
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        return {(row["block"], row["agent"]): row for row in csv.DictReader(file)}
+
+
+def test_log_histogram() -> None:
+    """The percentiles are within the precision of the histogram."""
+    histogram = LogHistogram(precision=0.01)
+    for value in range(1, 101):
+        histogram.add(float(value))
+    histogram.add(0.0)
+    assert histogram.count == 101
+    assert abs(histogram.percentile(50) - 50) <= 1
+    assert abs(histogram.percentile(99) - 99) <= 2
+    assert histogram.max == 100.0
+
+
+def test_report(tmp_path: Path) -> None:
+    """The report aggregates the logs of all the agents, flags the outliers and writes a CSV."""
+    log_dir = tmp_path / "logs"
+    _write_logs(log_dir, {"agent_0": [1.0, 1.0, 1.0, 20.0], "agent_1": [1.0, 1.0]})
+    report = tmp_path / "report.csv"
+    result = CliRunner().invoke(
+        main, [str(log_dir), "--csv", str(report), "--per-agent"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Outliers (3):" in result.output
+    assert "20.000s" in result.output
+
+    rows = _read_rows(report)
+    assert rows[("total", "*")]["count"] == "6"
+    assert rows[("total", "agent_1")]["count"] == "2"
+    assert float(rows[("total", "*")]["max"]) == 20.0
+    assert abs(float(rows[("total", "*")]["p50"]) - 1.0) < 0.02
+
+
+def test_regressions(tmp_path: Path) -> None:
+    """A percentile slower than the baseline allows makes the report fail."""
+    baseline = tmp_path / "baseline.csv"
+    _write_logs(tmp_path / "before", {"agent_0": [1.0, 1.0, 1.0]})
+    result = CliRunner().invoke(
+        main, [str(tmp_path / "before"), "--csv", str(baseline)]
+    )
+    assert result.exit_code == 0, result.output
+
+    _write_logs(tmp_path / "after", {"agent_0": [2.0, 2.0, 2.0]})
+    result = CliRunner().invoke(
+        main, [str(tmp_path / "after"), "--baseline", str(baseline)]
+    )
+    assert result.exit_code == 1
+    assert "Regressions (9):" in result.output
+
+
+def test_no_data(tmp_path: Path) -> None:
+    """A directory without benchmark files is reported as such."""
+    result = CliRunner().invoke(main, [str(tmp_path)])
+    assert result.exit_code == 1
+    assert "No benchmark data found" in result.output
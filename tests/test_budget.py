@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests of the balance and budget checks of the decisions."""
+
+from packages.valory.skills.learning_abci.budget import Budget
+from tests.benchmarks.harness import BenchmarkConfig, FSMBenchmark
+
+
+def test_failed_purchase_is_released() -> None:
+    """The value of a purchase which did not go through is not spent."""
+    budget = Budget(limit=300)
+    budget.reserve(200)
+    budget.settle(bought=None)
+    assert budget.available(balance=1000) == 100
+    budget.settle(bought=False)
+    assert budget.spent == 0
+    assert budget.available(balance=250) == 250
+
+
+def test_unaffordable_property_is_skipped() -> None:
+    """Nothing is prepared when the Safe cannot pay for the candidates, and the balance is read once per period."""
+    benchmark = FSMBenchmark(BenchmarkConfig(catalog_size=10, periods=3))
+    contract_api = benchmark.stand_ins.contract_api
+    contract_api.balance = 100
+    result = benchmark.run()
+
+    assert contract_api.purchases == []
+    assert "tx_preparation_round" not in result.round_latencies
+    assert contract_api.calls["check_balance"] == 3
+
+
+def test_budget_caps_the_purchases() -> None:
+    """The purchases stop once the budget is spent."""
+    benchmark = FSMBenchmark(BenchmarkConfig(catalog_size=10, periods=3))
+    value = benchmark.stand_ins.contract_api.catalog[9][3]
+    benchmark.context.state.budget.limit = value
+    benchmark.run()
+
+    assert benchmark.stand_ins.contract_api.purchases == [9]
+    assert benchmark.context.state.budget.spent == value
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests of the ranked queue of the candidates to buy."""
+
+from typing import Iterator, List
+
+from packages.valory.skills.learning_abci.candidates import CandidateQueue, key_of
+from packages.valory.skills.learning_abci.properties import Property
+from tests.benchmarks.harness import BenchmarkConfig, FSMBenchmark
+
+
+PROPERTIES = [
+    Property(1, "a", "0x1", 150, True),
+    Property(2, "b", "0x2", 120, True),
+    Property(3, "c", "0x3", 120, True, "ethereum:0xa"),
+    Property(4, "d", "0x4", 110, False),
+    Property(5, "e", "0x5", 250, True),
+]
+
+
+def _stream(read: List[int]) -> Iterator[Property]:
+    """Stream the properties, noting the ids of the ones read."""
+    for property_ in PROPERTIES:
+        read.append(property_.id)
+        yield property_
+
+
+def test_ranking() -> None:
+    """The properties for sale within the range are kept in their listing order."""
+    queue = CandidateQueue(retry_periods=2)
+    queue.rebuild("Qm1", PROPERTIES, 100, 200, period=0)
+    assert [property_.id for property_ in queue.candidates] == [1, 2, 3]
+    assert queue.is_current("Qm1")
+    assert not queue.is_current("Qm2")
+    assert queue.best(0, lambda property_: property_.id % 2 == 1).id == 1
+
+
+def test_cheapest_first() -> None:
+    """The properties can be ranked by value, id and source instead, keeping the cheapest ones."""
+    queue = CandidateQueue(retry_periods=2)
+    queue.rebuild("Qm1", PROPERTIES, 100, 200, period=0, cheapest=True)
+    assert [property_.id for property_ in queue.candidates] == [2, 3, 1]
+
+    queue = CandidateQueue(retry_periods=2, size=2)
+    queue.rebuild("Qm1", PROPERTIES, 100, 200, period=0, cheapest=True)
+    assert [property_.id for property_ in queue.candidates] == [2, 3]
+
+
+def test_shard() -> None:
+    """In the sharded mode, only the properties of the shard of the agent are ranked."""
+    queue = CandidateQueue(retry_periods=2)
+    queue.rebuild("Qm1", PROPERTIES, 100, 200, period=0, cheapest=True, shard=(1, 2))
+    assert [property_.id for property_ in queue.candidates] == [3, 1]
+    assert queue.is_current("Qm1", (1, 2))
+    assert not queue.is_current("Qm1", (0, 2))
+    assert not queue.is_current("Qm1")
+
+    # the pending purchase of another shard is still found in the listings
+    queue.reserve(("", 2))
+    assert queue.rebuild("Qm2", PROPERTIES, 100, 200, 1, shard=(1, 2)) is False
+    assert ("", 2) in queue.banned
+
+
+def test_listings_read_up_to_the_size() -> None:
+    """In the listing order, the listings are only read up to the candidates kept, and one more."""
+    queue = CandidateQueue(retry_periods=2, size=1)
+    read: List[int] = []
+    queue.rebuild("Qm1", _stream(read), 100, 200, period=0)
+    assert [property_.id for property_ in queue.candidates] == [1]
+    assert read == [1, 2]
+    assert queue.truncated
+
+    # the listings are read further to find the pending candidate
+    queue.reserve(("ethereum:0xa", 3))
+    read.clear()
+    assert queue.rebuild("Qm2", _stream(read), 100, 200, period=1) is False
+    assert [property_.id for property_ in queue.candidates] == [1]
+    assert read == [1, 2, 3]
+
+
+def test_rejected_candidates_take_no_place() -> None:
+    """With a filter, the banned and rejected properties are skipped before the candidates are cut."""
+    queue = CandidateQueue(retry_periods=2, size=1)
+    queue.ban(("ethereum:0xa", 3), period=0)
+    queue.rebuild("Qm1", PROPERTIES, 100, 200, 0, accept=lambda p: p.id != 1)
+    assert [property_.id for property_ in queue.candidates] == [2]
+    assert not queue.truncated
+
+    queue.rebuild(
+        "Qm1", PROPERTIES, 100, 200, 0, cheapest=True, accept=lambda p: p.id != 2
+    )
+    assert [property_.id for property_ in queue.candidates] == [1]
+
+
+def test_candidates_beyond_the_queue() -> None:
+    """When the candidates kept are all unaffordable, the affordable ones further in the listings are bought."""
+    benchmark = FSMBenchmark(
+        BenchmarkConfig(catalog_size=10, periods=2, params={"candidate_queue_size": 1})
+    )
+    contract_api = benchmark.stand_ins.contract_api
+    contract_api.catalog.append([10, "Property 10", "0x1", 190, True])
+    contract_api.catalog.append([11, "Property 11", "0x2", 150, True])
+    benchmark.context.state.budget.limit = 160
+    benchmark.run()
+
+    assert contract_api.purchases == [11]
+
+
+def test_failed_purchase_is_retried() -> None:
+    """A candidate still for sale after its purchase is skipped for the retry periods."""
+    queue = CandidateQueue(retry_periods=2)
+    queue.rebuild("Qm1", PROPERTIES, 100, 200, period=0)
+    queue.reserve(key_of(queue.best(0)))
+    # new listings, in which the candidate is still for sale
+    queue.rebuild("Qm2", PROPERTIES, 100, 200, period=1)
+    assert queue.best(1).id == 2
+    assert queue.best(2).id == 2
+    assert queue.best(3).id == 1
+
+
+def test_sold_candidate_drops_out() -> None:
+    """A candidate which is sold is neither banned nor ranked anymore."""
+    queue = CandidateQueue(retry_periods=2)
+    queue.rebuild("Qm1", PROPERTIES, 100, 200, period=0)
+    queue.reserve(key_of(queue.best(0)))
+    sold = [property_ for property_ in PROPERTIES if property_.id != 1]
+    assert queue.rebuild("Qm2", sold, 100, 200, period=1)
+    assert not queue.banned
+    assert [property_.id for property_ in queue.candidates] == [2, 3]
+
+
+def test_next_candidate_without_rescan() -> None:
+    """After a purchase which did not go through, the next candidate is bought from the same ranking."""
+    benchmark = FSMBenchmark(BenchmarkConfig(catalog_size=10, periods=3))
+    contract_api = benchmark.stand_ins.contract_api
+    contract_api.selling = False
+    contract_api.catalog.append([10, "Property 10", "0x1", 170, True])
+    benchmark.run()
+
+    assert contract_api.purchases == [9, 10]
+    metrics = benchmark.context.state.metrics
+    assert metrics.cache_requests[("listings_download", "hit")] == 1
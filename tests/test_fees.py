@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests of the fee history and the fees suggested for the purchases."""
+
+from packages.valory.skills.learning_abci.fees import FeeHistory, FeeSuggestion
+from tests.benchmarks.simulation import Simulation, SimulationConfig
+from tests.benchmarks.stubs import BASE_FEE, PRIORITY_FEE
+
+
+def test_window_keeps_the_last_periods() -> None:
+    """Only the last `size` samples of a chain count, and the latest base fee is always covered."""
+    history = FeeHistory(size=2, percentile=50.0)
+    assert history.suggest("ethereum") is None
+    for period, base_fee in enumerate([100, 10, 20]):
+        history.add("ethereum", period, base_fee, priority_fee=1)
+
+    assert history.is_sampled("ethereum", 2)
+    assert not history.is_sampled("gnosis", 2)
+    assert history.suggest("ethereum") == FeeSuggestion(41, 1)
+    history.add("ethereum", 3, base_fee=30, priority_fee=1)
+    assert history.suggest("ethereum") == FeeSuggestion(61, 1)
+
+
+def test_purchases_are_settled_with_the_suggested_fees() -> None:
+    """The settlement uses the fees suggested by the history, which follow the rising base fee."""
+    config = SimulationConfig(
+        n_agents=1, periods=2, catalog_size=10, pause_scale=0.0, timeout=60.0
+    )
+    simulation = Simulation(config)
+    simulation.run()
+
+    ledger = simulation.stand_ins.ledger
+    # the base fee of the block after the first and the second purchase
+    next_base_fees = [BASE_FEE * 9 // 8, BASE_FEE * 10 // 8]
+    assert [tx["maxFeePerGas"] for tx in ledger.transactions.values()] == [
+        2 * base_fee + PRIORITY_FEE for base_fee in next_base_fees
+    ]
+    assert {tx["maxPriorityFeePerGas"] for tx in ledger.transactions.values()} == {
+        PRIORITY_FEE
+    }
+    assert ledger.calls["fee_history"] == 2
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests of the keeper fetch mode."""
+
+import logging
+
+import pytest
+from aea.exceptions import AEAEnforceError
+
+from packages.valory.skills.learning_abci.keeper import (
+    keeper_of,
+    should_audit,
+    within_band,
+)
+from tests.benchmarks.harness import OfflineSkillContext, load_params
+from tests.benchmarks.simulation import Simulation, SimulationConfig
+
+
+def test_keeper_rotates() -> None:
+    """Every participant is the keeper once every N periods."""
+    participants = ["0xa", "0xb", "0xc", "0xd"]
+    assert [keeper_of(participants, period) for period in range(5)] == [
+        "0xa",
+        "0xb",
+        "0xc",
+        "0xd",
+        "0xa",
+    ]
+
+
+def test_checks() -> None:
+    """The price band is relative, and the audits follow their probability."""
+    assert within_band(0.96, 1.0, 0.05)
+    assert not within_band(1.06, 1.0, 0.05)
+    assert not should_audit(0.0)
+    assert should_audit(1.0)
+
+
+def test_keeper_wait_within_the_round() -> None:
+    """The agents must give up on the keeper before the round times out."""
+    context = OfflineSkillContext("0x1", logging.getLogger("test_keeper"))
+    params = load_params(context, ["0x1"], {})
+    assert params.keeper_wait_timeout < params.round_timeout_seconds
+    with pytest.raises(AEAEnforceError, match="keeper_wait_timeout"):
+        load_params(
+            context,
+            ["0x1"],
+            {"keeper_wait_timeout": params.round_timeout_seconds},
+        )
+
+
+def test_keeper_fetch_service() -> None:
+    """Only the keeper calls the price API and the contract, once the agents have a price."""
+    config = SimulationConfig(
+        n_agents=4,
+        periods=3,
+        catalog_size=10,
+        pause_scale=0.0,
+        params={"keeper_fetch": True, "keeper_audit_probability": 0.0},
+        timeout=60.0,
+    )
+    simulation = Simulation(config)
+    result = simulation.run()
+
+    assert len(result.periods) == 3
+    assert len(simulation.stand_ins.ledger.transactions) == 3
+    # the first period, the other agents fetch their reference price
+    assert simulation.stand_ins.coingecko.calls == 4 + 1 + 1
+    assert simulation.stand_ins.contract_api.calls["get_properties_for_sale"] == 3
+    # the prices of the keepers are checked against the agents' own, but never stored
+    prices = sorted(len(state.store.prices) for state in simulation.states)
+    assert prices == [1, 1, 2, 2]
+
+
+def test_audited_keeper_fetch_service() -> None:
+    """With every agent auditing, the digest of the keeper is checked at its block."""
+    config = SimulationConfig(
+        n_agents=4,
+        periods=1,
+        catalog_size=10,
+        pause_scale=0.0,
+        params={"keeper_fetch": True, "keeper_audit_probability": 1.0},
+        timeout=60.0,
+    )
+    simulation = Simulation(config)
+    result = simulation.run()
+
+    assert "finalization_round" in result.periods[0].rounds
+    assert simulation.stand_ins.contract_api.calls["get_properties_for_sale"] == 4
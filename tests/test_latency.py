@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests of the latency of the purchases, from the listing of the properties."""
+
+from packages.valory.skills.learning_abci.latency import STAGES, TOTAL, LatencyTracker
+from tests.benchmarks.simulation import Simulation, SimulationConfig
+
+
+def test_first_sighting_is_kept() -> None:
+    """A candidate keeps the block it was first seen at, until it is no longer listed."""
+    tracker = LatencyTracker(history=10)
+    tracker.observe_block("ethereum", 10)
+    tracker.see({("", 1): "ethereum"}, timestamp=1.0)
+    tracker.observe_block("ethereum", 12)
+    tracker.observe_block("ethereum", 11)
+    tracker.see({("", 1): "ethereum", ("", 2): "ethereum"}, timestamp=2.0)
+
+    assert tracker.blocks == {"ethereum": 12}
+    assert [sighting.block for sighting in tracker.sightings.values()] == [10, 12]
+    tracker.see({("", 2): "ethereum"}, timestamp=3.0)
+    assert list(tracker.sightings) == [("", 2)]
+
+
+def test_given_up_purchase_is_not_timed() -> None:
+    """A purchase is only completed once prepared, and not after it is given up."""
+    tracker = LatencyTracker(history=10)
+    tracker.decide(("", 1), timestamp=1.0)
+    assert tracker.complete(settled_at=2.0, included_at=3.0) is None
+    tracker.prepare(timestamp=2.0)
+    tracker.drop()
+    assert tracker.complete(settled_at=3.0, included_at=4.0) is None
+    assert not tracker.purchases
+
+
+def test_purchases_are_timed_end_to_end() -> None:
+    """Each settled purchase is timed stage by stage, and its percentiles are served with the metrics."""
+    config = SimulationConfig(
+        n_agents=1, periods=2, catalog_size=10, pause_scale=0.0, timeout=60.0
+    )
+    simulation = Simulation(config)
+    simulation.run()
+
+    state = simulation.states[0]
+    purchases = list(state.latency.purchases)
+    assert len(purchases) == 2
+    for purchase in purchases:
+        stages = purchase.stages()
+        assert list(stages) == [*STAGES, TOTAL]
+        assert all(seconds >= 0 for seconds in stages.values())
+        assert stages[TOTAL] >= sum(stages[stage] for stage in STAGES) - 1e-6
+    # the first purchase was listed before the chain moved
+    assert purchases[0].listed_block == 0
+    assert purchases[0].key != purchases[1].key
+    rendered = state.metrics.render()
+    assert 'learning_purchase_latency_seconds_count{stage="total"} 2' in rendered
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests of the listing sources."""
+
+from typing import Generator, List, Optional
+
+import pytest
+
+from packages.valory.skills.learning_abci.listing_sources import (
+    ListingSource,
+    chain_of,
+    gather,
+    merge_listings,
+)
+from packages.valory.skills.learning_abci.properties import PropertyTable
+from packages.valory.skills.learning_abci.sharding import global_best
+from tests.benchmarks.simulation import Simulation, SimulationConfig
+
+
+def answer(value: str, steps: int, trace: List[str]) -> Generator[None, None, str]:
+    """Answer with a value after some steps, tracing them."""
+    for _ in range(steps):
+        trace.append(value)
+        yield
+    return value
+
+
+def run(generator: Generator) -> Optional[List[str]]:
+    """Run a generator to its end."""
+    try:
+        while True:
+            next(generator)
+    except StopIteration as stop:
+        return stop.value
+
+
+def test_parse() -> None:
+    """A source is a chain and an address, optionally followed by a token."""
+    assert ListingSource.parse("ethereum:0xa") == ListingSource("ethereum", "0xa")
+    assert ListingSource.parse("gnosis:0xb:0xc").token == "0xc"
+    assert chain_of(ListingSource("gnosis", "0xb").tag) == "gnosis"
+    for invalid in ("gnosis", "gnosis:", ":0xa", "a:b:c:d"):
+        with pytest.raises(ValueError):
+            ListingSource.parse(invalid)
+
+
+def test_gather_interleaves() -> None:
+    """The requests run concurrently, and the answers keep their order."""
+    trace: List[str] = []
+    answers = run(
+        gather([lambda: answer("a", 2, trace), lambda: answer("b", 1, trace)])
+    )
+    assert answers == ["a", "b"]
+    assert trace == ["a", "b", "a"]
+
+
+def test_merged_index() -> None:
+    """The properties of the sources are tagged, and keep their tag in the table."""
+    ethereum, gnosis = ListingSource("ethereum", "0xa"), ListingSource("gnosis", "0xb")
+    rows = merge_listings(
+        [
+            (ethereum, [[1, "a", "0x1", 130, True]]),
+            (gnosis, [[1, "b", "0x2", 120, True]]),
+        ]
+    )
+    table = PropertyTable.from_rows(rows)
+    assert [property_.source for property_ in table] == ["ethereum:0xa", "gnosis:0xb"]
+    assert table.rows() == rows
+    # the same id on two sources is told apart by the tag
+    best = global_best(
+        {
+            "0xa": {
+                "property_id": 1,
+                "property_value": 130,
+                "property_source": "ethereum:0xa",
+            },
+            "0xb": {
+                "property_id": 1,
+                "property_value": 120,
+                "property_source": "gnosis:0xb",
+            },
+        },
+        ["0xa"],
+        100,
+        200,
+    )
+    assert best == {
+        "property_id": 1,
+        "property_value": 130,
+        "property_source": "ethereum:0xa",
+    }
+
+
+def test_multichain_service() -> None:
+    """The sources are read every period, and the purchase is sent to the chain of the property."""
+    config = SimulationConfig(
+        n_agents=4,
+        periods=1,
+        catalog_size=10,
+        pause_scale=0.0,
+        params={"listing_sources": ["ethereum:0xa", "gnosis:0xb"]},
+        timeout=60.0,
+    )
+    simulation = Simulation(config)
+    result = simulation.run()
+
+    assert "finalization_round" in result.periods[0].rounds
+    assert simulation.stand_ins.contract_api.calls["get_properties_for_sale"] == 4 * 2
+    assert list(simulation.stand_ins.ledger.chain_ids.values()) == ["ethereum"]
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests of the streaming reader of the listings."""
+
+import json
+from typing import Optional
+
+import pytest
+
+from packages.valory.skills.learning_abci.listings import LISTINGS_KEY, iter_listings
+from tests.benchmarks.catalog import CatalogGenerator, CatalogSpec
+from tests.benchmarks.harness import BenchmarkConfig, FSMBenchmark
+
+
+@pytest.mark.parametrize("indent", (None, 4))
+def test_same_properties_as_json(indent: Optional[int]) -> None:
+    """The streamed properties are the ones of the whole file."""
+    properties = CatalogGenerator(CatalogSpec(size=500)).response()["data"]
+    serialized = json.dumps(
+        {"version": [1, {"a": "]"}], LISTINGS_KEY: properties, "other": None},
+        indent=indent,
+        ensure_ascii=False,
+    )
+    assert list(iter_listings(serialized)) == properties
+
+
+def test_early_stop() -> None:
+    """The properties after the ones consumed are not decoded."""
+    serialized = '{"' + LISTINGS_KEY + '": [[1, "a"], [2, "b"], not json'
+    listings = iter_listings(serialized)
+    assert next(listings) == [1, "a"]
+    assert next(listings) == [2, "b"]
+    with pytest.raises(json.JSONDecodeError):
+        next(listings)
+
+
+@pytest.mark.parametrize(
+    "serialized, error",
+    (
+        ("{}", KeyError),
+        ('{"other": []}', KeyError),
+        ('{"' + LISTINGS_KEY + '": {}}', json.JSONDecodeError),
+        ("[]", json.JSONDecodeError),
+    ),
+)
+def test_invalid_files(serialized: str, error: type) -> None:
+    """Files without listings are rejected."""
+    with pytest.raises(error):
+        list(iter_listings(serialized))
+
+
+def test_empty_listings() -> None:
+    """An empty array gives no properties."""
+    assert not list(iter_listings('{"' + LISTINGS_KEY + '": [ ]}'))
+
+
+def test_decision_streams_the_download() -> None:
+    """The decision is made on the listings streamed from IPFS."""
+    benchmark = FSMBenchmark(BenchmarkConfig(catalog_size=100, periods=1))
+    benchmark.run_round()
+    # forget the listings uploaded by the agent
+    benchmark.context.state.store.snapshot = None
+    benchmark.run_round()
+
+    metrics = benchmark.context.state.metrics
+    assert metrics.cache_requests[("listings_download", "miss")] == 1
+    assert benchmark.abci_app.current_round_id == "tx_preparation_round"
+    benchmark.context.state.teardown()
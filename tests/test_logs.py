@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests of the sampled and rate limited logs of the skill."""
+
+import json
+import logging
+from pathlib import Path
+from typing import List
+
+from packages.valory.skills.learning_abci.logs import LogSink, SkillLog
+from tests.benchmarks.harness import BenchmarkConfig, FSMBenchmark
+
+
+class ListHandler(logging.Handler):
+    """Collect the messages logged."""
+
+    def __init__(self) -> None:
+        """Initialize the handler."""
+        super().__init__()
+        self.messages: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Collect a message."""
+        self.messages.append(record.getMessage())
+
+
+def make_logger(name: str, level: int = logging.INFO) -> ListHandler:
+    """Get a logger at the given level, and its handler."""
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    logger.propagate = False
+    handler = ListHandler()
+    logger.handlers = [handler]
+    return handler
+
+
+class Dump:
+    """A value which counts its formattings."""
+
+    formatted = 0
+
+    def __str__(self) -> str:
+        """Format the value."""
+        Dump.formatted += 1
+        return "dump"
+
+
+def test_suppressed_lines_are_reported() -> None:
+    """The lines left out by the sampling and the rate limits are counted with the next line of their key."""
+    handler = make_logger("test_logs.sampling")
+    log = SkillLog(
+        logging.getLogger("test_logs.sampling"),
+        sampling={"property": 2},
+        rate_limits={"price": 1},
+    )
+    for index in range(4):
+        log.info("property", "Property {index}", index=index)
+        log.info("price", "Price {index}", index=index)
+
+    assert handler.messages == [
+        "Property 0",
+        "Price 0",
+        "Property 2 (1 lines of property suppressed)",
+    ]
+    assert log.suppressed == {"property": 1, "price": 3}
+
+
+def test_dumps_are_only_formatted_at_debug() -> None:
+    """A line below the level of the logger is not formatted."""
+    handler = make_logger("test_logs.debug")
+    log = SkillLog(logging.getLogger("test_logs.debug"))
+    log.debug("dump", "Response: {response}", response=Dump())
+    assert Dump.formatted == 0
+    assert not handler.messages
+    logging.getLogger("test_logs.debug").setLevel(logging.DEBUG)
+    log.debug("dump", "Response: {response}", response=Dump())
+    assert handler.messages == ["Response: dump"]
+
+
+def test_sink_writes_json_lines(tmp_path: Path) -> None:
+    """With a sink, the lines are written as JSON, and only the warnings reach the logger."""
+    handler = make_logger("test_logs.sink")
+    path = tmp_path / "logs" / "skill.jsonl"
+    log = SkillLog(logging.getLogger("test_logs.sink"), sink=LogSink(path))
+    log.info("price", "The price is {price}", price=1.5)
+    log.warning("fetch", "The keeper did not publish in time.")
+    log.close()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(record["key"], record["level"]) for record in records] == [
+        ("price", "INFO"),
+        ("fetch", "WARNING"),
+    ]
+    assert records[0]["message"] == "The price is 1.5" and records[0]["price"] == 1.5
+    assert handler.messages == ["The keeper did not publish in time."]
+
+
+def test_periods_log_to_the_sink(tmp_path: Path) -> None:
+    """The periods log their summaries to the sink, without the full dumps of the responses."""
+    path = tmp_path / "skill.jsonl"
+    benchmark = FSMBenchmark(
+        BenchmarkConfig(
+            catalog_size=10,
+            periods=2,
+            log_level=logging.INFO,
+            params={"log_file": str(path)},
+        )
+    )
+    benchmark.run()
+    benchmark.context.state.log.close()
+
+    keys = {json.loads(line)["key"] for line in path.read_text().splitlines()}
+    assert {"price", "listings", "decision", "purchase"} <= keys
+    assert not {key for key in keys if key.endswith("_dump")}
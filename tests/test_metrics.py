@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests of the metrics registry and of the /metrics route."""
+
+from typing import Any
+from unittest.mock import MagicMock
+
+from packages.valory.protocols.http.message import HttpMessage
+from packages.valory.skills.learning_abci.handlers import HttpHandler
+from packages.valory.skills.learning_abci.metrics import (
+    CONTENT_TYPE,
+    LearningMetrics,
+    Summary,
+)
+
+
+def _request(url: str, method: str = "get") -> HttpMessage:
+    """Get an http request to the skill."""
+    return HttpMessage(
+        performative=HttpMessage.Performative.REQUEST,  # type: ignore
+        method=method,
+        url=url,
+        headers="",
+        version="",
+        body=b"",
+    )
+
+
+def _reply(metrics: LearningMetrics, request: HttpMessage) -> Any:
+    """Handle a request, and get the arguments of the reply."""
+    context = MagicMock()
+    context.state.metrics = metrics
+    handler = HttpHandler(name="http", skill_context=context)
+    handler.setup()
+    handler.handle(request)
+    dialogue = context.http_dialogues.update.return_value
+    context.outbox.put_message.assert_called_once()
+    return dialogue.reply.call_args.kwargs
+
+
+def test_summary_quantiles() -> None:
+    """The quantiles are taken over the rolling window, the sum and count over all the observations."""
+    summary = Summary(window=4)
+    assert summary.quantile(0.5) is None
+    assert summary.quantiles() == []
+    for value in (100.0, 1.0, 2.0, 3.0, 4.0):
+        summary.observe(value)
+    assert len(summary) == 4
+    assert summary.count == 5
+    assert summary.total == 110.0
+    assert summary.quantile(0.5) == 3.0
+    assert summary.quantiles() == [(0.5, 3.0), (0.95, 4.0), (0.99, 4.0)]
+
+
+def test_render_counters() -> None:
+    """The counters are rendered by their sorted labels, and the round retries without a majority are not timeouts."""
+    metrics = LearningMetrics()
+    metrics.set_period(3)
+    metrics.add_ipfs_bytes("in", 10)
+    metrics.add_ipfs_bytes("in", 5)
+    metrics.record_no_majority("decision_making")
+    metrics.record_round_retry("decision_making")
+    metrics.record_round_retry("decision_making")
+    lines = metrics.render().splitlines()
+    assert "learning_period_count 3" in lines
+    assert 'learning_ipfs_bytes_total{direction="in"} 15' in lines
+    assert 'learning_ipfs_bytes_total{direction="out"} 0' in lines
+    assert (
+        'learning_round_events_total{round="decision_making",event="no_majority"} 1'
+        in lines
+    )
+    assert (
+        'learning_round_events_total{round="decision_making",event="round_timeout"} 1'
+        in lines
+    )
+
+
+def test_render_summaries() -> None:
+    """The summaries are rendered with their quantiles, sum and count."""
+    metrics = LearningMetrics(window=8)
+    for seconds in (0.1, 0.2, 0.3, 0.4):
+        metrics.observe_call("http", seconds)
+    lines = metrics.render().splitlines()
+    name = "learning_external_call_duration_seconds"
+    assert f"# TYPE {name} summary" in lines
+    assert f'{name}{{kind="http",quantile="0.5"}} 0.3' in lines
+    assert f'{name}{{kind="http",quantile="0.99"}} 0.4' in lines
+    assert f'{name}_count{{kind="http"}} 4' in lines
+    assert any(line.startswith(f'{name}_sum{{kind="http"}} 1.0') for line in lines)
+
+
+def test_cache_hit_ratio() -> None:
+    """The hit ratio of each cache is rendered from its lookups."""
+    metrics = LearningMetrics()
+    for hit in (True, True, True, False):
+        metrics.record_cache("prices", hit)
+    metrics.record_cache("listings", False)
+    lines = metrics.render().splitlines()
+    assert 'learning_cache_hit_ratio{cache="prices"} 0.75' in lines
+    assert 'learning_cache_hit_ratio{cache="listings"} 0.0' in lines
+    assert 'learning_cache_requests_total{cache="prices",result="hit"} 3' in lines
+
+
+def test_render_cache() -> None:
+    """The rendered text is cached until the next observation."""
+    metrics = LearningMetrics()
+    rendered = metrics.render()
+    assert metrics.render() is rendered
+    metrics.observe_step("decision_making", 0.01)
+    assert metrics.render() is not rendered
+    assert "learning_behaviour_step_duration_seconds_count" in metrics.render()
+
+
+def test_metrics_route() -> None:
+    """The /metrics route replies with the rendered metrics and their content type."""
+    metrics = LearningMetrics()
+    metrics.set_period(7)
+    reply = _reply(metrics, _request("http://localhost:8000/metrics/"))
+    assert reply["status_code"] == 200
+    assert reply["headers"].startswith(f"Content-Type: {CONTENT_TYPE}\n")
+    assert reply["body"] == metrics.render().encode("utf-8")
+
+
+def test_unknown_route() -> None:
+    """Unknown routes and methods get a 404."""
+    reply = _reply(LearningMetrics(), _request("http://localhost:8000/other"))
+    assert reply["status_code"] == 404
+    reply = _reply(
+        LearningMetrics(), _request("http://localhost:8000/metrics", method="post")
+    )
+    assert reply["status_code"] == 404
+    assert reply["body"] == b""
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests of the polling of the responses, with several requests in flight."""
+
+import logging
+from types import SimpleNamespace
+from typing import Any, Dict, Generator, List
+from unittest.mock import MagicMock
+
+import pytest
+
+from packages.valory.skills.abstract_round_abci.behaviour_utils import TimeoutException
+from packages.valory.skills.learning_abci.behaviours import PollingBehaviour
+from packages.valory.skills.learning_abci.listing_sources import gather
+from packages.valory.skills.learning_abci.price_sources import hedged
+from packages.valory.skills.learning_abci.rounds import APICheckRound
+from tests.benchmarks.harness import OfflineSkillContext
+
+
+class Poller(PollingBehaviour):  # pylint: disable=too-many-ancestors
+    """A behaviour which only does requests."""
+
+    matching_round = APICheckRound
+
+    def async_act(self) -> Generator:
+        """Do nothing."""
+        yield
+
+
+def poller() -> Poller:
+    """Get a poller, with an outbox and the callbacks of the requests."""
+    context = OfflineSkillContext("agent", logging.getLogger(__name__))
+    context.outbox = MagicMock()  # type: ignore[attr-defined]
+    context.requests = SimpleNamespace(  # type: ignore[attr-defined]
+        request_id_to_callback={}
+    )
+    return Poller(name="poller", skill_context=context)
+
+
+def callbacks(behaviour: Poller) -> Dict[str, Any]:
+    """Get the callbacks of the requests in flight."""
+    return behaviour.context.requests.request_id_to_callback
+
+
+def request(behaviour: Poller, nonce: str, timeout: Any = None) -> Any:
+    """Get a request with a nonce."""
+    dialogue = SimpleNamespace(
+        dialogue_label=SimpleNamespace(dialogue_reference=(nonce, ""))
+    )
+    return lambda: behaviour._do_request(  # pylint: disable=protected-access
+        nonce, dialogue, timeout  # type: ignore[arg-type]
+    )
+
+
+def respond(behaviour: Poller, nonce: str) -> None:
+    """Deliver the response of a request, as the handler does."""
+    callbacks(behaviour).pop(nonce)(f"response of {nonce}", behaviour)
+
+
+def step(generator: Generator, times: int = 1) -> None:
+    """Step a generator."""
+    for _ in range(times):
+        next(generator)
+
+
+def test_response() -> None:
+    """The response of a request is returned, and its callback popped with it."""
+    behaviour = poller()
+    generator = request(behaviour, "a")()
+    step(generator)
+    behaviour.context.outbox.put_message.assert_called_once_with(message="a")
+    respond(behaviour, "a")
+    with pytest.raises(StopIteration) as stop:
+        step(generator)
+    assert stop.value.value == "response of a"
+    assert not callbacks(behaviour)
+
+
+def test_gather() -> None:
+    """The requests gathered are all in flight at once."""
+    behaviour = poller()
+    generator = gather([request(behaviour, nonce) for nonce in "abc"])
+    step(generator)
+    assert set(callbacks(behaviour)) == {"a", "b", "c"}
+    for nonce in "cab":
+        respond(behaviour, nonce)
+    with pytest.raises(StopIteration) as stop:
+        step(generator)
+    assert stop.value.value == ["response of a", "response of b", "response of c"]
+    assert not callbacks(behaviour)
+
+
+def test_timeout_of_a_gathered_request() -> None:
+    """A request timing out fails the gathering, and the late responses of all its requests are dropped."""
+    behaviour = poller()
+    generator = gather(
+        [
+            request(behaviour, "a"),
+            request(behaviour, "b", timeout=0),
+            request(behaviour, "c"),
+        ]
+    )
+    with pytest.raises(TimeoutException):
+        step(generator)
+    # the handler still finds the callbacks of the abandoned requests
+    assert set(callbacks(behaviour)) == {"a", "b"}
+    for nonce in "ab":
+        respond(behaviour, nonce)
+    assert not callbacks(behaviour)
+    # the requests after the one which timed out were never sent
+    assert behaviour.context.outbox.put_message.call_count == 2
+
+
+def test_abandoned_requests() -> None:
+    """The requests which lose a hedge, or of a stopped behaviour, drop their late responses."""
+    behaviour = poller()
+    dropped: List[str] = []
+    behaviour.context.logger = MagicMock()
+    behaviour.context.logger.debug.side_effect = dropped.append
+    generator = hedged([request(behaviour, "a"), request(behaviour, "b")], delay=0)
+    step(generator, 2)
+    assert set(callbacks(behaviour)) == {"a", "b"}
+    respond(behaviour, "b")
+    with pytest.raises(StopIteration) as stop:
+        step(generator)
+    assert stop.value.value == "response of b"
+    respond(behaviour, "a")
+    assert len(dropped) == 1 and "response of a" in dropped[0]
+
+    stopped = request(behaviour, "c")()
+    step(stopped)
+    stopped.close()
+    respond(behaviour, "c")
+    assert len(dropped) == 2 and not callbacks(behaviour)
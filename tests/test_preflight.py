@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests of the pre-flight simulation of the purchases."""
+
+from packages.valory.skills.learning_abci.preflight import (
+    encode_simulation,
+    simulation_succeeded,
+)
+from packages.valory.skills.learning_abci.rounds import (
+    FinishedDecisionMakingRound,
+    FinishedTxPreparationRound,
+)
+from tests.benchmarks.harness import BenchmarkConfig, FSMBenchmark
+from tests.benchmarks.stubs import ContractApiStub, LedgerStub
+
+
+def test_simulation_of_the_multisend() -> None:
+    """The calldata of the simulation carries the MultiSend data, and the revert data its outcome."""
+    contract_api = ContractApiStub([])
+    ledger = LedgerStub(contract_api=contract_api)
+    contract_api.request("get_buy_property_tx", id=7)
+    data = contract_api.request("get_tx_data")["data"]  # type: ignore
+    transaction = {
+        "to": "0x1",
+        "data": encode_simulation("0x2", bytes.fromhex(data[2:])),
+    }
+    assert simulation_succeeded(ledger.call(transaction, 0))
+    ledger.reverting.add(7)
+    assert simulation_succeeded(ledger.call(transaction, 0)) is False
+    assert simulation_succeeded(ledger.call(transaction, 1)) is None
+
+
+def run_until_final_round(benchmark: FSMBenchmark) -> type:
+    """Run the rounds of the period, and get the final round it ends in."""
+    final_states = benchmark.abci_app.final_states
+    while type(benchmark.abci_app.current_round) not in final_states:
+        benchmark.run_round()
+    return type(benchmark.abci_app.current_round)
+
+
+def test_reverting_purchase_is_dropped() -> None:
+    """A purchase which would revert is not settled, and the next candidate is bought in the next period."""
+    benchmark = FSMBenchmark(BenchmarkConfig(catalog_size=10))
+    contract_api = benchmark.stand_ins.contract_api
+    contract_api.selling = False
+    contract_api.catalog.append([10, "Property 10", "0x1", 170, True])
+    benchmark.stand_ins.ledger.reverting.add(9)
+
+    assert run_until_final_round(benchmark) is FinishedDecisionMakingRound
+    benchmark.next_period()
+    assert run_until_final_round(benchmark) is FinishedTxPreparationRound
+    assert contract_api.purchases == [9, 10]
+    assert benchmark.stand_ins.ledger.calls["call"] == 2
+
+
+def test_simulation_can_be_disabled() -> None:
+    """Without the pre-flight simulation, a purchase which would revert is settled anyway."""
+    benchmark = FSMBenchmark(
+        BenchmarkConfig(catalog_size=10, params={"preflight_simulation": False})
+    )
+    benchmark.stand_ins.ledger.reverting.add(9)
+    assert run_until_final_round(benchmark) is FinishedTxPreparationRound
+    assert "call" not in benchmark.stand_ins.ledger.calls
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests of the price feed of the token and currency pairs."""
+
+import pytest
+
+from packages.valory.skills.learning_abci.price_feed import (
+    PriceFeed,
+    Quote,
+    parse_pair,
+)
+from tests.benchmarks.harness import BenchmarkConfig, FSMBenchmark
+
+
+TEMPLATE = (
+    "https://api.coingecko.com/api/v3/simple/price"
+    "?ids=autonolas&vs_currencies=usd&x_cg_demo_api_key={api_key}"
+)
+
+
+def test_url() -> None:
+    """All the pairs are requested at once, keeping the other parameters of the template."""
+    feed = PriceFeed(["autonolas/usd"])
+    assert feed.url(TEMPLATE) == TEMPLATE
+    feed.require("Ethereum", "EUR")
+    feed.require("autonolas", "usd")
+    assert feed.url(TEMPLATE) == (
+        "https://api.coingecko.com/api/v3/simple/price"
+        "?ids=autonolas,ethereum&vs_currencies=eur,usd&x_cg_demo_api_key={api_key}"
+    )
+
+
+def test_update() -> None:
+    """The quotes are timestamped, with the update time of the source if given."""
+    feed = PriceFeed(["autonolas/usd", "ethereum/usd"])
+    body = {
+        "autonolas": {"usd": 1.5, "last_updated_at": 5},
+        "ethereum": {"usd": 3000},
+        "unknown": None,
+    }
+    assert feed.update(body, timestamp=10.0) == 2
+    assert feed.quote("autonolas", "usd") == Quote(1.5, 5.0)
+    assert feed.quote("ETHEREUM", "USD") == Quote(3000.0, 10.0)
+    assert feed.quote("ethereum", "eur") is None
+
+
+def test_invalid_pair() -> None:
+    """A pair must name a token and a currency."""
+    assert parse_pair("Autonolas/USD") == ("autonolas", "usd")
+    with pytest.raises(ValueError):
+        parse_pair("autonolas")
+
+
+def test_one_request_per_period() -> None:
+    """Adding pairs adds no request."""
+    config = BenchmarkConfig(
+        catalog_size=10,
+        periods=2,
+        params={"price_pairs": ["autonolas/usd", "ethereum/usd", "autonolas/eur"]},
+    )
+    benchmark = FSMBenchmark(config)
+    feed = benchmark.context.state.price_feed
+    benchmark.run()
+
+    assert benchmark.stand_ins.coingecko.calls == 2
+    quote = feed.quote("autonolas", "usd")
+    assert quote is not None and quote.price == benchmark.stand_ins.coingecko.price
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests of the hedged requests to the price sources."""
+
+import time
+from typing import Generator, List, Optional
+
+from packages.valory.skills.learning_abci.price_sources import (
+    MIN_SAMPLES,
+    PriceSources,
+    hedged,
+)
+from tests.benchmarks.harness import BenchmarkConfig, FSMBenchmark
+
+
+def answer(
+    value: Optional[str], seconds: float, started: List[str]
+) -> Generator[None, None, Optional[str]]:
+    """Answer with a value after some time, polling meanwhile."""
+    started.append(str(value))
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        yield
+    return value
+
+
+def run(generator: Generator) -> Optional[str]:
+    """Run a generator to its end."""
+    try:
+        while True:
+            next(generator)
+    except StopIteration as stop:
+        return stop.value
+
+
+def test_hedged_request_wins() -> None:
+    """A slow source is hedged, and the fastest answer is taken."""
+    started: List[str] = []
+    result = run(
+        hedged(
+            [
+                lambda: answer("slow", 1.0, started),
+                lambda: answer("fast", 0.0, started),
+            ],
+            delay=0.05,
+        )
+    )
+    assert result == "fast"
+    assert started == ["slow", "fast"]
+
+
+def test_no_hedge_when_fast() -> None:
+    """The other sources are not called when the first answers in time."""
+    started: List[str] = []
+    result = run(
+        hedged(
+            [lambda: answer("a", 0.0, started), lambda: answer("b", 0.0, started)],
+            delay=1.0,
+        )
+    )
+    assert result == "a"
+    assert started == ["a"]
+
+
+def test_failover() -> None:
+    """An invalid answer fails over to the next source right away, and all failing gives `None`."""
+    started: List[str] = []
+    requests = [lambda: answer(None, 0.0, started), lambda: answer("b", 0.0, started)]
+    assert run(hedged(requests, delay=10.0)) == "b"
+    assert run(hedged(requests[:1], delay=10.0)) is None
+
+
+def test_hedge_delay() -> None:
+    """The delay follows the latency percentile once there are enough answers."""
+    sources = PriceSources(["http://a"], percentile=90.0, initial_delay=2.0)
+    assert sources.hedge_delay() == 2.0
+    for index in range(MIN_SAMPLES):
+        sources.observe(0.1 * (index + 1))
+    assert abs(sources.hedge_delay() - 1.0) < 1e-9
+
+
+def test_failover_in_period() -> None:
+    """A period gets its price from an alternate source when Coingecko is down."""
+    config = BenchmarkConfig(
+        catalog_size=10,
+        periods=1,
+        params={
+            "price_sources": [
+                "http://localhost:8080/simple/price?ids=autonolas&vs_currencies=usd"
+            ],
+            "coingecko_api_key": "secret",
+        },
+    )
+    benchmark = FSMBenchmark(config)
+    benchmark.stand_ins.coingecko.unavailable.add("https://api.coingecko.com")
+    benchmark.run()
+
+    assert benchmark.stand_ins.coingecko.calls == 2
+    # the api key is only sent to Coingecko
+    keys = [
+        headers.get("x-cg-demo-api-key", None)
+        for _, headers in benchmark.stand_ins.coingecko.requests
+    ]
+    assert keys == ["secret", None]
+    prices = benchmark.context.state.store.prices
+    assert [point.price for point in prices] == [benchmark.stand_ins.coingecko.price]
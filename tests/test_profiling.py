@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests of the profiler of the behaviours."""
+
+import pstats
+from pathlib import Path
+from time import perf_counter
+from typing import Generator
+
+import pytest
+
+from packages.valory.skills.learning_abci.profiling import (
+    COLLAPSED,
+    PSTATS,
+    BehaviourProfiler,
+)
+from tests.benchmarks.harness import BenchmarkConfig, FSMBenchmark
+
+
+def busy_step(seconds: float) -> None:
+    """Keep the thread busy."""
+    deadline = perf_counter() + seconds
+    while perf_counter() < deadline:
+        continue
+
+
+def steps() -> Generator[None, int, str]:
+    """Run two busy steps, and return what was sent."""
+    busy_step(0.05)
+    sent = yield
+    busy_step(0.05)
+    return f"sent {sent}"
+
+
+def run(generator: Generator) -> str:
+    """Drive a generator as the behaviours are driven."""
+    try:
+        next(generator)
+        generator.send(1)
+    except StopIteration as stop:
+        return stop.value
+    raise AssertionError("The generator did not stop.")
+
+
+def test_pstats(tmp_path: Path) -> None:
+    """The steps of a behaviour are profiled, and dumped per period."""
+    profiler = BehaviourProfiler(["behaviour"], PSTATS, tmp_path)
+    assert run(profiler.profile("behaviour", steps())) == "sent 1"
+    profiler.dump(3)
+
+    stats = pstats.Stats(str(tmp_path / "period_3" / "behaviour.pstats"))
+    profiled = {function for _, _, function in stats.stats}  # type: ignore
+    assert {"steps", "busy_step"} <= profiled
+
+    profiler.dump(4)
+    assert not (tmp_path / "period_4").exists()
+
+
+def test_collapsed(tmp_path: Path) -> None:
+    """The sampled stacks start at the step of the behaviour."""
+    profiler = BehaviourProfiler(["behaviour"], COLLAPSED, tmp_path, interval=0.001)
+    try:
+        assert run(profiler.profile("behaviour", steps())) == "sent 1"
+        profiler.dump(0)
+    finally:
+        profiler.close()
+
+    lines = (tmp_path / "period_0" / "behaviour.collapsed").read_text().splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert stack.startswith("steps (tests.test_profiling:")
+        assert int(count) > 0
+
+
+def test_invalid_mode(tmp_path: Path) -> None:
+    """Unknown modes are rejected."""
+    with pytest.raises(ValueError, match="Unknown profile mode"):
+        BehaviourProfiler([], "flamegraph", tmp_path)
+
+
+def test_only_chosen_behaviours() -> None:
+    """Only the chosen behaviours are profiled."""
+    config = BenchmarkConfig(catalog_size=100, periods=1)
+    config.params = {"profile_behaviours": ["decision_making_behaviour"]}
+    benchmark = FSMBenchmark(config)
+    benchmark.run_period()
+    profiler = benchmark.context.state.profiler
+    profiler.dump(0)
+
+    directory = profiler.directory / "period_0"
+    assert [path.name for path in directory.iterdir()] == [
+        "decision_making_behaviour.pstats"
+    ]
+    benchmark.context.state.teardown()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests of the typed records of the properties."""
+
+from array import array
+
+import pytest
+
+from packages.valory.skills.learning_abci.properties import (
+    Property,
+    PropertyTable,
+    decode_properties,
+)
+
+
+ROWS = [
+    [1, "Property 1", "0x1", "130", True],
+    [2, "Property 2", "0x2", 90, 0],
+    [3, "Property 3", "0x3", 250, True],
+]
+
+
+def test_decode() -> None:
+    """The rows are decoded once into typed records."""
+    properties = decode_properties(ROWS)
+    assert properties[0] == Property(1, "Property 1", "0x1", 130, True)
+    assert properties[1].for_sale is False
+    assert [property_.to_row() for property_ in properties][2] == ROWS[2]
+
+
+def test_records_are_slotted() -> None:
+    """The records do not carry a dict."""
+    property_ = Property.from_row(ROWS[0])
+    assert not hasattr(property_, "__dict__")
+    with pytest.raises(AttributeError):
+        property_.price = 1  # type: ignore  # pylint: disable=assigning-non-slot
+
+
+def test_malformed_row() -> None:
+    """A row with missing fields is rejected."""
+    with pytest.raises(ValueError):
+        Property.from_row([1, "Property 1", "0x1"])
+
+
+def test_table() -> None:
+    """The table packs the columns, and rebuilds the records on access."""
+    table = PropertyTable.from_rows(ROWS)
+    assert len(table) == 3
+    assert isinstance(table.ids, array)
+    assert isinstance(table.values, array)
+    assert list(table) == decode_properties(ROWS)
+    assert table.rows()[0] == [1, "Property 1", "0x1", 130, True]
+
+
+def test_table_of_wei_values() -> None:
+    """Values which overflow 64 bits are kept in a list."""
+    wei = 10**21
+    table = PropertyTable.from_rows([[1, "Property 1", "0x1", wei, True]])
+    assert isinstance(table.values, list)
+    assert table[0].value == wei
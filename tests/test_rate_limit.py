@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests of the client-side rate limits of the HTTP requests."""
+
+from packages.valory.skills.learning_abci.rate_limit import (
+    RateLimiter,
+    TokenBucket,
+    retry_after,
+)
+from tests.benchmarks.harness import BenchmarkConfig, FSMBenchmark
+
+
+URL = "https://api.coingecko.com/api/v3/simple/price?ids=autonolas&vs_currencies=usd"
+
+
+def test_token_bucket() -> None:
+    """The bucket allows bursts up to its capacity, then its rate."""
+    bucket = TokenBucket(per_minute=60, burst=3, now=0.0)
+    assert [bucket.take(0.0) for _ in range(4)] == [True, True, True, False]
+    assert bucket.take(1.0)
+    assert not bucket.take(1.5)
+
+
+def test_hosts_without_quota() -> None:
+    """Only the hosts with a quota are limited."""
+    limiter = RateLimiter({"api.coingecko.com": 60}, burst=1, backoff=1.0, now=0.0)
+    assert limiter.acquire(URL, 0.0)
+    assert not limiter.acquire(URL, 0.1)
+    assert all(limiter.acquire("http://localhost:8080/price", 0.1) for _ in range(5))
+
+
+def test_backoff() -> None:
+    """A throttled host is backed off exponentially, or for its Retry-After, until it answers."""
+    limiter = RateLimiter({}, burst=1, backoff=1.0, now=0.0)
+    assert limiter.throttled(URL, 0.0) == 1.0
+    assert not limiter.acquire(URL, 0.5)
+    assert limiter.throttled(URL, 1.0) == 2.0
+    assert limiter.throttled(URL, 3.0, delay=10.0) == 10.0
+    assert not limiter.acquire(URL, 12.0)
+    assert limiter.acquire(URL, 13.0)
+    limiter.succeeded(URL)
+    assert limiter.throttled(URL, 13.0) == 1.0
+    assert retry_after("Content-Type: text/plain\r\nRetry-After: 7\r\n") == 7.0
+    assert retry_after("Retry-After: Wed, 21 Oct 2015 07:28:00 GMT") is None
+
+
+def test_throttled_period() -> None:
+    """A 429 is retried once the host is backed off."""
+    config = BenchmarkConfig(catalog_size=10, periods=1, params={"http_backoff": 0.01})
+    benchmark = FSMBenchmark(config)
+    benchmark.stand_ins.coingecko.throttled = 2
+    benchmark.run()
+
+    assert benchmark.stand_ins.coingecko.calls == 3
+    prices = benchmark.context.state.store.prices
+    assert [point.price for point in prices] == [benchmark.stand_ins.coingecko.price]
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests of the handling of the failed settlements."""
+
+from typing import Type
+
+from packages.valory.skills.learning_abci.rounds import (
+    APICheckRound,
+    FinishedSettlementFailureRound,
+    FinishedTxPreparationRound,
+    SettlementFailureRound,
+    SynchronizedData,
+)
+from packages.valory.skills.learning_abci.settlement import SettlementBackoff
+from tests.benchmarks.harness import BenchmarkConfig, FSMBenchmark
+
+
+def test_backoff_doubles() -> None:
+    """The backoff doubles with each failure, until the circuit opens."""
+    backoff = SettlementBackoff(max_failures=3, backoff=0.5, max_delay=10.0)
+    assert [backoff.delay(failures) for failures in (1, 2)] == [0.5, 1.0]
+    assert not backoff.is_open(2)
+    assert backoff.is_open(3)
+
+
+def test_backoff_is_capped() -> None:
+    """The backoff never exceeds its cap, however many failures."""
+    backoff = SettlementBackoff(max_failures=100, backoff=2.0, max_delay=15.0)
+    assert backoff.delay(3) == 8.0
+    assert backoff.delay(4) == 15.0
+    assert backoff.delay(99) == 15.0
+
+
+def fail_settlement(benchmark: FSMBenchmark) -> Type:
+    """Run the round the transaction settlement fails over to, and get the round it leads to."""
+    benchmark.abci_app.schedule_round(SettlementFailureRound)
+    benchmark.run_round()
+    return type(benchmark.abci_app.current_round)
+
+
+def settlement_failures(benchmark: FSMBenchmark) -> int:
+    """Get the failures of the settlement of the prepared transaction, as agreed on."""
+    return SynchronizedData(benchmark.abci_app.synchronized_data.db).settlement_failures
+
+
+def test_circuit_opens() -> None:
+    """A purchase which keeps failing is retried, then given up for the next candidate."""
+    benchmark = FSMBenchmark(
+        BenchmarkConfig(
+            catalog_size=10,
+            params={"settlement_max_failures": 3, "settlement_backoff": 0.0},
+        )
+    )
+    contract_api = benchmark.stand_ins.contract_api
+    contract_api.selling = False
+    contract_api.catalog.append([10, "Property 10", "0x1", 170, True])
+    while type(benchmark.abci_app.current_round) is not FinishedTxPreparationRound:
+        benchmark.run_round()
+    assert benchmark.abci_app.synchronized_data.db.get("property_id") == 9
+
+    assert settlement_failures(benchmark) == 0
+    assert fail_settlement(benchmark) is FinishedSettlementFailureRound
+    assert fail_settlement(benchmark) is FinishedSettlementFailureRound
+    assert settlement_failures(benchmark) == 2
+    assert fail_settlement(benchmark) is APICheckRound
+    banned = benchmark.context.state.candidates.banned
+    assert [(key[1], until) for key, until in banned.items()] == [(9, 5)]
+
+    while type(benchmark.abci_app.current_round) is not FinishedTxPreparationRound:
+        benchmark.run_round()
+    assert benchmark.abci_app.synchronized_data.db.get("property_id") == 10
+    # the failures of the previous transaction are not counted against the next one
+    assert settlement_failures(benchmark) == 0
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests of the sharded evaluation of the listings."""
+
+from packages.valory.skills.learning_abci.properties import decode_properties
+from packages.valory.skills.learning_abci.sharding import (
+    global_best,
+    shard_index,
+    shard_of,
+)
+from tests.benchmarks.simulation import Simulation, SimulationConfig
+
+
+PARTICIPANTS = ["0xa", "0xb", "0xc"]
+PROPERTIES = decode_properties(
+    [[index, f"Property {index}", "0x1", 100 + 10 * index, True] for index in range(12)]
+)
+
+
+def test_shards_cover_the_catalog() -> None:
+    """Every property is evaluated by exactly one shard."""
+    assert {shard_of(property_.id, 3) for property_ in PROPERTIES} == {0, 1, 2}
+    assert shard_index(PARTICIPANTS, "0xc") == 2
+    assert shard_index(PARTICIPANTS, "0xd") is None
+
+
+def test_global_best() -> None:
+    """The candidates whose proof holds are reduced to the cheapest one."""
+    candidates = {
+        "0xa": {"property_id": 3, "property_value": 130},
+        "0xb": {"property_id": 4, "property_value": 140},
+        # not in the shard of its sender
+        "0xc": {"property_id": 0, "property_value": 100},
+    }
+    assert global_best(candidates, PARTICIPANTS, 110, 200) == {
+        "property_id": 3,
+        "property_value": 130,
+    }
+    # out of the buying range
+    assert global_best(candidates, PARTICIPANTS, 135, 200) == {
+        "property_id": 4,
+        "property_value": 140,
+    }
+    assert global_best({"0xa": {}}, PARTICIPANTS, 0, 1000) is None
+
+
+def test_sharded_service() -> None:
+    """The agents of a service agree on the property of the shard which holds it."""
+    config = SimulationConfig(
+        n_agents=4,
+        periods=1,
+        catalog_size=10,
+        pause_scale=0.0,
+        params={"shard_decisions": True},
+        timeout=60.0,
+    )
+    simulation = Simulation(config)
+    result = simulation.run()
+
+    assert "finalization_round" in result.periods[0].rounds
+    assert len(simulation.stand_ins.ledger.transactions) == 1
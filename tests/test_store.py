@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests of the local store of the listings, the prices and the decisions."""
+
+import sqlite3
+from pathlib import Path
+
+from packages.valory.skills.learning_abci.store import (
+    SNAPSHOTS_KEPT,
+    PropertyStore,
+    listing_digest,
+)
+from tests.benchmarks.harness import BenchmarkConfig, FSMBenchmark
+
+
+LISTINGS = [[1, "Property 1", "0x1", 130, True], [2, "Property 2", "0x2", 90, True]]
+
+
+def test_reload(tmp_path: Path) -> None:
+    """A new store loads what the previous one wrote."""
+    path = str(tmp_path / "store" / "learning.db")
+    store = PropertyStore(path, history=3)
+    for period in range(5):
+        store.add_price(period, 1.0 + period)
+    store.save_snapshot(4, LISTINGS, "bafybei1", listing_digest(LISTINGS))
+    store.save_decision(4, "transact", {"property_id": 1, "property_value": 130})
+    store.close()
+
+    reloaded = PropertyStore(path, history=3)
+    reloaded.load()
+    assert [point.price for point in reloaded.prices] == [3.0, 4.0, 5.0]
+    assert reloaded.ipfs_hash_of(listing_digest(LISTINGS)) == "bafybei1"
+    listings = reloaded.listings("bafybei1")
+    assert listings is not None and listings.rows() == LISTINGS
+    assert reloaded.listings("bafybei2") is None
+    assert reloaded.last_decision is not None
+    assert reloaded.last_decision.property_data == {
+        "property_id": 1,
+        "property_value": 130,
+    }
+
+
+def test_snapshots_are_only_inserted_on_changes(tmp_path: Path) -> None:
+    """Unchanged listings only move the period of the last snapshot."""
+    path = str(tmp_path / "learning.db")
+    store = PropertyStore(path)
+    digest = listing_digest(LISTINGS)
+    store.save_snapshot(0, LISTINGS, "bafybei1", digest)
+    store.save_snapshot(1, LISTINGS, "bafybei1", digest)
+    assert store.snapshot is not None and store.snapshot.period == 1
+
+    for period in range(2, 10):
+        listings = LISTINGS[:1] + [[period, "Property", "0x3", period, True]]
+        store.save_snapshot(
+            period, listings, f"bafybei{period}", listing_digest(listings)
+        )
+    store.close()
+
+    with sqlite3.connect(path) as connection:
+        [(count,)] = connection.execute("SELECT COUNT(*) FROM listings").fetchall()
+    assert count == SNAPSHOTS_KEPT + 1
+
+
+def test_warm_restart(tmp_path: Path) -> None:
+    """A restarted agent neither uploads nor downloads unchanged listings."""
+    # nothing is bought, so that the listings do not change
+    config = BenchmarkConfig(catalog_size=100, periods=2, buy_index=None)
+    config.params = {"store_path": str(tmp_path / "learning.db")}
+    first = FSMBenchmark(config)
+    first.run()
+    # the candidates of the unchanged listings are not ranked again
+    assert first.context.state.metrics.cache_requests == {
+        ("listings_upload", "miss"): 1,
+        ("listings_upload", "hit"): 1,
+        ("listings_download", "hit"): 1,
+    }
+
+    config.periods = 1
+    restarted = FSMBenchmark(config)
+    restarted.run()
+    assert restarted.context.state.metrics.cache_requests == {
+        ("listings_upload", "hit"): 1,
+        ("listings_download", "hit"): 1,
+    }
+    assert not restarted.stand_ins.ipfs.files
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests of the record and replay of the external responses."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from packages.valory.protocols.contract_api import ContractApiMessage
+from packages.valory.protocols.contract_api.custom_types import State
+from packages.valory.protocols.http import HttpMessage
+from packages.valory.skills.learning_abci.trace import RECORD, REPLAY, ResponseTrace
+from tests.benchmarks.harness import BenchmarkConfig, FSMBenchmark
+
+
+def test_trace_round_trip(tmp_path: Path) -> None:
+    """The responses are replayed in their recording order, with scaled latencies."""
+    path = tmp_path / "trace.jsonl.gz"
+    recorder = ResponseTrace(RECORD, path)
+    for status_code in (200, 500):
+        response = HttpMessage(
+            performative=HttpMessage.Performative.RESPONSE,  # type: ignore
+            version="",
+            status_code=status_code,
+            status_text="",
+            headers="",
+            body=b"{}",
+        )
+        recorder.record("http", "GET url", response, 0.5)
+    recorder.close()
+
+    player = ResponseTrace(REPLAY, path, latency_scale=0.1)
+    codes = []
+    for _ in range(2):
+        message, seconds = player.next_response("http", "GET url")
+        codes.append(message.status_code)
+        assert seconds == pytest.approx(0.05)
+    assert codes == [200, 500]
+    assert player.next_response("http", "GET url") is None
+    assert player.next_response("ipfs", "GET url") is None
+
+
+def test_trace_is_json(tmp_path: Path) -> None:
+    """The contract states are stored as JSON, and decoded to the same message."""
+    path = tmp_path / "trace.jsonl"
+    body = {
+        "data": b"\x00\x01",
+        "properties": [[1, "0xabc", 2.5, True, None]],
+        "pair": (1, 2),
+        "by_id": {1: "one"},
+    }
+    response = ContractApiMessage(
+        performative=ContractApiMessage.Performative.STATE,  # type: ignore
+        dialogue_reference=("a", "b"),
+        message_id=2,
+        target=1,
+        state=State(ledger_id="ethereum", body=body),
+    )
+    recorder = ResponseTrace(RECORD, path)
+    recorder.record("contract_api", "key", response, 0.1)
+    recorder.close()
+
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert entries[1]["m"]["performative"] == "state"
+
+    message, _ = ResponseTrace(REPLAY, path).next_response("contract_api", "key")
+    assert message == response
+    assert message.state.body == body
+
+
+def test_replay_a_recorded_run(tmp_path: Path) -> None:
+    """A replayed run does not send any request."""
+    path = str(tmp_path / "trace.jsonl")
+    config = BenchmarkConfig(catalog_size=100, periods=2)
+    config.params = {"trace_mode": RECORD, "trace_file": path}
+    recorded = FSMBenchmark(config)
+    recorded.run()
+    assert recorded.stand_ins.contract_api.calls
+
+    config.params = {
+        "trace_mode": REPLAY,
+        "trace_file": path,
+        "trace_latency_scale": 0.0,
+    }
+    replayed = FSMBenchmark(config)
+    result = replayed.run()
+
+    assert len(result.round_latencies["tx_preparation_round"]) == 2
+    assert replayed.stand_ins.coingecko.calls == 0
+    assert not replayed.stand_ins.contract_api.calls
+    assert not replayed.stand_ins.ledger.calls
+    assert not replayed.stand_ins.ipfs.files
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Tests of the watchdog of the blocking steps."""
+
+import logging
+from time import perf_counter
+from typing import Generator
+
+from packages.valory.skills.learning_abci.metrics import LearningMetrics
+from packages.valory.skills.learning_abci.watchdog import StepWatchdog
+from tests.benchmarks.harness import BenchmarkConfig, FSMBenchmark
+
+
+def wait() -> Generator:
+    """Wait for a message."""
+    yield
+
+
+def steps() -> Generator:
+    """Block after the first wait only."""
+    yield from wait()
+    deadline = perf_counter() + 0.03
+    while perf_counter() < deadline:
+        continue
+    yield from wait()
+
+
+def test_blocking_step(caplog) -> None:  # type: ignore
+    """The steps over the budget are counted by the location they resumed from."""
+    metrics = LearningMetrics()
+    watchdog = StepWatchdog(0.01, metrics, logging.getLogger("watchdog"))
+    for _ in watchdog.watch("behaviour", steps(), __file__):
+        continue
+
+    assert metrics.step_durations[("behaviour",)].count == 3
+    [(behaviour_id, location)] = metrics.blocking_steps
+    assert behaviour_id == "behaviour"
+    assert location.startswith("test_watchdog.py: steps:")
+    assert "learning_blocking_steps_total" in metrics.render()
+    assert f"from {location} to test_watchdog.py: steps:" in caplog.text
+
+
+def test_behaviours_are_watched() -> None:
+    """Every step of the learning behaviours is timed."""
+    config = BenchmarkConfig(catalog_size=100, periods=1)
+    config.params = {"step_budget": 60.0}
+    benchmark = FSMBenchmark(config)
+    benchmark.run()
+
+    metrics = benchmark.context.state.metrics
+    assert {behaviour for behaviour, in metrics.step_durations} == {
+        "a_p_i_check_behaviour",
+        "decision_making_behaviour",
+        "tx_preparation_behaviour",
+    }
+    assert not metrics.blocking_steps